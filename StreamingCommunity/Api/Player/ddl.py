@@ -4,12 +4,12 @@ import logging
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.headers import get_userAgent
 
 
@@ -38,7 +38,7 @@ class VideoSource:
             - str: The response content if successful, None otherwise.
         """
         try:
-            response = httpx.get(
+            response = http_get(
                 url=url, 
                 headers=self.headers, 
                 cookies=self.cookie,
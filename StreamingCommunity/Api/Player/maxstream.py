@@ -6,13 +6,13 @@ import logging
 
 
 # External libraries
-import httpx
 import jsbeautifier
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get, http_post
 from StreamingCommunity.Util.headers import get_userAgent
 
 
@@ -39,7 +39,7 @@ class VideoSource:
         Sends a request to the initial URL and extracts the redirect URL.
         """
         try:
-            response = httpx.get(self.url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(self.url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
 
             # Extract the redirect URL from the HTML
@@ -58,7 +58,7 @@ class VideoSource:
         Sends a request to the redirect URL and extracts the Maxstream URL.
         """
         try:
-            response = httpx.get(self.redirect_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(self.redirect_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
 
             # Extract the Maxstream URL from the HTML
@@ -77,12 +77,12 @@ class VideoSource:
 
                 # Make request to stayonline api
                 data = {'id': self.redirect_url.split("/")[-2], 'ref': ''}
-                response = httpx.post('https://stayonline.pro/ajax/linkEmbedView.php', headers=headers, data=data, verify=REQUEST_VERIFY)
+                response = http_post('https://stayonline.pro/ajax/linkEmbedView.php', headers=headers, data=data, verify=REQUEST_VERIFY)
                 response.raise_for_status()
                 uprot_url = response.json()['data']['value']
 
                 # Retry getting maxtstream url
-                response = httpx.get(uprot_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+                response = http_get(uprot_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
                 response.raise_for_status()
                 soup = BeautifulSoup(response.text, "html.parser")
                 maxstream_url = soup.find("a").get("href")
@@ -104,7 +104,7 @@ class VideoSource:
         Sends a request to the Maxstream URL and extracts the .m3u8 file URL.
         """
         try:
-            response = httpx.get(self.maxstream_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(self.maxstream_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status() 
             soup = BeautifulSoup(response.text, "html.parser")
 
@@ -2,11 +2,11 @@
 
 
 # External libraries
-import httpx
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.headers import get_headers
 
 
@@ -29,7 +29,7 @@ class VideoSource:
                 return "Error: Unable to determine video JSON URL"
                         
         try:
-            response = httpx.get(video_url, headers=get_headers(), timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(video_url, headers=get_headers(), timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             if response.status_code != 200:
                 return f"Error: Failed to fetch video data (Status: {response.status_code})"
                 
@@ -50,7 +50,7 @@ class VideoSource:
                 'cont': element_key,
                 'output': '62',
             }
-            stream_response = httpx.get('https://mediapolisvod.rai.it/relinker/relinkerServlet.htm', params=params, headers=get_headers(), timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            stream_response = http_get('https://mediapolisvod.rai.it/relinker/relinkerServlet.htm', params=params, headers=get_headers(), timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             
             if stream_response.status_code != 200:
                 return f"Error: Failed to fetch stream URL (Status: {stream_response.status_code})"
@@ -5,13 +5,13 @@ import logging
 
 
 # External libraries
-import httpx
 import jsbeautifier
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get, http_post
 from StreamingCommunity.Util.headers import get_userAgent
 
 
@@ -45,7 +45,7 @@ class VideoSource:
     def get_redirect_url(self) -> str:
         """Extract the stayonline redirect URL from the initial page."""
         try:
-            response = httpx.get(self.url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(self.url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, "html.parser")
             
@@ -68,7 +68,7 @@ class VideoSource:
             raise ValueError("Redirect URL not set. Call get_redirect_url first.")
 
         try:
-            response = httpx.get(self.redirect_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(self.redirect_url, headers=self.headers, follow_redirects=True, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, "html.parser")
             
@@ -89,7 +89,7 @@ class VideoSource:
             self.headers['referer'] = f'{self.STAYONLINE_BASE_URL}/l/{link_id}/'
             data = {'id': link_id, 'ref': ''}
             
-            response = httpx.post(f'{self.STAYONLINE_BASE_URL}/ajax/linkView.php', headers=self.headers, data=data, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_post(f'{self.STAYONLINE_BASE_URL}/ajax/linkView.php', headers=self.headers, data=data, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
             return response.json()['data']['value']
             
@@ -125,7 +125,7 @@ class VideoSource:
         final_url = self.get_final_url(link_id)
         video_id = self._extract_video_id(final_url)
 
-        response = httpx.get(
+        response = http_get(
             f'{self.MIXDROP_BASE_URL}/e/{video_id}',
             headers=self._get_mixdrop_headers(),
             timeout=MAX_TIMEOUT,
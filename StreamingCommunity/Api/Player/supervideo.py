@@ -7,12 +7,12 @@ import logging
 # External libraries
 import jsbeautifier
 from bs4 import BeautifulSoup
-from curl_cffi import requests
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_headers
+from StreamingCommunity.Util.http_client import impersonated_get
 
 
 # Variable
@@ -42,7 +42,7 @@ class VideoSource:
             - str: The response content if successful, None otherwise.
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=MAX_TIMEOUT, impersonate="chrome110", verify=REQUEST_VERIFY)
+            response = impersonated_get(url, profile="chrome110", headers=self.headers, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             if response.status_code >= 400:
                 logging.error(f"Request failed with status code: {response.status_code}")
                 return None
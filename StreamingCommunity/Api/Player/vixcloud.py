@@ -7,13 +7,14 @@ from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
 # External libraries
 import httpx
-from bs4 import BeautifulSoup
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.html_extract import find_attribute, get_body_scripts
+from StreamingCommunity.Util.http_client import http_get
 from .Helper.Vixcloud.util import WindowVideo, WindowParameter, StreamsCollection
 from .Helper.Vixcloud.js_parser import JavaScriptParser
 
@@ -58,12 +59,13 @@ class VideoSource:
             }
 
         try:
-            response = httpx.get(f"{self.url}/iframe/{self.media_id}", headers=self.headers, params=params, timeout=MAX_TIMEOUT, proxy=self.proxy, verify=REQUEST_VERIFY)
+            response = http_get(f"{self.url}/iframe/{self.media_id}", headers=self.headers, params=params, timeout=MAX_TIMEOUT, proxy=self.proxy, verify=REQUEST_VERIFY)
             response.raise_for_status()
 
-            # Parse response with BeautifulSoup to get iframe source
-            soup = BeautifulSoup(response.text, "html.parser")
-            self.iframe_src = soup.find("iframe").get("src")
+            # Read the iframe source from its tag only
+            self.iframe_src = find_attribute(response.text, "iframe", "src")
+            if self.iframe_src is None:
+                raise ValueError("iframe not found")
 
         except Exception as e:
             logging.error(f"Error getting iframe source: {e}")
@@ -101,12 +103,11 @@ class VideoSource:
         """
         try:
             if self.iframe_src is not None:
-                response = httpx.get(self.iframe_src, headers=self.headers, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+                response = http_get(self.iframe_src, headers=self.headers, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
                 response.raise_for_status()
 
-                # Parse response with BeautifulSoup to get content
-                soup = BeautifulSoup(response.text, "html.parser")
-                script = soup.find("body").find("script").text
+                # Get the first script of the body without parsing the whole page
+                script = get_body_scripts(response.text)[0]
 
                 # Parse script to get video information
                 self.parse_script(script_text=script)
@@ -123,6 +124,27 @@ class VideoSource:
             logging.error(f"Error getting content: {e}")
             raise
 
+    @staticmethod
+    def is_playlist_expired(playlist_url: str | None, margin: int = 60) -> bool:
+        """
+        Check if the token of a playlist URL expires within `margin` seconds.
+
+        Args:
+            playlist_url (str | None): URL returned by get_playlist
+            margin (int): Seconds the token must still be valid for
+
+        Returns:
+            bool: True if the URL has to be generated again
+        """
+        if not playlist_url:
+            return False
+
+        expires = parse_qs(urlparse(playlist_url).query).get('expires', [''])[0]
+        if not expires.isdigit():
+            return False
+
+        return int(expires) - time.time() < margin
+
     def get_playlist(self) -> str | None:
         """
         Generate authenticated playlist URL.
@@ -179,7 +201,7 @@ class VideoSourceAnime(VideoSource):
             str: Parsed script content
         """
         try:
-            response = httpx.get(f"{self.url}/embed-url/{episode_id}", headers=self.headers, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
+            response = http_get(f"{self.url}/embed-url/{episode_id}", headers=self.headers, timeout=MAX_TIMEOUT, verify=REQUEST_VERIFY)
             response.raise_for_status()
 
             # Extract and clean embed URL
@@ -187,13 +209,13 @@ class VideoSourceAnime(VideoSource):
             self.iframe_src = embed_url
 
             # Fetch video content using embed URL
-            video_response = httpx.get(embed_url, verify=REQUEST_VERIFY)
+            video_response = http_get(embed_url, verify=REQUEST_VERIFY)
             video_response.raise_for_status()
 
-            # Parse response with BeautifulSoup to get content of the scriot
-            soup = BeautifulSoup(video_response.text, "html.parser")
-            script = soup.find("body").find("script").text
-            self.src_mp4 = soup.find("body").find_all("script")[1].text.split(" = ")[1].replace("'", "")
+            # Get the scripts of the body without parsing the whole page
+            scripts = get_body_scripts(video_response.text)
+            script = scripts[0]
+            self.src_mp4 = scripts[1].split(" = ")[1].replace("'", "")
 
             return script
         
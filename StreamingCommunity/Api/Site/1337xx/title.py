@@ -4,12 +4,12 @@ import os
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
 
 # Internal utilities
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.os import os_manager
 from StreamingCommunity.Util.message import start_message
 from StreamingCommunity.Util.headers import get_userAgent
@@ -43,7 +43,7 @@ def download_title(select_title: MediaItem):
     os_manager.create_path(mp4_path)                                                                    
 
     # Make request to page with magnet
-    response = httpx.get(
+    response = http_get(
         url=f"{site_constant.FULL_URL}{select_title.url}",
         headers={
             'user-agent': get_userAgent()
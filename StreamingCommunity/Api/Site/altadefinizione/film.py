@@ -5,7 +5,6 @@ import re
 
 
 # External library
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
@@ -15,7 +14,8 @@ from StreamingCommunity.Util.os import os_manager
 from StreamingCommunity.Util.message import start_message
 from StreamingCommunity.Util.headers import get_headers
 from StreamingCommunity.Util.config_json import config_manager
-from StreamingCommunity.Lib.Downloader import HLS_Downloader
+from StreamingCommunity.Util.http_client import http_get
+from StreamingCommunity.Lib.Downloader import HLS_Downloader, record_download_failure
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance, TelegramSession
 
 
@@ -60,7 +60,7 @@ def download_film(select_title: MediaItem) -> str:
     
     # Extract mostraguarda URL
     try:
-        response = httpx.get(select_title.url, headers=get_headers(), timeout=10)
+        response = http_get(select_title.url, headers=get_headers(), timeout=10)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -69,12 +69,13 @@ def download_film(select_title: MediaItem) -> str:
     
     except Exception as e:
         console.print(f"[red]Site: {site_constant.SITE_NAME}, request error: {e}, get mostraguarda")
+        record_download_failure(select_title.name, f"get mostraguarda: {e}")
         return None
 
     # Extract supervideo URL
     supervideo_url = None
     try:
-        response = httpx.get(mostraguarda, headers=get_headers(), timeout=10)
+        response = http_get(mostraguarda, headers=get_headers(), timeout=10)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -85,6 +86,7 @@ def download_film(select_title: MediaItem) -> str:
     except Exception as e:
         console.print(f"[red]Site: {site_constant.SITE_NAME}, request error: {e}, get supervideo URL")
         console.print("[yellow]This content will be available soon![/yellow]")
+        record_download_failure(select_title.name, f"get supervideo URL: {e}")
         return None
     
     # Init class
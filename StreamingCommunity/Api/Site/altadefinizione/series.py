@@ -22,7 +22,8 @@ from StreamingCommunity.Api.Template.Util import (
     map_episode_title,
     validate_selection, 
     validate_episode_selection, 
-    display_episodes_list
+    display_episodes_list,
+    run_episode_downloads
 )
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
@@ -108,11 +109,7 @@ def download_episode(index_season_selected: int, scrape_serie: GetSerieInfo, dow
     episodes_count = len(episodes)
 
     if download_all:
-        for i_episode in range(1, episodes_count + 1):
-            path, stopped = download_video(index_season_selected, i_episode, scrape_serie)
-
-            if stopped:
-                break
+        run_episode_downloads(lambda i_episode: download_video(index_season_selected, i_episode, scrape_serie), list(range(1, episodes_count + 1)))
 
         console.print(f"\n[red]End downloaded [yellow]season: [red]{index_season_selected}.")
 
@@ -129,11 +126,7 @@ def download_episode(index_season_selected: int, scrape_serie: GetSerieInfo, dow
         list_episode_select = validate_episode_selection(list_episode_select, episodes_count)
 
         # Download selected episodes if not stopped
-        for i_episode in list_episode_select:
-            path, stopped = download_video(index_season_selected, i_episode, scrape_serie)
-
-            if stopped:
-                break
+        run_episode_downloads(lambda i_episode: download_video(index_season_selected, i_episode, scrape_serie), list_episode_select)
 
 def download_series(select_season: MediaItem, season_selection: str = None, episode_selection: str = None) -> None:
     """
@@ -4,13 +4,13 @@ import logging
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Api.Player.Helper.Vixcloud.util import SeasonManager
 
 
@@ -34,7 +34,7 @@ class GetSerieInfo:
         """
         Retrieve all episodes for all seasons
         """
-        response = httpx.get(self.url, headers=self.headers)
+        response = http_get(self.url, headers=self.headers)
         soup = BeautifulSoup(response.text, "html.parser")
         self.series_name = soup.find("title").get_text(strip=True).split(" - ")[0]
 
@@ -19,7 +19,7 @@ from StreamingCommunity.TelegramHelp.telegram_bot import TelegramSession, get_bo
 # Logic class
 from .util.ScrapeSerie import ScrapeSerieAnime
 from StreamingCommunity.Api.Template.config_loader import site_constant
-from StreamingCommunity.Api.Template.Util import manage_selection, dynamic_format_number
+from StreamingCommunity.Api.Template.Util import manage_selection, dynamic_format_number, run_episode_downloads
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
 
 
@@ -138,11 +138,7 @@ def download_series(select_title: MediaItem, season_selection: str = None, episo
 
     # Download all other episodes selected
     else:
-        kill_handler = False
-        for i_episode in list_episode_select:
-            if kill_handler:
-                break
-            _, kill_handler = download_episode(i_episode-1, scrape_serie, video_source)
+        run_episode_downloads(lambda i_episode: download_episode(i_episode-1, scrape_serie, VideoSourceAnime(site_constant.FULL_URL)), list_episode_select)
 
     if site_constant.TELEGRAM_BOT:
         bot.send_message(f"Finito di scaricare tutte le serie e episodi", None)
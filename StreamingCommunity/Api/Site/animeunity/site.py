@@ -2,13 +2,12 @@
 
 # External libraries
 import urllib.parse
-import httpx
-from curl_cffi import requests
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_post, impersonated_get
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
@@ -28,10 +27,10 @@ def get_token(user_agent: str) -> dict:
     """
     Retrieve session cookies from the site.
     """
-    response = requests.get(
+    response = impersonated_get(
         site_constant.FULL_URL,
-        headers={'user-agent': user_agent},
-        impersonate="chrome120"
+        profile="chrome120",
+        headers={'user-agent': user_agent}
     )
     response.raise_for_status()
     all_cookies = {name: value for name, value in response.cookies.items()}
@@ -80,7 +79,7 @@ def title_search(query: str) -> int:
 
     # First call: /livesearch
     try:
-        response1 = httpx.post(
+        response1 = http_post(
             f'{site_constant.FULL_URL}/livesearch',
             cookies=cookies,
             headers=headers,
@@ -107,7 +106,7 @@ def title_search(query: str) -> int:
             'dubbed': False,
             'season': False
         }
-        response2 = httpx.post(
+        response2 = http_post(
             f'{site_constant.FULL_URL}/archivio/get-animes',
             cookies=cookies,
             headers=headers,
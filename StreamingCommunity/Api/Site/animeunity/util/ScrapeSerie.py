@@ -1,20 +1,21 @@
 # 01.03.24
 
 import logging
-
-
-# External libraries
-import httpx
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
+from StreamingCommunity.Util.http_cache import cached_get
 from StreamingCommunity.Api.Player.Helper.Vixcloud.util import EpisodeManager, Episode
 
 
 # Variable
 max_timeout = config_manager.get_int("REQUESTS", "timeout")
+CHUNK_SIZE = 120
+MAX_CHUNK_WORKERS = 8
 
 
 
@@ -57,45 +58,41 @@ class ScrapeSerieAnime:
     
     def _fetch_all_episodes(self):
         """
-        Fetch all episodes data at once and cache it
+        Fetch all episodes data at once and cache it.
+        The ranges are fetched concurrently through the http cache, with the "season" time to live.
         """
         try:
-            # Get initial episode count
-            response = httpx.get(
-                url=f"{self.url}/info_api/{self.media_id}/",
-                headers=self.headers,
-                timeout=max_timeout
-            )
+            # Get initial episode count, never cached so new episodes show up at once
+            response = http_get(f"{self.url}/info_api/{self.media_id}/", headers=self.headers, timeout=max_timeout)
             response.raise_for_status()
             initial_count = response.json()["episodes_count"]
-            
-            all_episodes = []
-            start_range = 1
-            
-            # Fetch episodes in chunks
-            while start_range <= initial_count:
-                end_range = min(start_range + 119, initial_count)
-                
-                response = httpx.get(
-                    url=f"{self.url}/info_api/{self.media_id}/1",
-                    params={
-                        "start_range": start_range,
-                        "end_range": end_range
-                    },
-                    headers=self.headers,
-                    timeout=max_timeout
-                )
-                response.raise_for_status()
-                
-                chunk_episodes = response.json().get("episodes", [])
-                all_episodes.extend(chunk_episodes)
-                start_range = end_range + 1
-            
+
+            ranges = [(start, min(start + CHUNK_SIZE - 1, initial_count)) for start in range(1, initial_count + 1, CHUNK_SIZE)]
+
+            # Fetch episodes in chunks, map keeps the order of the ranges
+            with ThreadPoolExecutor(max_workers=max(1, min(len(ranges), MAX_CHUNK_WORKERS))) as executor:
+                chunks = executor.map(lambda episode_range: self._fetch_episode_range(*episode_range), ranges)
+                all_episodes = [episode for chunk in chunks for episode in chunk]
+
             self.episodes_cache = all_episodes
         except Exception as e:
             logging.error(f"Error fetching all episodes: {e}")
             self.episodes_cache = None
 
+    def _fetch_episode_range(self, start_range: int, end_range: int) -> list:
+        response = cached_get(
+            f"{self.url}/info_api/{self.media_id}/1",
+            endpoint='season',
+            params={
+                "start_range": start_range,
+                "end_range": end_range
+            },
+            headers=self.headers,
+            timeout=max_timeout
+        )
+        response.raise_for_status()
+        return response.json().get("episodes", [])
+
     def get_info_episode(self, index_ep: int) -> Episode:
         """
         Get episode info from cache
@@ -19,7 +19,7 @@ from StreamingCommunity.Lib.Downloader import MP4_downloader
 # Logic class
 from .util.ScrapeSerie import ScrapSerie
 from StreamingCommunity.Api.Template.config_loader import site_constant
-from StreamingCommunity.Api.Template.Util import manage_selection, dynamic_format_number
+from StreamingCommunity.Api.Template.Util import manage_selection, dynamic_format_number, run_episode_downloads
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
 
 
@@ -103,8 +103,4 @@ def download_series(select_title: MediaItem, episode_selection: str = None):
 
     # Download all selected episodes
     else:
-        kill_handler = False
-        for i_episode in list_episode_select:
-            if kill_handler:
-                break
-            _, kill_handler = download_episode(i_episode-1, scrape_serie)
\ No newline at end of file
+        run_episode_downloads(lambda i_episode: download_episode(i_episode-1, scrape_serie), list_episode_select)
\ No newline at end of file
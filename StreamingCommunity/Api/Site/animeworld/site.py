@@ -3,13 +3,13 @@
 import logging
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.headers import get_userAgent, get_headers
 from StreamingCommunity.Util.table import TVShowManager
 
@@ -31,7 +31,7 @@ def get_session_and_csrf() -> dict:
     Get the session ID and CSRF token from the website's cookies and HTML meta data.
     """
     # Send an initial GET request to the website
-    response = httpx.get(
+    response = http_get(
         site_constant.FULL_URL, 
         headers=get_headers(), 
         verify=False
@@ -74,7 +74,7 @@ def title_search(query: str) -> int:
 
     # Make the GET request
     try:
-        response = httpx.get(
+        response = http_get(
             search_url, 
             headers={'User-Agent': get_userAgent()},
             timeout=max_timeout,
@@ -22,7 +22,8 @@ from StreamingCommunity.Api.Template.Util import (
     dynamic_format_number, 
     validate_selection, 
     validate_episode_selection, 
-    display_episodes_list
+    display_episodes_list,
+    run_episode_downloads
 )
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
@@ -98,11 +99,7 @@ def download_episode(scape_info_serie: GetSerieInfo, index_season_selected: int,
     if download_all:
         
         # Download all episodes in the season
-        for i_episode in range(1, episodes_count + 1):
-            path, stopped = download_video(index_season_selected, i_episode, scape_info_serie)
-
-            if stopped:
-                break
+        run_episode_downloads(lambda i_episode: download_video(index_season_selected, i_episode, scape_info_serie), list(range(1, episodes_count + 1)))
 
         console.print(f"\n[red]End downloaded [yellow]season: [red]{index_season_selected}.")
 
@@ -120,11 +117,7 @@ def download_episode(scape_info_serie: GetSerieInfo, index_season_selected: int,
         list_episode_select = validate_episode_selection(list_episode_select, episodes_count)
 
         # Download selected episodes
-        for i_episode in list_episode_select:
-            path, stopped = download_video(index_season_selected, i_episode, scape_info_serie)
-
-            if stopped:
-                break
+        run_episode_downloads(lambda i_episode: download_video(index_season_selected, i_episode, scape_info_serie), list_episode_select)
 
 
 def download_series(dict_serie: MediaItem, season_selection: str = None, episode_selection: str = None) -> None:
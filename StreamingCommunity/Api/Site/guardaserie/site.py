@@ -4,13 +4,13 @@ import sys
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
+from StreamingCommunity.Util.http_cache import cached_get
 from StreamingCommunity.Util.table import TVShowManager
 
 
@@ -44,8 +44,9 @@ def title_search(query: str) -> int:
     console.print(f"[cyan]Search url: [yellow]{search_url}")
 
     try:
-        response = httpx.get(
+        response = cached_get(
             search_url, 
+            endpoint='search',
             headers={'user-agent': get_userAgent()}, 
             timeout=max_timeout, 
             follow_redirects=True, 
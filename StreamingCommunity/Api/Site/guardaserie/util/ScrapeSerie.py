@@ -5,13 +5,13 @@ from typing import List, Dict
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import cached_get
 
 
 # Logic class
@@ -45,7 +45,7 @@ class GetSerieInfo:
         try:
 
             # Make an HTTP request to the series URL
-            response = httpx.get(self.url, headers=self.headers, timeout=max_timeout, follow_redirects=True)
+            response = cached_get(self.url, endpoint='title', headers=self.headers, timeout=max_timeout, follow_redirects=True)
             response.raise_for_status()
 
             soup = BeautifulSoup(response.text, "html.parser")
@@ -74,7 +74,7 @@ class GetSerieInfo:
         try:
 
             # Make an HTTP request to the series URL
-            response = httpx.get(self.url, headers=self.headers, timeout=max_timeout, follow_redirects=True)
+            response = cached_get(self.url, endpoint='title', headers=self.headers, timeout=max_timeout, follow_redirects=True)
             response.raise_for_status()
 
             # Parse HTML content of the page
@@ -5,11 +5,11 @@ from typing import Tuple
 
 
 # External library
-import httpx
 from rich.console import Console
 
 
 # Internal utilities
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.os import os_manager
 from StreamingCommunity.Util.message import start_message
 from StreamingCommunity.Lib.Downloader import HLS_Downloader
@@ -44,7 +44,7 @@ def download_film(select_title: MediaItem) -> Tuple[str, bool]:
     console.print(f"[bold yellow]Download:[/bold yellow] [red]{site_constant.SITE_NAME}[/red] → [cyan]{select_title.name}[/cyan] \n")
 
     # Extract m3u8 URL from the film's URL
-    response = httpx.get(select_title.url + ".json", headers=get_headers(), timeout=10)
+    response = http_get(select_title.url + ".json", headers=get_headers(), timeout=10)
     first_item_path =  "https://www.raiplay.it" + response.json().get("first_item_path")
     master_playlist = VideoSource.extract_m3u8_url(first_item_path)
 
@@ -1,12 +1,12 @@
 # 21.05.24
 
 # External libraries
-import httpx
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_post
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.Api.Template.config_loader import site_constant
@@ -74,7 +74,7 @@ def title_search(query: str) -> int:
     }
 
     try:
-        response = httpx.post(
+        response = http_post(
             search_url, 
             headers={'user-agent': get_userAgent()}, 
             json=json_data, 
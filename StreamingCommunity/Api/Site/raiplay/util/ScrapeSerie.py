@@ -10,6 +10,7 @@ import httpx
 # Internal utilities
 from StreamingCommunity.Util.headers import get_headers
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import cached_get
 from StreamingCommunity.Api.Player.Helper.Vixcloud.util import SeasonManager
 
 
@@ -29,7 +30,7 @@ class GetSerieInfo:
         """Get series info including seasons."""
         try:
             program_url = f"{self.base_url}/programmi/{self.program_name}.json"
-            response = httpx.get(url=program_url, headers=get_headers(), timeout=max_timeout)
+            response = cached_get(url=program_url, endpoint='title', headers=get_headers(), timeout=max_timeout)
             
             # If 404, content is not yet available
             if response.status_code == 404:
@@ -79,7 +80,7 @@ class GetSerieInfo:
             season = self.seasons_manager.get_season_by_number(number_season)
 
             url = f"{self.base_url}/programmi/{self.program_name}/{self.publishing_block_id}/{season.id}/episodes.json"
-            response = httpx.get(url=url, headers=get_headers(), timeout=max_timeout)
+            response = cached_get(url=url, endpoint='season', headers=get_headers(), timeout=max_timeout)
             response.raise_for_status()
             
             episodes_data = response.json()
@@ -10,7 +10,7 @@ from rich.console import Console
 # Internal utilities
 from StreamingCommunity.Util.os import os_manager
 from StreamingCommunity.Util.message import start_message
-from StreamingCommunity.Lib.Downloader import HLS_Downloader
+from StreamingCommunity.Lib.Downloader import HLS_Downloader, record_download_failure
 from StreamingCommunity.TelegramHelp.telegram_bot import TelegramSession, get_bot_instance
 
 
@@ -64,6 +64,7 @@ def download_film(select_title: MediaItem, proxy: str = None) -> str:
 
     if master_playlist is None:
         console.print(f"[red]Site: {site_constant.SITE_NAME}, error: No master playlist found[/red]")
+        record_download_failure(select_title.name, "No master playlist found")
         return None
 
     # Define the filename and path for the downloaded film
@@ -1,7 +1,8 @@
 # 3.12.23
 
 import os
-from typing import Tuple
+from functools import partial
+from typing import List, Tuple
 
 
 # External library
@@ -11,7 +12,7 @@ from rich.prompt import Prompt
 
 # Internal utilities
 from StreamingCommunity.Util.message import start_message
-from StreamingCommunity.Lib.Downloader import HLS_Downloader
+from StreamingCommunity.Lib.Downloader import HLS_Downloader, record_download_failure
 from StreamingCommunity.TelegramHelp.telegram_bot import TelegramSession, get_bot_instance
 
 # Logic class
@@ -22,7 +23,9 @@ from StreamingCommunity.Api.Template.Util import (
     dynamic_format_number, 
     validate_selection, 
     validate_episode_selection, 
-    display_episodes_list
+    display_episodes_list,
+    EpisodePrefetcher,
+    run_episode_downloads
 )
 from StreamingCommunity.Api.Template.config_loader import site_constant
 from StreamingCommunity.Api.Template.Class.SearchType import MediaItem
@@ -37,7 +40,28 @@ msg = Prompt()
 console = Console()
 
 
-def download_video(index_season_selected: int, index_episode_selected: int, scrape_serie: GetSerieInfo, video_source: VideoSource) -> Tuple[str,bool]:
+def resolve_playlist(index_season_selected: int, index_episode_selected: int, scrape_serie: GetSerieInfo, video_source: VideoSource) -> str:
+    """
+    Get the master playlist of an episode with a new video source, so episodes can be resolved in parallel.
+
+    Parameters:
+        - index_season_selected (int): Season number
+        - index_episode_selected (int): Episode index
+        - scrape_serie (GetSerieInfo): Scraper object with series information
+        - video_source (VideoSource): Video source of the series, used for its url, media id and proxy
+
+    Returns:
+        - str: Master playlist URL
+    """
+    obj_episode = scrape_serie.selectEpisode(index_season_selected, index_episode_selected-1)
+    episode_source = VideoSource(video_source.url, True, video_source.media_id, video_source.proxy)
+
+    episode_source.get_iframe(obj_episode.id)
+    episode_source.get_content()
+    return episode_source.get_playlist()
+
+
+def download_video(index_season_selected: int, index_episode_selected: int, scrape_serie: GetSerieInfo, video_source: VideoSource, prefetcher: EpisodePrefetcher = None) -> Tuple[str,bool]:
     """
     Downloads a specific episode from the specified season.
 
@@ -46,6 +70,7 @@ def download_video(index_season_selected: int, index_episode_selected: int, scra
         - index_episode_selected (int): Episode index
         - scrape_serie (GetSerieInfo): Scraper object with series information
         - video_source (VideoSource): Video source handler
+        - prefetcher (EpisodePrefetcher, optional): Playlists of the season resolved ahead of time
 
     Returns:
         - str: Path to downloaded file
@@ -76,9 +101,12 @@ def download_video(index_season_selected: int, index_episode_selected: int, scra
     mp4_path = os.path.join(site_constant.SERIES_FOLDER, scrape_serie.series_name, f"S{index_season_selected}")
 
     # Retrieve scws and if available master playlist
-    video_source.get_iframe(obj_episode.id)
-    video_source.get_content()
-    master_playlist = video_source.get_playlist()
+    if prefetcher is not None:
+        master_playlist = prefetcher.get(index_episode_selected)
+    else:
+        video_source.get_iframe(obj_episode.id)
+        video_source.get_content()
+        master_playlist = video_source.get_playlist()
 
     # Download the episode
     r_proc = HLS_Downloader(
@@ -110,16 +138,12 @@ def download_episode(index_season_selected: int, scrape_serie: GetSerieInfo, vid
 
     if episodes_count == 0:
         console.print(f"[red]No episodes found for season {index_season_selected}")
+        record_download_failure(f"{scrape_serie.series_name} S{index_season_selected}", "No episodes found")
         return
 
     if download_all:
         # Download all episodes in the season
-        for i_episode in range(1, episodes_count + 1):
-            path, stopped = download_video(index_season_selected, i_episode, scrape_serie, video_source)
-
-            if stopped:
-                break
-
+        download_episodes(index_season_selected, list(range(1, episodes_count + 1)), scrape_serie, video_source)
         console.print(f"\n[red]End downloaded [yellow]season: [red]{index_season_selected}.")
 
     else:
@@ -135,11 +159,23 @@ def download_episode(index_season_selected: int, scrape_serie: GetSerieInfo, vid
         list_episode_select = validate_episode_selection(list_episode_select, episodes_count)
 
         # Download selected episodes if not stopped
-        for i_episode in list_episode_select:
-            path, stopped = download_video(index_season_selected, i_episode, scrape_serie, video_source)
+        download_episodes(index_season_selected, list_episode_select, scrape_serie, video_source)
 
-            if stopped:
-                break
+
+def download_episodes(index_season_selected: int, list_episode_select: List[int], scrape_serie: GetSerieInfo, video_source: VideoSource) -> None:
+    """
+    Download the episodes, resolving the playlists of the next ones while the current ones download.
+
+    Parameters:
+        - index_season_selected (int): Season number
+        - list_episode_select (List[int]): Episodes to download
+        - scrape_serie (GetSerieInfo): Scraper object with series information
+        - video_source (VideoSource): Video source object
+    """
+    resolve = partial(resolve_playlist, index_season_selected, scrape_serie=scrape_serie, video_source=video_source)
+
+    with EpisodePrefetcher(resolve, list_episode_select, is_expired=VideoSource.is_playlist_expired) as prefetcher:
+        run_episode_downloads(lambda i_episode: download_video(index_season_selected, i_episode, scrape_serie, video_source, prefetcher), list_episode_select)
 
 
 def download_series(select_season: MediaItem, season_selection: str = None, episode_selection: str = None, proxy = None) -> None:
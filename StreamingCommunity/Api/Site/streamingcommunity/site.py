@@ -1,17 +1,15 @@
 # 10.12.23
 
-import json
-
 
 # External libraries
-import httpx
-from bs4 import BeautifulSoup
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
+from StreamingCommunity.Util.http_cache import cached_get, invalidate_cached
+from StreamingCommunity.Util.html_extract import get_inertia_page
 from StreamingCommunity.Util.table import TVShowManager
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
@@ -44,45 +42,56 @@ def title_search(query: str, proxy: str) -> int:
     media_search_manager.clear()
     table_show_manager.clear()
 
-    try:
-        response = httpx.get(
-            f"{site_constant.FULL_URL}/it", 
-            headers={'user-agent': get_userAgent()}, 
-            timeout=max_timeout,
-            proxy=proxy
-        )
-        response.raise_for_status()
+    version_url = f"{site_constant.FULL_URL}/it"
+    version_headers = {'user-agent': get_userAgent()}
+    search_url = f"{site_constant.FULL_URL}/it/search?q={query}"
+    console.print(f"[cyan]Search url: [yellow]{search_url}")
 
-        soup = BeautifulSoup(response.text, 'html.parser')
-        version = json.loads(soup.find('div', {'id': "app"}).get("data-page"))['version']
+    # A 409 means the site was updated after the version page was cached: drop it and retry once
+    for retry_version in (True, False):
+        try:
+            response = cached_get(
+                version_url, 
+                endpoint='search',
+                headers=version_headers, 
+                timeout=max_timeout,
+                proxy=proxy
+            )
+            response.raise_for_status()
 
-    except Exception as e:
-        if "WinError" in str(e) or "Errno" in str(e): console.print("\n[bold yellow]Please make sure you have enabled and configured a valid proxy.[/bold yellow]")
-        console.print(f"[red]Site: {site_constant.SITE_NAME} version, request error: {e}")
-        return 0
+            version = get_inertia_page(response.text)['version']
 
-    search_url = f"{site_constant.FULL_URL}/it/search?q={query}"
-    console.print(f"[cyan]Search url: [yellow]{search_url}")
+        except Exception as e:
+            if "WinError" in str(e) or "Errno" in str(e): console.print("\n[bold yellow]Please make sure you have enabled and configured a valid proxy.[/bold yellow]")
+            console.print(f"[red]Site: {site_constant.SITE_NAME} version, request error: {e}")
+            return 0
 
-    try:
-        response = httpx.get(
-            search_url, 
-            headers = {
-                'referer': site_constant.FULL_URL,
-                'user-agent': get_userAgent(),
-                'x-inertia': 'true',
-                'x-inertia-version': version
-            },
-            timeout=max_timeout,
-            proxy=proxy
-        )
-        response.raise_for_status()
+        try:
+            response = cached_get(
+                search_url, 
+                endpoint='search',
+                headers = {
+                    'referer': site_constant.FULL_URL,
+                    'user-agent': get_userAgent(),
+                    'x-inertia': 'true',
+                    'x-inertia-version': version
+                },
+                timeout=max_timeout,
+                proxy=proxy
+            )
+
+            if response.status_code == 409 and retry_version:
+                invalidate_cached(version_url, headers=version_headers)
+                continue
+
+            response.raise_for_status()
+            break
 
-    except Exception as e:
-        console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
-        if site_constant.TELEGRAM_BOT:
-            bot.send_message(f"ERRORE\n\nErrore nella richiesta di ricerca:\n\n{e}", None)
-        return 0
+        except Exception as e:
+            console.print(f"[red]Site: {site_constant.SITE_NAME}, request search error: {e}")
+            if site_constant.TELEGRAM_BOT:
+                bot.send_message(f"ERRORE\n\nErrore nella richiesta di ricerca:\n\n{e}", None)
+            return 0
 
     # Prepara le scelte per l'utente
     if site_constant.TELEGRAM_BOT:
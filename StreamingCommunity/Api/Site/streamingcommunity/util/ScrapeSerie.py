@@ -1,17 +1,13 @@
 # 01.03.24
 
-import json
 import logging
 
 
-# External libraries
-import httpx
-from bs4 import BeautifulSoup
-
-
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_cache import cached_get, invalidate_cached
+from StreamingCommunity.Util.html_extract import get_inertia_page
 from StreamingCommunity.Api.Player.Helper.Vixcloud.util import SeasonManager
 
 
@@ -40,6 +36,10 @@ class GetSerieInfo:
             self.is_series = True
             self.series_name = series_name
 
+    @property
+    def title_url(self) -> str:
+        return f"{self.url}/titles/{self.media_id}-{self.series_name}"
+
     def collect_info_title(self) -> None:
         """
         Retrieve general information about the TV series from the streaming site.
@@ -48,8 +48,9 @@ class GetSerieInfo:
             Exception: If there's an error fetching series information
         """
         try:
-            response = httpx.get(
-                url=f"{self.url}/titles/{self.media_id}-{self.series_name}",
+            response = cached_get(
+                url=self.title_url,
+                endpoint='title',
                 headers=self.headers,
                 timeout=max_timeout,
                 proxy=self.proxy
@@ -57,8 +58,7 @@ class GetSerieInfo:
             response.raise_for_status()
 
             # Extract series info from JSON response
-            soup = BeautifulSoup(response.text, "html.parser")
-            json_response = json.loads(soup.find("div", {"id": "app"}).get("data-page"))
+            json_response = get_inertia_page(response.text)
             self.version = json_response['version']
             
             # Extract information about available seasons
@@ -82,12 +82,13 @@ class GetSerieInfo:
             logging.error(f"Error collecting series info: {e}")
             raise
 
-    def collect_info_season(self, number_season: int) -> None:
+    def collect_info_season(self, number_season: int, retry_version: bool = True) -> None:
         """
         Retrieve episode information for a specific season.
         
         Args:
             number_season (int): Season number to fetch episodes for
+            retry_version (bool): Reload the title page once if the cached inertia version is outdated
         
         Raises:
             Exception: If there's an error fetching episode information
@@ -99,8 +100,9 @@ class GetSerieInfo:
                 logging.error(f"Season {number_season} not found")
                 return
             
-            response = httpx.get(
-                url=f'{self.url}/titles/{self.media_id}-{self.series_name}/season-{number_season}', 
+            response = cached_get(
+                url=f'{self.title_url}/season-{number_season}',
+                endpoint='season',
                 headers={
                     'User-Agent': self.headers['user-agent'],
                     'x-inertia': 'true',
@@ -110,6 +112,13 @@ class GetSerieInfo:
                 proxy=self.proxy
             )
 
+            # 409 means the site was updated after the title page was cached
+            if response.status_code == 409 and retry_version:
+                invalidate_cached(self.title_url, headers=self.headers)
+                self.seasons_manager = SeasonManager()
+                self.collect_info_title()
+                return self.collect_info_season(number_season, retry_version=False)
+
             # Extract episodes from JSON response
             json_response = response.json().get('props', {}).get('loadedSeason', {}).get('episodes', [])
                 
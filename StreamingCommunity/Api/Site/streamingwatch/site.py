@@ -4,13 +4,13 @@ import re
 
 
 # External libraries
-import httpx
 from bs4 import BeautifulSoup
 from rich.console import Console
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get, http_post
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.table import TVShowManager
 
@@ -29,7 +29,7 @@ max_timeout = config_manager.get_int("REQUESTS", "timeout")
 
 def extract_nonce(proxy) -> str:
     """Extract nonce value from the page script"""
-    response = httpx.get(
+    response = http_get(
         site_constant.FULL_URL, 
         headers={'user-agent': get_userAgent()}, 
         timeout=max_timeout,
@@ -74,7 +74,7 @@ def title_search(query: str, proxy: str) -> int:
             '_wpnonce': _wpnonce
         }
 
-        response = httpx.post(
+        response = http_post(
             search_url,
             headers={
                 'origin': site_constant.FULL_URL,
@@ -7,4 +7,6 @@ from .manage_ep import (
     validate_selection, 
     dynamic_format_number,
     display_episodes_list
-)
\ No newline at end of file
+)
+from .prefetch import EpisodePrefetcher
+from .parallel import run_episode_downloads
@@ -0,0 +1,133 @@
+# 18.10.26
+
+import queue
+import signal
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Tuple
+
+
+# External library
+from rich.console import Console
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Lib.Downloader.progress import progress_offset
+from StreamingCommunity.Lib.Downloader.HLS.controller import set_global_controller, get_global_controller
+from StreamingCommunity.Lib.Downloader.HLS.segments import interrupt_running_downloads
+from StreamingCommunity.Lib.Downloader.HLS.downloader import create_worker_budget, get_track_lines
+from StreamingCommunity.Lib.Downloader.HLS.postprocess import post_process_stage
+from StreamingCommunity.Lib.Downloader.report import record_download_failure
+
+
+# Config
+PARALLEL_EPISODES = config_manager.get_int('DEFAULT', 'parallel_episodes')
+
+
+# Variable
+console = Console()
+
+
+def run_episode_downloads(download: Callable[[int], Tuple[str, bool]], episodes: List[int], parallel: int = PARALLEL_EPISODES) -> bool:
+    """
+    Download the episodes one after the other, or `parallel` at a time sharing the `max_total_workers`
+    budget of segment requests, each with its own progress bars.
+
+    Parameters:
+        - download (Callable): Site function downloading one episode, returning (path, stopped).
+        - episodes (List[int]): Episodes in download order.
+        - parallel (int): Episodes downloaded at the same time.
+
+    Returns:
+        bool: True if the download was stopped.
+    """
+    paths: Dict[str, int] = {}
+
+    # Merges of finished episodes overlap with the next downloads when `postprocess_workers` is set
+    with post_process_stage() as stage:
+        stopped = _run_episode_downloads(download, episodes, parallel, paths)
+
+    # The stage has been waited: episodes returned a pending response, whose final path and error are only known now
+    if stage is not None:
+        for path, result in stage.results.items():
+            if result['error'] is not None:
+                console.print(f"[red]Episode {paths.get(path, path)} failed: {result['error']}")
+            elif result['path'] != path:
+                console.print(f"[yellow]Episode {paths.get(path, path)} saved with missing segments: {result['path']}")
+
+    return stopped
+
+
+def _run_episode_downloads(download: Callable[[int], Tuple[str, bool]], episodes: List[int], parallel: int, paths: Dict[str, int]) -> bool:
+    """
+    Run the downloads, recording in `paths` the episode of every returned output path.
+    With a post-processing stage these paths are provisional and only used to match the stage results.
+    """
+    if parallel <= 1 or len(episodes) <= 1:
+        for episode in episodes:
+            path, stopped = download(episode)
+            paths[path] = episode
+
+            if stopped:
+                return True
+
+        return False
+
+    stop_event = threading.Event()
+    lines = get_track_lines()
+    slots = queue.Queue()
+    for slot in range(parallel):
+        slots.put(slot)
+
+    def run(episode: int) -> None:
+        if stop_event.is_set():
+            return
+
+        slot = slots.get()
+        try:
+            progress_offset.set(slot * lines)
+            path, stopped = download(episode)
+            paths[path] = episode
+            if stopped:
+                stop_event.set()
+
+        finally:
+            slots.put(slot)
+
+    def handle_interrupt(signum, frame):
+        stop_event.set()
+        interrupt_running_downloads()
+
+    # Episodes started by a queue worker already share its budget
+    owns_budget = get_global_controller() is None
+    if owns_budget:
+        set_global_controller(create_worker_budget())
+
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    if on_main_thread:
+        previous_handler = signal.signal(signal.SIGINT, handle_interrupt)
+
+    try:
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+
+            # Each episode gets its own copy of the context, keeping the bound site and its bar offset
+            futures = {executor.submit(contextvars.copy_context().run, run, episode): episode for episode in episodes}
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Episode {futures[future]} failed: {e}")
+                    console.print(f"[red]Episode {futures[future]} failed: {e}")
+                    record_download_failure(f"Episode {futures[future]}", str(e))
+
+    finally:
+        if on_main_thread:
+            signal.signal(signal.SIGINT, previous_handler)
+        if owns_budget:
+            set_global_controller(None)
+
+    return stop_event.is_set()
@@ -0,0 +1,83 @@
+# 18.10.26
+
+import logging
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+PREFETCH_EPISODES = config_manager.get_int('DEFAULT', 'prefetch_episodes')
+
+
+class EpisodePrefetcher:
+    def __init__(self, resolve: Callable[[int], Any], episodes: List[int], depth: int = PREFETCH_EPISODES, is_expired: Optional[Callable[[Any], bool]] = None):
+        """
+        Resolve the next episodes in the background while the current one downloads.
+
+        Parameters:
+            - resolve (Callable): Function returning what an episode needs to start, e.g. its master playlist.
+            - episodes (List[int]): Episodes in download order.
+            - depth (int): How many episodes ahead are resolved, 0 disables the prefetch.
+            - is_expired (Callable, optional): Tells if a prefetched result can no longer be used, e.g. an expired token.
+        """
+        self.resolve = resolve
+        self.episodes = list(episodes)
+        self.depth = max(depth, 0)
+        self.is_expired = is_expired
+        self.futures: Dict[int, Future] = {}
+        self.started = set()
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=self.depth) if self.depth > 0 else None
+
+    def _submit(self, episode: int) -> None:
+        if episode not in self.futures and episode not in self.started:
+
+            # Keep the site bound by the caller, contextvars are not inherited by worker threads
+            context = contextvars.copy_context()
+            self.futures[episode] = self.executor.submit(context.run, self.resolve, episode)
+            self.started.add(episode)
+
+    def get(self, episode: int) -> Any:
+        """
+        Return the result for `episode` and start resolving the following ones.
+        Results that failed or expired while waiting are resolved again.
+        """
+        with self.lock:
+            future = self.futures.pop(episode, None)
+            self.started.add(episode)
+
+            if self.executor is not None and episode in self.episodes:
+                position = self.episodes.index(episode)
+                for next_episode in self.episodes[position + 1:position + 1 + self.depth]:
+                    self._submit(next_episode)
+
+        if future is not None:
+            try:
+                result = future.result()
+                if self.is_expired is None or not self.is_expired(result):
+                    return result
+
+                logging.info(f"Prefetched episode {episode} expired, resolving it again")
+
+            except Exception as e:
+                logging.error(f"Prefetch of episode {episode} failed: {e}")
+
+        return self.resolve(episode)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            for future in self.futures.values():
+                future.cancel()
+            self.executor.shutdown(wait=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -2,12 +2,51 @@
 
 import os
 import inspect
+import functools
+from contextvars import ContextVar
+from typing import Callable, Optional
 
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 
 
+class SiteContext:
+    def __init__(self, site_name: str):
+        """
+        Identifies the site a plugin call runs for, so SiteConstant does not have to inspect the stack.
+
+        Parameters:
+            - site_name (str): Name of the site package in Api/Site.
+        """
+        self.site_name = site_name
+
+    def bind(self, func: Callable) -> Callable:
+        """
+        Wrap a plugin entry point so every call made from it sees this context.
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            token = _current_site.set(self)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _current_site.reset(token)
+
+        return wrapper
+
+
+# Variable
+_current_site: ContextVar[Optional[SiteContext]] = ContextVar('current_site', default=None)
+
+
+def bind_site(site_name: str, func: Callable) -> Callable:
+    """
+    Bind a plugin entry point (usually `search`) to its site when the plugin is registered.
+    """
+    return SiteContext(site_name).bind(func)
+
+
 def get_site_name_from_stack():
     for frame_info in inspect.stack():
         file_path = frame_info.filename
@@ -25,6 +64,11 @@ def get_site_name_from_stack():
 class SiteConstant:
     @property
     def SITE_NAME(self):
+        context = _current_site.get()
+        if context is not None:
+            return context.site_name
+
+        # Called outside a bound entry point, e.g. a site function imported directly
         return get_site_name_from_stack()
     
     @property
@@ -0,0 +1,154 @@
+# 18.10.26
+
+import os
+import sys
+import ast
+import glob
+import json
+import logging
+import importlib
+from types import ModuleType
+from typing import Callable, Dict, List
+
+
+# External library
+from rich.console import Console
+
+
+# Internal utilities
+from StreamingCommunity.Util.os import get_cache_dir
+from StreamingCommunity.Api.Template.config_loader import bind_site
+
+
+# Variable
+console = Console()
+MANIFEST_NAME = "site_manifest.json"
+MANIFEST_FIELDS = {
+    'indice': 'indice',
+    '_useFor': 'use_for',
+    '_priority': 'priority',
+    '_deprecate': 'deprecate',
+    '_engineDownload': 'engine'
+}
+
+# Values of the sites that do not define a field, as the module based loader used
+MANIFEST_DEFAULTS = {
+    'indice': 0,
+    'use_for': 'other',
+    'priority': 0,
+    'deprecate': False
+}
+
+
+def get_site_dir() -> str:
+    """Returns the folder containing the site packages."""
+    if getattr(sys, 'frozen', False):  # Modalità PyInstaller
+        base_path = os.path.join(sys._MEIPASS, "StreamingCommunity")
+    else:
+        base_path = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+    return os.path.join(base_path, 'Api', 'Site')
+
+
+def read_site_metadata(init_file: str) -> Dict:
+    """
+    Read the module level metadata (`indice`, `_useFor`, ...) of a site without importing it.
+
+    Parameters:
+        - init_file (str): Path of the site `__init__.py`.
+    """
+    with open(init_file, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=init_file)
+
+    metadata = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name = node.targets[0].id
+            if name in MANIFEST_FIELDS:
+                metadata[MANIFEST_FIELDS[name]] = ast.literal_eval(node.value)
+
+    return metadata
+
+
+def import_site_metadata(module_name: str) -> Dict:
+    """Fallback for sites whose metadata is not made of literals."""
+    mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
+    return {key: getattr(mod, attr) for attr, key in MANIFEST_FIELDS.items() if hasattr(mod, attr)}
+
+
+def load_site_manifest() -> List[Dict]:
+    """
+    Get the metadata of every site, sorted by 'indice'.
+
+    The metadata is cached in a manifest next to config.json, and a site is parsed again only
+    when the modification time of its `__init__.py` changes.
+
+    Returns:
+        List[Dict]: One dict per site with 'name', 'indice', 'use_for', 'priority', 'deprecate' and 'engine'.
+    """
+    manifest_path = os.path.join(get_cache_dir(), MANIFEST_NAME)
+
+    cached = {}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r') as f:
+                cached = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Cannot read site manifest {manifest_path}: {e}")
+
+    manifest = {}
+    changed = False
+
+    for init_file in glob.glob(os.path.join(get_site_dir(), '*', '__init__.py')):
+        module_name = os.path.basename(os.path.dirname(init_file))
+        mtime = os.path.getmtime(init_file)
+
+        entry = cached.get(module_name)
+        if entry is None or entry.get('mtime') != mtime:
+            changed = True
+            logging.info(f"Read site metadata: {module_name}")
+
+            try:
+                metadata = read_site_metadata(init_file)
+            except (SyntaxError, ValueError) as e:
+                logging.info(f"Metadata of {module_name} is not literal, importing it: {e}")
+                metadata = import_site_metadata(module_name)
+
+            entry = {'name': module_name, 'mtime': mtime, **MANIFEST_DEFAULTS, **metadata}
+
+        manifest[module_name] = entry
+
+    if changed or set(manifest) != set(cached):
+        try:
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=4)
+        except OSError as e:
+            logging.error(f"Cannot write site manifest {manifest_path}: {e}")
+
+    return sorted(manifest.values(), key=lambda site: site.get('indice', 0))
+
+
+def import_site(module_name: str) -> ModuleType:
+    """Import the package of a site."""
+    return importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
+
+
+def get_lazy_search(module_name: str) -> Callable:
+    """
+    Returns the `search` function of a site, importing the site only when it is first called.
+
+    Parameters:
+        - module_name (str): Name of the site package.
+    """
+    def search(*args, **kwargs):
+        try:
+            mod = import_site(module_name)
+        except Exception as e:
+            console.print(f"[red]Failed to import module {module_name}: {str(e)}")
+            logging.exception(f"Import of site {module_name} failed")
+            return None
+
+        return mod.search(*args, **kwargs)
+
+    search.__name__ = f"{module_name}_search"
+    return bind_site(module_name, search)
@@ -0,0 +1,163 @@
+# 18.10.26
+
+import time
+import asyncio
+import logging
+import threading
+from typing import Optional
+
+
+class WorkerController:
+    def __init__(self, initial_workers: int, max_workers: int, min_workers: int = 1, adaptive: bool = False):
+        """
+        Limits how many segment requests run at once and, when adaptive, tunes that limit with AIMD.
+
+        Every window of completed requests the limit grows by one while the retry rate stays low,
+        latency stays close to the best observed and throughput does not drop, and is cut
+        multiplicatively when the retry rate or latency rise.
+
+        Parameters:
+            - initial_workers (int): Starting concurrency.
+            - max_workers (int): Upper bound of the concurrency.
+            - min_workers (int): Lower bound of the concurrency.
+            - adaptive (bool): Adjust the limit at runtime, otherwise it stays at `initial_workers`.
+        """
+        self.min_workers = max(1, min_workers)
+        self.max_workers = max(self.min_workers, max_workers)
+        self.limit = min(max(initial_workers, self.min_workers), self.max_workers)
+        self.adaptive = adaptive
+
+        self.in_flight = 0
+        self.cond = threading.Condition()
+
+        # Stats of the current window
+        self.window_start = time.monotonic()
+        self.window_attempts = 0
+        self.window_failures = 0
+        self.window_latency = 0.0
+        self.window_bytes = 0
+
+        # Reference values from previous windows
+        self.best_latency = None
+        self.last_throughput = 0.0
+
+    def acquire(self, stop_event: Optional[threading.Event] = None, timeout: float = 0.5) -> bool:
+        """
+        Wait for a free slot (thread engine).
+
+        Parameters:
+            - stop_event (threading.Event, optional): Give up waiting once it is set.
+            - timeout (float): Seconds between two checks of `stop_event`.
+
+        Returns:
+            bool: True if a slot was taken, False if the wait was stopped.
+        """
+        with self.cond:
+            while self.in_flight >= self.limit:
+                if stop_event is not None and stop_event.is_set():
+                    return False
+                self.cond.wait(timeout)
+
+            self.in_flight += 1
+            return True
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting."""
+        with self.cond:
+            if self.in_flight >= self.limit:
+                return False
+            self.in_flight += 1
+            return True
+
+    async def acquire_async(self, stop_event: Optional[threading.Event] = None) -> bool:
+        """
+        Wait for a free slot (asyncio engine).
+        Polls instead of awaiting a loop-bound primitive so the same controller can be shared by
+        tracks running on different event loops and threads.
+
+        Returns:
+            bool: True if a slot was taken, False if `stop_event` was set while waiting.
+        """
+        while not self.try_acquire():
+            if stop_event is not None and stop_event.is_set():
+                return False
+            await asyncio.sleep(0.01)
+
+        return True
+
+    def wake_all(self) -> None:
+        """Wake every thread waiting for a slot, so it checks its stop flag right away."""
+        with self.cond:
+            self.cond.notify_all()
+
+    def release(self, latency: float, size: int, failed: bool) -> None:
+        """
+        Free a slot and record the outcome of the request.
+
+        Parameters:
+            - latency (float): Seconds spent on the request.
+            - size (int): Bytes received.
+            - failed (bool): Whether the attempt failed and will be retried.
+        """
+        with self.cond:
+            self.in_flight -= 1
+            self._record(latency, size, failed)
+            self.cond.notify_all()
+
+    def _record(self, latency: float, size: int, failed: bool) -> None:
+        if not self.adaptive:
+            return
+
+        self.window_attempts += 1
+        self.window_latency += latency
+        self.window_bytes += size
+        if failed:
+            self.window_failures += 1
+
+        if self.window_attempts >= max(self.limit, 8):
+            self._adjust()
+
+    def _adjust(self) -> None:
+        """Apply the AIMD step using the stats of the window that just ended."""
+        elapsed = max(time.monotonic() - self.window_start, 1e-6)
+        retry_rate = self.window_failures / self.window_attempts
+        avg_latency = self.window_latency / self.window_attempts
+        throughput = self.window_bytes / elapsed
+        previous = self.limit
+
+        if self.best_latency is None or avg_latency < self.best_latency:
+            self.best_latency = avg_latency
+
+        if retry_rate > 0.1:
+            self.limit = max(self.min_workers, int(self.limit * 0.5))
+        elif avg_latency > self.best_latency * 2:
+            self.limit = max(self.min_workers, int(self.limit * 0.75))
+        elif throughput >= self.last_throughput * 0.95:
+            self.limit = min(self.max_workers, self.limit + 1)
+
+        if self.limit != previous:
+            logging.info(f"Worker limit {previous} -> {self.limit} (retry rate: {retry_rate:.2f}, latency: {avg_latency:.2f}s, throughput: {throughput / 1024:.0f} KB/s)")
+
+        self.last_throughput = throughput
+        self.window_start = time.monotonic()
+        self.window_attempts = 0
+        self.window_failures = 0
+        self.window_latency = 0.0
+        self.window_bytes = 0
+
+
+# Variable
+_global_controller: Optional[WorkerController] = None
+
+
+def set_global_controller(controller: Optional[WorkerController]) -> None:
+    """
+    Share `controller` with every HLS download started while it is set, e.g. episodes downloaded
+    at the same time, so their total number of segment requests stays bounded. None removes it.
+    """
+    global _global_controller
+    _global_controller = controller
+
+
+def get_global_controller() -> Optional[WorkerController]:
+    return _global_controller
@@ -3,9 +3,12 @@
 import os
 import re
 import time
+import signal
 import logging
 import shutil
-from typing import Any, Dict, List, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
 
 
 # External libraries
@@ -17,7 +20,8 @@ from rich.panel import Panel
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.headers import get_userAgent
-from StreamingCommunity.Util.os import compute_sha1_hash, os_manager, internet_manager
+from StreamingCommunity.Util.http_client import http_get
+from StreamingCommunity.Util.os import compute_sha1_hash, os_manager, internet_manager, get_ffmpeg_path
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 
@@ -26,10 +30,17 @@ from ...FFmpeg import (
     print_duration_table,
     join_video,
     join_audios,
-    join_subtitle
+    join_subtitle,
+    join_all,
+    get_video_duration,
+    FFmpegProgress
 )
 from ...M3U8 import M3U8_Parser, M3U8_UrlFix
 from .segments import M3U8_Segments
+from .journal import SegmentJournal
+from .controller import WorkerController, get_global_controller
+from .postprocess import get_post_process_stage
+from ..report import record_download_failure
 
 
 # Config
@@ -40,6 +51,12 @@ DOWNLOAD_SPECIFIC_SUBTITLE = config_manager.get_list('M3U8_DOWNLOAD', 'specific_
 MERGE_AUDIO = config_manager.get_bool('M3U8_DOWNLOAD', 'merge_audio')
 MERGE_SUBTITLE = config_manager.get_bool('M3U8_DOWNLOAD', 'merge_subs')
 CLEANUP_TMP = config_manager.get_bool('M3U8_DOWNLOAD', 'cleanup_tmp_folder')
+USE_ASYNC_ENGINE = config_manager.get_bool('M3U8_DOWNLOAD', 'use_async_engine')
+PARALLEL_TRACKS = config_manager.get_bool('M3U8_DOWNLOAD', 'parallel_tracks')
+STREAM_MUX = config_manager.get_bool('M3U8_DOWNLOAD', 'stream_mux')
+MAX_TOTAL_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'max_total_workers')
+ADAPTIVE_WORKERS = config_manager.get_bool('M3U8_DOWNLOAD', 'adaptive_workers')
+DEFAULT_VIDEO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_video_workser')
 FILTER_CUSTOM_REOLUTION = str(config_manager.get('M3U8_PARSER', 'force_resolution')).strip().lower()
 GET_ONLY_LINK = config_manager.get_bool('M3U8_PARSER', 'get_only_link')
 RETRY_LIMIT = config_manager.get_int('REQUESTS', 'max_retry')
@@ -49,6 +66,22 @@ TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
 console = Console()
 
 
+def create_worker_budget() -> WorkerController:
+    """Create a budget of `max_total_workers` segment requests, shared by the tracks or episodes downloaded together."""
+    if ADAPTIVE_WORKERS:
+        return WorkerController(min(DEFAULT_VIDEO_WORKERS, MAX_TOTAL_WORKERS), MAX_TOTAL_WORKERS, adaptive=True)
+
+    return WorkerController(MAX_TOTAL_WORKERS, MAX_TOTAL_WORKERS)
+
+
+def get_track_lines() -> int:
+    """Number of progress bars an HLS download can show at the same time."""
+    if PARALLEL_TRACKS:
+        return 1 + (len(DOWNLOAD_SPECIFIC_AUDIO) if ENABLE_AUDIO else 0)
+
+    return 1
+
+
 class HLSClient:
     """Client for making HTTP requests to HLS endpoints with retry mechanism."""
     def __init__(self):
@@ -65,10 +98,9 @@ class HLSClient:
         Returns:
             Response content/text or None if all retries fail
         """
-        client = httpx.Client(headers=self.headers, timeout=MAX_TIMEOUT, follow_redirects=True)
         for attempt in range(RETRY_LIMIT):
             try:
-                response = client.get(url)
+                response = http_get(url, headers=self.headers, timeout=MAX_TIMEOUT, follow_redirects=True)
                 response.raise_for_status()
                 return response.content if return_content else response.text
 
@@ -255,13 +287,21 @@ class DownloadManager:
         self.missing_segments = []
         self.stopped = False
 
-    def download_video(self, video_url: str):
-        """Downloads video segments from the M3U8 playlist."""
+        # Set while tracks are downloaded concurrently
+        self.shared_controller: Optional[WorkerController] = None
+        self.active_downloaders: List[M3U8_Segments] = []
+
+    def download_video(self, video_url: str, position: Optional[int] = None, mux_path: Optional[str] = None):
+        """
+        Downloads video segments from the M3U8 playlist.
+        With `mux_path` the segments are remuxed by FFmpeg while downloading instead of being stored as ts.
+        """
         video_full_url = self.url_fixer.generate_full_url(video_url)
         video_tmp_dir = os.path.join(self.temp_dir, 'video')
 
-        downloader = M3U8_Segments(url=video_full_url, tmp_folder=video_tmp_dir)
-        result = downloader.download_streams("Video", "video")
+        downloader = M3U8_Segments(url=video_full_url, tmp_folder=video_tmp_dir, mux_path=mux_path)
+        self.active_downloaders.append(downloader)
+        result = downloader.download_streams("Video", "video", use_async=USE_ASYNC_ENGINE, controller=self.shared_controller, position=position)
         self.missing_segments.append(result)
 
         if result.get('stopped', False):
@@ -269,7 +309,7 @@ class DownloadManager:
         
         return self.stopped
 
-    def download_audio(self, audio: Dict):
+    def download_audio(self, audio: Dict, position: Optional[int] = None):
         """Downloads audio segments for a specific language track."""
         #if self.stopped:
         #    return True
@@ -278,14 +318,15 @@ class DownloadManager:
         audio_tmp_dir = os.path.join(self.temp_dir, 'audio', audio['language'])
 
         downloader = M3U8_Segments(url=audio_full_url, tmp_folder=audio_tmp_dir)
-        result = downloader.download_streams(f"Audio {audio['language']}", "audio")
+        self.active_downloaders.append(downloader)
+        result = downloader.download_streams(f"Audio {audio['language']}", "audio", use_async=USE_ASYNC_ENGINE, controller=self.shared_controller, position=position)
         self.missing_segments.append(result)
 
         if result.get('stopped', False):
             self.stopped = True
         return self.stopped
 
-    def download_subtitle(self, sub: Dict):
+    def download_subtitle(self, sub: Dict, position: Optional[int] = None):
         """Downloads and saves subtitle file for a specific language."""
         #if self.stopped:
         #    return True
@@ -304,40 +345,97 @@ class DownloadManager:
 
         return self.stopped
 
-    def download_all(self, video_url: str, audio_streams: List[Dict], sub_streams: List[Dict]):
+    def download_all(self, video_url: str, audio_streams: List[Dict], sub_streams: List[Dict], mux_path: Optional[str] = None):
         """
         Downloads all selected streams (video, audio, subtitles).
+        With `parallel_tracks` enabled the tracks are downloaded at the same time.
+        With `mux_path` the video is the only track and is remuxed to that file while downloading.
         """
-        return_stopped = False
+        if mux_path is not None:
+            return self.download_video(video_url, mux_path=mux_path)
+
+        tracks = []
 
         video_file = os.path.join(self.temp_dir, 'video', '0.ts')
-        if not os.path.exists(video_file):
-            if self.download_video(video_url):
-                if not return_stopped:
-                    return_stopped = True
+        if not SegmentJournal.is_download_complete(video_file):
+            tracks.append((self.download_video, video_url))
+        else:
+            self._add_finished_track("video", video_file)
 
         for audio in audio_streams:
-            #if self.stopped:
-            #    break
-
             audio_file = os.path.join(self.temp_dir, 'audio', audio['language'], '0.ts')
-            if not os.path.exists(audio_file):
-                if self.download_audio(audio):
-                    if not return_stopped:
-                        return_stopped = True
+            if not SegmentJournal.is_download_complete(audio_file):
+                tracks.append((self.download_audio, audio))
+            else:
+                self._add_finished_track("audio", audio_file)
 
         for sub in sub_streams:
-            #if self.stopped:
-            #    break
-
             sub_file = os.path.join(self.temp_dir, 'subs', f"{sub['language']}.vtt")
             if not os.path.exists(sub_file):
-                if self.download_subtitle(sub):
-                    if not return_stopped:
+                tracks.append((self.download_subtitle, sub))
+
+        if PARALLEL_TRACKS and len(tracks) > 1:
+            return self._download_concurrently(tracks)
+
+        return_stopped = False
+        for download, stream in tracks:
+            if download(stream):
+                return_stopped = True
+
+        return return_stopped
+
+    def _add_finished_track(self, stream_type: str, data_path: str) -> None:
+        """Report the segments a previous run gave up on for a track that is not downloaded again."""
+        self.missing_segments.append({
+            'type': stream_type,
+            'nFailed': len(SegmentJournal.get_failed_segments(data_path)),
+            'stopped': False
+        })
+
+    def _download_concurrently(self, tracks: List) -> bool:
+        """
+        Downloads all tracks at the same time, sharing a single budget of in-flight segment requests.
+        Each segmented track gets its own line in the progress display.
+        """
+        self.shared_controller = self._get_shared_controller()
+        on_main_thread = threading.current_thread() is threading.main_thread()
+        if on_main_thread:
+            previous_handler = signal.getsignal(signal.SIGINT)
+            signal.signal(signal.SIGINT, self._forward_interrupt)
+
+        return_stopped = False
+        try:
+            with ThreadPoolExecutor(max_workers=len(tracks)) as executor:
+                futures = []
+                position = 0
+
+                for download, stream in tracks:
+                    if download == self.download_subtitle:
+                        futures.append(executor.submit(download, stream))
+                    else:
+                        futures.append(executor.submit(download, stream, position))
+                        position += 1
+
+                for future in as_completed(futures):
+                    if future.result():
                         return_stopped = True
 
+        finally:
+            if on_main_thread:
+                signal.signal(signal.SIGINT, previous_handler)
+            self.shared_controller = None
+
         return return_stopped
 
+    def _get_shared_controller(self) -> WorkerController:
+        """Get the worker budget shared by all tracks, the global one if episodes are downloaded together."""
+        return get_global_controller() or create_worker_budget()
+
+    def _forward_interrupt(self, signum, frame):
+        """Deliver Ctrl+C to every track being downloaded."""
+        for downloader in self.active_downloaders:
+            downloader.handle_interrupt(signum, frame)
+
 
 class MergeManager:
     """Handles merging of video, audio, and subtitle streams."""
@@ -361,12 +459,17 @@ class MergeManager:
 
         Process:
         1. If no audio/subs, just process video
-        2. If audio exists, merge with video
-        3. If subtitles exist, add them to the video
+        2. If audio or subtitles have to be merged, mux everything in a single pass
+        3. If the single pass fails, merge audio with video, then add subtitles to the result
         """
         video_file = os.path.join(self.temp_dir, 'video', '0.ts')
         merged_file = video_file
 
+        if self.audio_streams or self.sub_streams:
+            single_pass_file = self._merge_single_pass(video_file)
+            if single_pass_file is not None:
+                return single_pass_file
+
         if not self.audio_streams and not self.sub_streams:
             merged_file = join_video(
                 video_path=video_file,
@@ -404,6 +507,66 @@ class MergeManager:
 
         return merged_file
 
+    def _get_telegram_progress(self, video_file: str) -> Optional[Callable[[FFmpegProgress], None]]:
+        """
+        Callback reporting the merge from the Telegram bot, one message every quarter of the video duration.
+        """
+        duration = get_video_duration(video_file)
+        if not duration:
+            return None
+
+        bot = get_bot_instance()
+        next_quarter = [1]
+
+        def report(progress: FFmpegProgress) -> None:
+            quarter = int(progress.out_time / duration * 4)
+            if quarter >= next_quarter[0] and quarter < 4:
+                next_quarter[0] = quarter + 1
+                bot.send_message(f"Unione in corso: {quarter * 25}%", None)
+
+        return report
+
+    def _merge_single_pass(self, video_file: str) -> Optional[str]:
+        """
+        Muxes video, audio tracks and subtitles with one FFmpeg invocation.
+        Returns None when nothing has to be merged or the staged join has to be used instead.
+        """
+        audio_tracks = []
+        if MERGE_AUDIO and self.audio_streams:
+            audio_tracks = [{
+                'path': os.path.join(self.temp_dir, 'audio', a['language'], '0.ts'),
+                'name': a['language']
+            } for a in self.audio_streams]
+
+        sub_tracks = []
+        if MERGE_SUBTITLE and self.sub_streams:
+            sub_tracks = [{
+                'path': os.path.join(self.temp_dir, 'subs', f"{s['language']}.vtt"),
+                'language': s['language']
+            } for s in self.sub_streams]
+
+        if not audio_tracks and not sub_tracks:
+            return None
+
+        try:
+            merged_file = join_all(
+                video_path=video_file,
+                audio_tracks=audio_tracks,
+                subtitles_list=sub_tracks,
+                out_path=os.path.join(self.temp_dir, 'final.mp4'),
+                codec=self.parser.codec,
+                on_progress=self._get_telegram_progress(video_file) if TELEGRAM_BOT else None
+            )
+
+        except Exception as e:
+            logging.error(f"Single pass merge error: {e}")
+            merged_file = None
+
+        if merged_file is None:
+            console.log("[yellow]Single pass merge failed, merging tracks one at a time...")
+
+        return merged_file
+
 
 class HLS_Downloader:
     """Main class for HLS video download and processing."""
@@ -424,6 +587,8 @@ class HLS_Downloader:
                 - path: Output file path
                 - url: Original M3U8 URL
                 - is_master: Whether the M3U8 was a master playlist
+                - pending: True if merge, move and cleanup were handed to the post-processing stage:
+                  path and error are provisional until the stage is waited, which fills in this same dict
             Or raises an exception if there's an error
         """
         console.print(f"[cyan]You can safely stop the download with [bold]Ctrl+c[bold] [cyan] \n")
@@ -440,7 +605,8 @@ class HLS_Downloader:
                     'is_master': False,
                     'msg': 'File already exists',
                     'error': None,
-                    'stopped': False
+                    'stopped': False,
+                    'pending': False
                 }
                 if TELEGRAM_BOT:
                     bot.send_message(f"Contenuto già scaricato!", None)
@@ -454,7 +620,8 @@ class HLS_Downloader:
                     'is_master': getattr(self.m3u8_manager, 'is_master', None),
                     'msg': None,
                     'error': None,
-                    'stopped': True
+                    'stopped': True,
+                    'pending': False
                 }
 
 
@@ -472,37 +639,46 @@ class HLS_Downloader:
             )
 
             # Check if download was stopped
+            mux_path = self._get_stream_mux_path()
             download_stopped = self.download_manager.download_all(
                 video_url=self.m3u8_manager.video_url,
                 audio_streams=self.m3u8_manager.audio_streams,
-                sub_streams=self.m3u8_manager.sub_streams
+                sub_streams=self.m3u8_manager.sub_streams,
+                mux_path=mux_path
             )
 
-            self.merge_manager = MergeManager(
-                temp_dir=self.path_manager.temp_dir,
-                parser=self.m3u8_manager.parser,
-                audio_streams=self.m3u8_manager.audio_streams,
-                sub_streams=self.m3u8_manager.sub_streams
-            )
-
-            final_file = self.merge_manager.merge()
-            self.path_manager.move_final_file(final_file)
-            self._print_summary()
-            self.path_manager.cleanup()
-
-            return {
+            response = {
                 'path': self.path_manager.output_path,
                 'url': self.m3u8_url,
                 'is_master': self.m3u8_manager.is_master,
                 'msg': None,
                 'error': None,
-                'stopped': download_stopped
+                'stopped': download_stopped,
+                'pending': False
             }
 
+            # Keep the temporary files and the journals so the next run resumes the stopped tracks
+            if download_stopped:
+                response['path'] = None
+                response['msg'] = 'Download stopped, run it again to resume'
+                return response
+
+            # Merge, move and cleanup run while the next title downloads: the response stays pending
+            # until the stage is waited, which reports the final response of every title it handled
+            stage = get_post_process_stage()
+            if stage is not None:
+                response['pending'] = True
+                stage.submit(lambda: self._post_process_background(mux_path, response), response)
+                return response
+
+            response['path'] = self._post_process(mux_path)
+            return response
+
         except Exception as e:
             error_msg = str(e)
             console.print(f"[red]Download failed: {error_msg}[/red]")
             logging.error("Download error", exc_info=True)
+            record_download_failure(os.path.basename(self.path_manager.output_path), error_msg)
 
             return {
                 'path': None,
@@ -510,11 +686,71 @@ class HLS_Downloader:
                 'is_master': getattr(self.m3u8_manager, 'is_master', None),
                 'msg': None,
                 'error': error_msg,
-                'stopped': False
+                'stopped': False,
+                'pending': False
             }
 
-    def _print_summary(self):
-        """Prints download summary including file size, duration, and any missing segments."""
+    def _post_process(self, mux_path: Optional[str]) -> str:
+        """
+        Merges the tracks, moves the result to the output path and removes the temporary files.
+
+        Returns:
+            str: Final path of the file, renamed by `_print_summary` if segments are missing.
+        """
+        if mux_path is not None:
+            final_file = mux_path
+
+        else:
+            self.merge_manager = MergeManager(
+                temp_dir=self.path_manager.temp_dir,
+                parser=self.m3u8_manager.parser,
+                audio_streams=self.m3u8_manager.audio_streams,
+                sub_streams=self.m3u8_manager.sub_streams
+            )
+
+            final_file = self.merge_manager.merge()
+        self.path_manager.move_final_file(final_file)
+        final_path = self._print_summary()
+        self.path_manager.cleanup()
+        return final_path
+
+    def _post_process_background(self, mux_path: Optional[str], response: Dict[str, Any]) -> None:
+        """Runs `_post_process` on the post-processing stage, filling in the final path or the failure in `response`."""
+        try:
+            response['path'] = self._post_process(mux_path)
+
+        except Exception as e:
+            error_msg = str(e)
+            console.print(f"[red]Post-processing of {os.path.basename(self.path_manager.output_path)} failed: {error_msg}[/red]")
+            logging.error("Post-processing error", exc_info=True)
+            record_download_failure(os.path.basename(self.path_manager.output_path), error_msg)
+
+            response['path'] = None
+            response['error'] = error_msg
+
+        finally:
+            response['pending'] = False
+
+    def _get_stream_mux_path(self) -> Optional[str]:
+        """
+        Returns the output of the streaming remux, or None if the tracks have to be stored and merged afterwards.
+        Streaming is only used for a lone video track copied without re-encoding.
+        """
+        if not STREAM_MUX or self.m3u8_manager.audio_streams or self.m3u8_manager.sub_streams:
+            return None
+
+        if config_manager.get_bool("M3U8_CONVERSION", "use_codec") or not get_ffmpeg_path():
+            return None
+
+        return os.path.join(self.path_manager.temp_dir, 'video.mp4')
+
+    def _print_summary(self) -> str:
+        """
+        Prints download summary including file size, duration, and any missing segments.
+
+        Returns:
+            str: Path of the output file, with a '_failed' suffix if segments are missing.
+        """
         if TELEGRAM_BOT:
             bot = get_bot_instance()
 
@@ -539,12 +775,16 @@ class HLS_Downloader:
             clean_message = re.sub(r'\[[a-zA-Z]+\]', '', message)
             bot.send_message(clean_message, None)
 
+        final_path = self.path_manager.output_path
         if missing_ts:
             panel_content += f"\n{missing_info}"
-            os.rename(self.path_manager.output_path, self.path_manager.output_path.replace(".mp4", "_failed.mp4"))
+            final_path = self.path_manager.output_path.replace(".mp4", "_failed.mp4")
+            os.rename(self.path_manager.output_path, final_path)
 
         console.print(Panel(
             panel_content,
             title=f"{os.path.basename(self.path_manager.output_path.replace('.mp4', ''))}",
             border_style="green"
-        ))
\ No newline at end of file
+        ))
+
+        return final_path
@@ -0,0 +1,190 @@
+# 18.10.26
+
+import os
+import json
+import zlib
+import hashlib
+import logging
+from urllib.parse import urlparse
+from typing import Dict, List, Optional, Tuple
+
+
+# Variable
+JOURNAL_NAME = "journal.jsonl"
+
+
+class SegmentJournal:
+    def __init__(self, tmp_folder: str):
+        """
+        Append-only record of the segments already written to the temporary ts file of a stream.
+
+        Each line is a JSON object: a header with the playlist signature, one entry per written
+        segment (index, byte offset, length, crc32) and a final marker once every segment was
+        attempted, listing the ones that failed for good.
+
+        Parameters:
+            - tmp_folder (str): The temporary folder of the stream.
+        """
+        self.path = os.path.join(tmp_folder, JOURNAL_NAME)
+        self.file = None
+
+    @staticmethod
+    def get_signature(segments: List[str]) -> str:
+        """
+        Identify a playlist by its segment paths, ignoring query strings that carry expiring tokens.
+        """
+        paths = "\n".join(urlparse(segment).path for segment in segments)
+        return hashlib.sha1(f"{len(segments)}\n{paths}".encode()).hexdigest()
+
+    @staticmethod
+    def is_download_complete(data_path: str) -> bool:
+        """
+        Check if a temporary ts file holds a finished stream, failed segments included.
+        Files without a journal were never started and are downloaded again.
+
+        Parameters:
+            - data_path (str): Path of the temporary ts file.
+        """
+        if not os.path.exists(data_path):
+            return False
+
+        journal_path = os.path.join(os.path.dirname(data_path), JOURNAL_NAME)
+        if not os.path.exists(journal_path):
+            return False
+
+        return SegmentJournal._read(journal_path)[2] is not None
+
+    @staticmethod
+    def get_failed_segments(data_path: str) -> List[int]:
+        """
+        Get the segments given up on by a finished stream.
+
+        Parameters:
+            - data_path (str): Path of the temporary ts file.
+        """
+        journal_path = os.path.join(os.path.dirname(data_path), JOURNAL_NAME)
+        if not os.path.exists(journal_path):
+            return []
+
+        complete = SegmentJournal._read(journal_path)[2]
+        return complete.get('failed', []) if complete is not None else []
+
+    @staticmethod
+    def _read(journal_path: str) -> Tuple[Dict, Dict[int, Dict], Optional[Dict]]:
+        """Parse the journal, skipping a torn last line."""
+        header, entries, complete = {}, {}, None
+
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+                if 'signature' in record:
+                    header = record
+                elif record.get('complete'):
+                    complete = record
+                elif 'index' in record:
+                    entries[record['index']] = record
+
+        return header, entries, complete
+
+    def load(self, segments: List[str], data_path: str) -> Tuple[int, int]:
+        """
+        Find where a previous run of the same playlist stopped.
+
+        Only the contiguous run of segments starting at 0 is reused, the last one is verified
+        against its checksum and anything after it is downloaded again.
+
+        Parameters:
+            - segments (List[str]): Segment URLs of the playlist.
+            - data_path (str): Path of the temporary ts file.
+
+        Returns:
+            Tuple[int, int]: Index of the first segment to download and byte offset to resume writing at.
+        """
+        if not os.path.exists(self.path) or not os.path.exists(data_path):
+            return 0, 0
+
+        try:
+            header, entries, _ = self._read(self.path)
+        except OSError as e:
+            logging.error(f"Cannot read segment journal {self.path}: {e}")
+            return 0, 0
+
+        if header.get('signature') != self.get_signature(segments):
+            logging.info(f"Segment journal {self.path} belongs to a different playlist, starting over")
+            return 0, 0
+
+        file_size = os.path.getsize(data_path)
+        index, offset = 0, 0
+
+        while index in entries:
+            entry = entries[index]
+            if entry['offset'] != offset or entry['offset'] + entry['length'] > file_size:
+                break
+
+            offset += entry['length']
+            index += 1
+
+        # Verify the last segment, a crash may have left it partially written
+        if index > 0:
+            last = entries[index - 1]
+            with open(data_path, 'rb') as f:
+                f.seek(last['offset'])
+                if zlib.crc32(f.read(last['length'])) != last['crc']:
+                    logging.warning(f"Checksum mismatch for segment {index - 1}, downloading it again")
+                    index, offset = index - 1, last['offset']
+
+        return index, offset
+
+    def open(self, segments: List[str], resume_index: int) -> None:
+        """
+        Start journaling, keeping only the entries below `resume_index`.
+
+        Parameters:
+            - segments (List[str]): Segment URLs of the playlist.
+            - resume_index (int): Index of the first segment to download.
+        """
+        kept = []
+        if resume_index > 0:
+            _, entries, _ = self._read(self.path)
+            kept = [entries[i] for i in range(resume_index)]
+
+        # Rewrite the journal so it matches the truncated ts file
+        self.file = open(self.path, 'w')
+        self._append({'signature': self.get_signature(segments), 'total': len(segments)})
+        for entry in kept:
+            self._append(entry)
+
+    def record(self, index: int, offset: int, content: bytes) -> None:
+        """
+        Record a segment written to the ts file.
+
+        Parameters:
+            - index (int): Index of the segment.
+            - offset (int): Byte offset of the segment in the ts file.
+            - content (bytes): Content written.
+        """
+        if self.file is not None:
+            self._append({'index': index, 'offset': offset, 'length': len(content), 'crc': zlib.crc32(content)})
+
+    def mark_complete(self, failed: List[int]) -> None:
+        """
+        Flag the stream as finished, so the track is not downloaded again on the next run.
+
+        Parameters:
+            - failed (List[int]): Indexes of the segments that failed every retry.
+        """
+        if self.file is not None:
+            self._append({'complete': True, 'failed': failed})
+
+    def close(self) -> None:
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def _append(self, record: Dict) -> None:
+        self.file.write(json.dumps(record) + "\n")
+        self.file.flush()
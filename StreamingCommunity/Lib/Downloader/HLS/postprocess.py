@@ -0,0 +1,102 @@
+# 18.10.26
+
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+POSTPROCESS_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'postprocess_workers')
+POSTPROCESS_QUEUE = config_manager.get_int('M3U8_DOWNLOAD', 'postprocess_queue')
+
+
+# Variable
+current_stage = contextvars.ContextVar('post_process_stage', default=None)
+
+
+class PostProcessStage:
+    def __init__(self, workers: int = POSTPROCESS_WORKERS, queue_size: int = POSTPROCESS_QUEUE):
+        """
+        Pool running merge, move and cleanup of the downloaded titles while the next ones download.
+
+        Parameters:
+            - workers (int): Titles post-processed at the same time.
+            - queue_size (int): Titles waiting for a worker before a finished download has to wait too.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='postprocess')
+        self.slots = threading.BoundedSemaphore(workers + max(queue_size, 0))
+        self.futures: List[Future] = []
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def submit(self, task: Callable[[], None], result: Optional[Dict[str, Any]] = None) -> Future:
+        """
+        Queue a task, blocking while the queue is full so downloads do not run too far ahead of the merges.
+
+        Parameters:
+            - task (Callable): Work to run on the stage.
+            - result (Dict, optional): Response of the title, filled in by the task and returned by `wait`
+              under the output path it has when submitted.
+        """
+        self.slots.acquire()
+
+        try:
+            future = self.executor.submit(contextvars.copy_context().run, task)
+        except Exception:
+            self.slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append(future)
+        if result is not None:
+            self.results[result['path']] = result
+        return future
+
+    def wait(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait for every queued task and stop the workers.
+
+        Returns:
+            Dict[str, Dict]: Final response of every title handed to the stage, keyed by output path.
+        """
+        for future in self.futures:
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Post-processing failed: {e}")
+
+        self.executor.shutdown(wait=True)
+        return self.results
+
+
+def get_post_process_stage() -> Optional[PostProcessStage]:
+    """Return the stage opened by the caller with `post_process_stage`, None if titles are post-processed inline."""
+    return current_stage.get()
+
+
+@contextmanager
+def post_process_stage(workers: int = POSTPROCESS_WORKERS, queue_size: int = POSTPROCESS_QUEUE) -> Iterator[Optional[PostProcessStage]]:
+    """
+    Let the HLS downloads started inside the block hand their post-processing to a shared stage,
+    and wait for it when the block ends. Yields the stage, or None with 0 workers or inside another stage,
+    whose owner collects the results.
+    """
+    if workers <= 0 or current_stage.get() is not None:
+        yield None
+        return
+
+    stage = PostProcessStage(workers, queue_size)
+    token = current_stage.set(stage)
+
+    try:
+        yield stage
+
+    finally:
+        current_stage.reset(token)
+        stage.wait()
@@ -4,14 +4,17 @@ import os
 import sys
 import time
 import queue
+import shutil
 import signal
+import asyncio
 import logging
+import weakref
 import binascii
 import threading
 from queue import PriorityQueue
 from urllib.parse import urljoin, urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict
+from typing import Dict, List
 
 
 # External libraries
@@ -24,6 +27,7 @@ from rich.console import Console
 from StreamingCommunity.Util.color import Colors
 from StreamingCommunity.Util.headers import get_userAgent
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get, http2_available
 
 
 # Logic class
@@ -33,6 +37,11 @@ from ...M3U8 import (
     M3U8_Parser,
     M3U8_UrlFix
 )
+from ...FFmpeg import SegmentPipe
+from .journal import SegmentJournal
+from .controller import WorkerController, get_global_controller
+from ..bandwidth import bandwidth_limiter
+from ..progress import get_bar_position
 
 # Config
 TQDM_DELAY_WORKER = config_manager.get_float('M3U8_DOWNLOAD', 'tqdm_delay')
@@ -42,15 +51,33 @@ DEFAULT_VIDEO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_video_w
 DEFAULT_AUDIO_WORKERS = config_manager.get_int('M3U8_DOWNLOAD', 'default_audio_workser')
 MAX_TIMEOOUT = config_manager.get_int("REQUESTS", "timeout")
 SEGMENT_MAX_TIMEOUT = config_manager.get_int("M3U8_DOWNLOAD", "segment_timeout")
+SEGMENT_KEEPALIVE_EXPIRY = config_manager.get_float("M3U8_DOWNLOAD", "segment_keepalive_expiry")
+SEGMENT_HTTP2 = config_manager.get_bool("M3U8_DOWNLOAD", "segment_http2")
+BUFFER_MAX_SEGMENTS = config_manager.get_int("M3U8_DOWNLOAD", "buffer_max_segments")
+BUFFER_MAX_MB = config_manager.get_int("M3U8_DOWNLOAD", "buffer_max_mb")
+BUFFER_SPILL_TO_DISK = config_manager.get_bool("M3U8_DOWNLOAD", "buffer_spill_to_disk")
+ADAPTIVE_WORKERS = config_manager.get_bool("M3U8_DOWNLOAD", "adaptive_workers")
+ADAPTIVE_MAX_WORKERS = config_manager.get_int("M3U8_DOWNLOAD", "adaptive_max_workers")
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
 MAX_INTERRUPT_COUNT = 3
 
 # Variable
 console = Console()
+running_downloads = weakref.WeakSet()
+
+
+def interrupt_running_downloads() -> None:
+    """Deliver Ctrl+C to every segment download running off the main thread."""
+    for downloader in list(running_downloads):
+        downloader.handle_interrupt()
+
+        # Threads waiting for a slot of the controller would not see the stop flag until a slot frees up
+        if downloader.controller is not None:
+            downloader.controller.wake_all()
 
 
 class M3U8_Segments:
-    def __init__(self, url: str, tmp_folder: str, is_index_url: bool = True):
+    def __init__(self, url: str, tmp_folder: str, is_index_url: bool = True, mux_path: str = None):
         """
         Initializes the M3U8_Segments object.
 
@@ -58,26 +85,40 @@ class M3U8_Segments:
             - url (str): The URL of the M3U8 playlist.
             - tmp_folder (str): The temporary folder to store downloaded segments.
             - is_index_url (bool): Flag indicating if `m3u8_index` is a URL (default True).
+            - mux_path (str): If set, segments are piped into FFmpeg and remuxed to this file instead of being written to a ts file.
         """
         self.url = url
         self.tmp_folder = tmp_folder
         self.is_index_url = is_index_url
         self.expected_real_time = None
         self.tmp_file_path = os.path.join(self.tmp_folder, "0.ts")
+        self.spill_folder = os.path.join(self.tmp_folder, "spill")
         os.makedirs(self.tmp_folder, exist_ok=True)
 
         # Util class
         self.decryption: M3U8_Decryption = None 
         self.class_ts_estimator = M3U8_Ts_Estimator(0, self) 
         self.class_url_fixer = M3U8_UrlFix(url)
+        self.journal = SegmentJournal(tmp_folder)
+        self.mux_path = mux_path
+        self.pipe: SegmentPipe = None
+        self.pipe_failed = False
 
         # Sync
         self.queue = PriorityQueue()
         self.buffer = {}
         self.expected_index = 0 
+        self.resume_offset = 0
+
+        # Reorder window: segments held in memory until the writer reaches them
+        self.buffer_cond = threading.Condition()
+        self.buffered_bytes = 0
+        self.buffer_max_bytes = BUFFER_MAX_MB * 1024 * 1024
 
         self.stop_event = threading.Event()
         self.downloaded_segments = set()
+        self.client: httpx.Client = None
+        self.controller: WorkerController = None
         self.base_timeout = 0.5
         self.current_timeout = 3.0
 
@@ -92,6 +133,7 @@ class M3U8_Segments:
         self.info_maxRetry = 0
         self.info_nRetry = 0
         self.info_nFailed = 0
+        self.failed_segments: List[int] = []
         self.active_retries = 0 
         self.active_retries_lock = threading.Lock()
 
@@ -111,7 +153,7 @@ class M3U8_Segments:
         
         try:
             client_params = {'headers': {'User-Agent': get_userAgent()}, 'timeout': MAX_TIMEOOUT, 'verify': REQUEST_VERIFY}
-            response = httpx.get(url=key_uri, **client_params)
+            response = http_get(url=key_uri, **client_params)
             response.raise_for_status()
 
             hex_content = binascii.hexlify(response.content).decode('utf-8')
@@ -159,7 +201,7 @@ class M3U8_Segments:
         if self.is_index_url:
             try:
                 client_params = {'headers': {'User-Agent': get_userAgent()}, 'timeout': MAX_TIMEOOUT, 'verify': REQUEST_VERIFY}
-                response = httpx.get(self.url, **client_params, follow_redirects=True)
+                response = http_get(self.url, **client_params, follow_redirects=True)
                 response.raise_for_status()
                 
                 self.parse_data(response.text)
@@ -169,44 +211,115 @@ class M3U8_Segments:
             except Exception as e:
                 raise RuntimeError(f"M3U8 info retrieval failed: {e}")
     
-    def setup_interrupt_handler(self):
+    def handle_interrupt(self, signum=None, frame=None):
         """
-        Set up a signal handler for graceful interruption.
+        Count a Ctrl+C and stop the download gracefully, or immediately after MAX_INTERRUPT_COUNT presses.
         """
-        def interrupt_handler(signum, frame):
-            with self.interrupt_lock:
-                self.interrupt_count += 1
-                if self.interrupt_count >= MAX_INTERRUPT_COUNT:
-                    self.force_stop = True
-                    
-            if self.force_stop:
-                console.print("\n[red]Force stop triggered! Exiting immediately.")
+        with self.interrupt_lock:
+            self.interrupt_count += 1
+            if self.interrupt_count >= MAX_INTERRUPT_COUNT:
+                self.force_stop = True
+                
+        if self.force_stop:
+            console.print("\n[red]Force stop triggered! Exiting immediately.")
 
-            else:
-                if not self.interrupt_flag.is_set():
-                    remaining = MAX_INTERRUPT_COUNT - self.interrupt_count
-                    console.print(f"\n[red]- Stopping gracefully... (Ctrl+C {remaining}x to force)")
-                    self.download_interrupted = True
+        else:
+            if not self.interrupt_flag.is_set():
+                remaining = MAX_INTERRUPT_COUNT - self.interrupt_count
+                console.print(f"\n[red]- Stopping gracefully... (Ctrl+C {remaining}x to force)")
+                self.download_interrupted = True
 
-                    if remaining == 1:
-                        self.interrupt_flag.set()
+                if remaining == 1:
+                    self.interrupt_flag.set()
 
-                    
+    def setup_interrupt_handler(self):
+        """
+        Set up a signal handler for graceful interruption.
+        """
         if threading.current_thread() is threading.main_thread():
-            signal.signal(signal.SIGINT, interrupt_handler)
+            signal.signal(signal.SIGINT, self.handle_interrupt)
         else:
             print("Signal handler must be set in the main thread")
 
-    def _get_http_client(self):
-        client_params = {
+    def _get_client_params(self, max_workers: int) -> Dict:
+        """
+        Build the connection pool parameters shared by all segment workers and retries.
+
+        Parameters:
+            - max_workers (int): Number of parallel workers, used to size the pool.
+        """
+        limits = httpx.Limits(
+            max_connections=max_workers,
+            max_keepalive_connections=max_workers,
+            keepalive_expiry=SEGMENT_KEEPALIVE_EXPIRY
+        )
+        return {
             'headers': {'User-Agent': get_userAgent()},
             'timeout': SEGMENT_MAX_TIMEOUT,
             'follow_redirects': True,
-            'http2': False,
-            'verify': REQUEST_VERIFY
+            'http2': SEGMENT_HTTP2 and http2_available(),
+            'verify': REQUEST_VERIFY,
+            'limits': limits
         }
-        return httpx.Client(**client_params)
-                            
+
+    def _get_http_client(self, max_workers: int) -> httpx.Client:
+        """Create the pooled client used by the thread engine."""
+        return httpx.Client(**self._get_client_params(max_workers))
+
+    def _get_async_http_client(self, max_workers: int) -> httpx.AsyncClient:
+        """Create the pooled client used by the asyncio engine."""
+        return httpx.AsyncClient(**self._get_client_params(max_workers))
+
+    def _store_segment(self, index: int, segment_content: bytes, progress_bar: tqdm) -> bool:
+        """
+        Decrypts a downloaded segment if needed and hands it to the writer queue.
+
+        Returns:
+            bool: False if decryption failed and the download has been interrupted.
+        """
+        content_size = len(segment_content)
+
+        # Decrypt if needed and verify decrypted content
+        if self.decryption is not None:
+            try:
+                segment_content = self.decryption.decrypt(segment_content)
+                
+            except Exception as e:
+                logging.error(f"Decryption failed for segment {index}: {str(e)}")
+                self.interrupt_flag.set()   # Interrupt the download process
+                self.stop_event.set()       # Trigger the stopping event for all threads
+                return False
+
+        self.class_ts_estimator.update_progress_bar(content_size, progress_bar)
+        with self.buffer_cond:
+            self.buffered_bytes += len(segment_content)
+        self.queue.put((index, segment_content))
+        self.downloaded_segments.add(index)  
+        progress_bar.update(1)
+        return True
+
+    def _register_failed_attempt(self, ts_url: str, index: int, attempt: int, error: Exception, progress_bar: tqdm) -> bool:
+        """
+        Updates retry statistics after a failed attempt.
+
+        Returns:
+            bool: True if this was the last allowed attempt and the segment is marked as failed.
+        """
+        logging.info(f"Attempt {attempt + 1} failed for segment {index} - '{ts_url}': {error}")
+        
+        if attempt > self.info_maxRetry:
+            self.info_maxRetry = ( attempt + 1 )
+        self.info_nRetry += 1
+
+        if attempt + 1 == REQUEST_MAX_RETRY:
+            console.log(f"[red]Final retry failed for segment: {index}")
+            self.queue.put((index, None))  # Marker for failed segment
+            progress_bar.update(1)
+            self.info_nFailed += 1
+            return True
+        
+        return False
+
     def download_segment(self, ts_url: str, index: int, progress_bar: tqdm, backoff_factor: float = 1.1) -> None:
         """
         Downloads a TS segment and adds it to the segment queue with retry logic.
@@ -221,44 +334,17 @@ class M3U8_Segments:
             if self.interrupt_flag.is_set():
                 return
             
+            if not self.controller.acquire(self.interrupt_flag):
+                return
+            start_time = time.monotonic()
+
             try:
-                with self._get_http_client() as client:
-                    response = client.get(ts_url)
-        
-                    # Validate response and content
-                    response.raise_for_status()
-                    segment_content = response.content
-                    content_size = len(segment_content)
-
-                    # Decrypt if needed and verify decrypted content
-                    if self.decryption is not None:
-                        try:
-                            segment_content = self.decryption.decrypt(segment_content)
-                            
-                        except Exception as e:
-                            logging.error(f"Decryption failed for segment {index}: {str(e)}")
-                            self.interrupt_flag.set()   # Interrupt the download process
-                            self.stop_event.set()       # Trigger the stopping event for all threads
-                            break                       # Stop the current task immediately
-
-                    self.class_ts_estimator.update_progress_bar(content_size, progress_bar)
-                    self.queue.put((index, segment_content))
-                    self.downloaded_segments.add(index)  
-                    progress_bar.update(1)
-                    return
+                response = self.client.get(ts_url)
+                response.raise_for_status()
 
             except Exception as e:
-                logging.info(f"Attempt {attempt + 1} failed for segment {index} - '{ts_url}': {e}")
-                
-                if attempt > self.info_maxRetry:
-                    self.info_maxRetry = ( attempt + 1 )
-                self.info_nRetry += 1
-
-                if attempt + 1 == REQUEST_MAX_RETRY:
-                    console.log(f"[red]Final retry failed for segment: {index}")
-                    self.queue.put((index, None))  # Marker for failed segment
-                    progress_bar.update(1)
-                    self.info_nFailed += 1
+                self.controller.release(time.monotonic() - start_time, 0, True)
+                if self._register_failed_attempt(ts_url, index, attempt, e, progress_bar):
                     return
                 
                 with self.active_retries_lock:
@@ -271,63 +357,222 @@ class M3U8_Segments:
                 with self.active_retries_lock:
                     self.active_retries -= 1
 
+            else:
+
+                # The slot is released once, as soon as the request is over: throttling, decryption
+                # and storage are not network attempts and never go through the retry path
+                self.controller.release(time.monotonic() - start_time, len(response.content), False)
+                bandwidth_limiter.consume(len(response.content))
+                self._store_segment(index, response.content, progress_bar)
+                return
+
+    async def download_segment_async(self, client: httpx.AsyncClient, ts_url: str, index: int, progress_bar: tqdm, backoff_factor: float = 1.1) -> None:
+        """
+        Asyncio counterpart of `download_segment`, bounded by the shared worker controller.
+
+        Parameters:
+            - client (httpx.AsyncClient): Pooled client shared by all tasks.
+            - ts_url (str): The URL of the TS segment.
+            - index (int): The index of the segment.
+            - progress_bar (tqdm): Progress counter for tracking download progress.
+            - backoff_factor (float): The backoff factor for exponential backoff.
+        """
+        for attempt in range(REQUEST_MAX_RETRY):
+            if self.interrupt_flag.is_set():
+                return
+
+            if not await self.controller.acquire_async(self.interrupt_flag):
+                return
+            start_time = time.monotonic()
+
+            try:
+                response = await client.get(ts_url)
+                response.raise_for_status()
+
+            except Exception as e:
+                self.controller.release(time.monotonic() - start_time, 0, True)
+                if self._register_failed_attempt(ts_url, index, attempt, e, progress_bar):
+                    return
+
+                with self.active_retries_lock:
+                    self.active_retries += 1
+
+                sleep_time = backoff_factor * (2 ** attempt)
+                logging.info(f"Retrying segment {index} in {sleep_time} seconds...")
+                await asyncio.sleep(sleep_time)
+
+                with self.active_retries_lock:
+                    self.active_retries -= 1
+
+            else:
+
+                # The slot is released once, as soon as the request is over: throttling, decryption
+                # and storage are not network attempts and never go through the retry path
+                self.controller.release(time.monotonic() - start_time, len(response.content), False)
+                await bandwidth_limiter.consume_async(len(response.content))
+                self._store_segment(index, response.content, progress_bar)
+                return
+
     def write_segments_to_file(self):
         """
         Writes segments to file with additional verification.
         """
-        with open(self.tmp_file_path, 'wb') as f:
-            while not self.stop_event.is_set() or not self.queue.empty():
-                if self.interrupt_flag.is_set():
-                    break
-                
-                try:
-                    index, segment_content = self.queue.get(timeout=self.current_timeout)
+        if self.pipe is not None:
+            self._write_ordered_segments(None)
+            return
 
-                    # Successful queue retrieval: reduce timeout
-                    self.current_timeout = max(self.base_timeout, self.current_timeout / 2)
+        with open(self.tmp_file_path, 'r+b' if self.resume_offset else 'wb') as f:
 
-                    # Handle failed segments
-                    if segment_content is None:
-                        if index == self.expected_index:
-                            self.expected_index += 1
-                        continue
+            # Drop any bytes written after the last journaled segment
+            f.truncate(self.resume_offset)
+            f.seek(self.resume_offset)
+            self._write_ordered_segments(f)
 
-                    # Write segment if it's the next expected one
-                    if index == self.expected_index:
-                        f.write(segment_content)
-                        f.flush()
-                        self.expected_index += 1
+    def _write_ordered_segments(self, f) -> None:
+        """
+        Take segments from the queue and write them in playlist order.
+        """
+        while not self.stop_event.is_set() or not self.queue.empty():
+            if self.interrupt_flag.is_set():
+                break
+            
+            try:
+                index, segment_content = self.queue.get(timeout=self.current_timeout)
 
-                        # Write any buffered segments that are now in order
-                        while self.expected_index in self.buffer:
-                            next_segment = self.buffer.pop(self.expected_index)
+                # Successful queue retrieval: reduce timeout
+                self.current_timeout = max(self.base_timeout, self.current_timeout / 2)
 
-                            if next_segment is not None:
-                                f.write(next_segment)
-                                f.flush()
+                # Failed segments are buffered as None and skipped once in order
+                self._buffer_segment(index, segment_content)
 
-                            self.expected_index += 1
-                    
+                # Write every buffered segment that is now in order
+                while self.expected_index in self.buffer:
+                    next_segment = self._pop_buffered_segment(self.expected_index)
+
+                    if next_segment is not None:
+                        self._write_segment(f, self.expected_index, next_segment)
                     else:
-                        self.buffer[index] = segment_content
+                        self.failed_segments.append(self.expected_index)
 
-                except queue.Empty:
-                    self.current_timeout = min(MAX_TIMEOOUT, self.current_timeout * 1.1)
-                    time.sleep(0.05)
+                    with self.buffer_cond:
+                        self.expected_index += 1
+                        self.buffer_cond.notify_all()
 
-                    if self.stop_event.is_set():
-                        break
+            except queue.Empty:
+                self.current_timeout = min(MAX_TIMEOOUT, self.current_timeout * 1.1)
+                time.sleep(0.05)
 
-                except Exception as e:
-                    logging.error(f"Error writing segment {index}: {str(e)}")
+                if self.stop_event.is_set():
+                    break
+
+            except Exception as e:
+                logging.error(f"Error writing segment {index}: {str(e)}")
+
+    def _buffer_segment(self, index: int, segment_content: bytes) -> None:
+        """
+        Keep a segment until the writer reaches it, spilling stragglers to disk when the window is full.
+        """
+        if segment_content is not None and index != self.expected_index and BUFFER_SPILL_TO_DISK and self.buffered_bytes > self.buffer_max_bytes:
+            os.makedirs(self.spill_folder, exist_ok=True)
+            spill_path = os.path.join(self.spill_folder, f"{index}.ts")
+
+            with open(spill_path, 'wb') as spill_file:
+                spill_file.write(segment_content)
+
+            with self.buffer_cond:
+                self.buffered_bytes -= len(segment_content)
+                self.buffer_cond.notify_all()
+
+            self.buffer[index] = spill_path
+
+        else:
+            self.buffer[index] = segment_content
+
+    def _pop_buffered_segment(self, index: int) -> bytes:
+        """
+        Remove a segment from the reorder buffer, reading it back from disk if it was spilled.
+        """
+        segment = self.buffer.pop(index)
+
+        if isinstance(segment, str):
+            with open(segment, 'rb') as spill_file:
+                content = spill_file.read()
+            os.remove(segment)
+            return content
+
+        if segment is not None:
+            with self.buffer_cond:
+                self.buffered_bytes -= len(segment)
+                self.buffer_cond.notify_all()
+
+        return segment
+
+    def _is_buffer_full(self, index: int) -> bool:
+        """
+        Check if segment `index` must wait before being requested.
+        The segment the writer is waiting for is never held back.
+        """
+        if index <= self.expected_index:
+            return False
+
+        if index - self.expected_index >= BUFFER_MAX_SEGMENTS:
+            return True
+
+        return not BUFFER_SPILL_TO_DISK and self.buffered_bytes >= self.buffer_max_bytes
+
+    def _wait_for_buffer_space(self, index: int) -> None:
+        """
+        Block the thread engine submission until the reorder window has room for `index`.
+        """
+        with self.buffer_cond:
+            while self._is_buffer_full(index) and not self.interrupt_flag.is_set():
+                self.buffer_cond.wait(timeout=0.5)
+
+    async def _wait_for_buffer_space_async(self, index: int) -> None:
+        """
+        Asyncio counterpart of `_wait_for_buffer_space`.
+        """
+        while self._is_buffer_full(index) and not self.interrupt_flag.is_set():
+            await asyncio.sleep(0.05)
+
+    def _write_segment(self, f, index: int, segment_content: bytes) -> None:
+        """
+        Append a segment to the ts file and record it in the journal, or feed it to the FFmpeg pipe.
+        """
+        if self.pipe is not None:
+            if not self.pipe.write(segment_content):
+                self.pipe_failed = True
+                self.interrupt_flag.set()
+                self.stop_event.set()
+            return
+
+        offset = f.tell()
+        f.write(segment_content)
+        f.flush()
+        self.journal.record(index, offset, segment_content)
+
+    def _resume_from_journal(self) -> None:
+        """
+        Skip the segments already written by a previous run of the same playlist.
+        """
+        resume_index, self.resume_offset = self.journal.load(self.segments, self.tmp_file_path)
+        self.journal.open(self.segments, resume_index)
+
+        if resume_index > 0:
+            self.downloaded_segments.update(range(resume_index))
+            self.expected_index = resume_index
+            console.print(f"[cyan]Resuming download from segment [green]{resume_index}[cyan]/[green]{len(self.segments)}")
     
-    def download_streams(self, description: str, type: str):
+    def download_streams(self, description: str, type: str, use_async: bool = False, controller: WorkerController = None, position: int = None):
         """
         Downloads all TS segments in parallel and writes them to a file.
 
         Parameters:
             - description: Description to insert on tqdm bar
             - type (str): Type of download: 'video' or 'audio'
+            - use_async (bool): Use the asyncio engine instead of the thread pool
+            - controller (WorkerController): Worker budget shared with other tracks, if downloaded concurrently
+            - position (int): Line of the progress bar when several tracks are displayed together
         """
         if TELEGRAM_BOT:
 
@@ -335,15 +580,29 @@ class M3U8_Segments:
           console.log("####")
           
         self.get_info()
-        self.setup_interrupt_handler()
+
+        # A remuxed output cannot be resumed, the journal is only used for ts files
+        if self.mux_path is not None:
+            self.pipe = SegmentPipe(self.mux_path)
+            self.pipe.start()
+        else:
+            self._resume_from_journal()
+
+        # Concurrent tracks run off the main thread, their owner forwards Ctrl+C to `handle_interrupt`
+        if threading.current_thread() is threading.main_thread():
+            self.setup_interrupt_handler()
+        else:
+            running_downloads.add(self)
 
         progress_bar = tqdm(
             total=len(self.segments), 
+            initial=len(self.downloaded_segments),
             unit='s',
             ascii='░▒█',
             bar_format=self._get_bar_format(description),
             mininterval=0.6,
             maxinterval=1.0,
+            position=get_bar_position(position),
             file=sys.stdout,        # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.
         )
 
@@ -353,56 +612,108 @@ class M3U8_Segments:
             writer_thread.start()
 
             # Configure workers and delay
-            max_workers = self._get_worker_count(type)
-            
-            # Download segments with completion verification
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                futures = []
-                for index, segment_url in enumerate(self.segments):
+            self.controller = controller or get_global_controller() or self._get_worker_controller(type)
 
-                    # Check for interrupt before submitting each task
-                    if self.interrupt_flag.is_set():
-                        break
+            if use_async:
+                asyncio.run(self._download_with_asyncio(progress_bar, self.controller.max_workers))
+            else:
+                self._download_with_threads(progress_bar, self.controller.max_workers)
+
+        finally:
+            running_downloads.discard(self)
+            self._cleanup_resources(writer_thread, progress_bar)
+
+        if self.pipe_failed:
+            raise RuntimeError(f"FFmpeg stream mux failed for {self.mux_path}")
+
+        if not self.interrupt_flag.is_set():
+            self._verify_download_completion()
+
+        return self._generate_results(type)
 
-                    time.sleep(TQDM_DELAY_WORKER)
-                    futures.append(executor.submit(self.download_segment, segment_url, index, progress_bar))
+    def _get_missing_segments(self) -> list:
+        """Return the sorted indexes of segments not downloaded yet."""
+        missing_segments = sorted(set(range(len(self.segments))) - self.downloaded_segments)
+        if missing_segments:
+            logging.warning(f"Missing segments: {missing_segments}")
+        return missing_segments
 
-                # Wait for futures with interrupt handling
-                for future in as_completed(futures):
+    def _download_with_threads(self, progress_bar: tqdm, max_workers: int) -> None:
+        """
+        Download all segments with a thread pool sharing a single pooled client.
+        """
+        self.client = self._get_http_client(max_workers)
+        
+        # Download segments with completion verification
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for index, segment_url in enumerate(self.segments):
+
+                # Check for interrupt before submitting each task
+                if self.interrupt_flag.is_set():
+                    break
+
+                if index in self.downloaded_segments:
+                    continue
+
+                time.sleep(TQDM_DELAY_WORKER)
+                self._wait_for_buffer_space(index)
+                futures.append(executor.submit(self.download_segment, segment_url, index, progress_bar))
+
+            # Wait for futures with interrupt handling
+            for future in as_completed(futures):
+                if self.interrupt_flag.is_set():
+                    break
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"Error in download thread: {str(e)}")
+
+            # Interrupt handling for missing segments
+            if not self.interrupt_flag.is_set():
+                
+                # Retry missing segments with interrupt check
+                for index in self._get_missing_segments():
                     if self.interrupt_flag.is_set():
                         break
+
                     try:
-                        future.result()
+                        self.download_segment(self.segments[index], index, progress_bar)
+                        
                     except Exception as e:
-                        logging.error(f"Error in download thread: {str(e)}")
+                        logging.error(f"Failed to retry segment {index}: {str(e)}")
 
-                # Interrupt handling for missing segments
-                if not self.interrupt_flag.is_set():
-                    total_segments = len(self.segments)
-                    completed_segments = len(self.downloaded_segments)
-                    
-                    if completed_segments < total_segments:
-                        missing_segments = set(range(total_segments)) - self.downloaded_segments
-                        logging.warning(f"Missing segments: {sorted(missing_segments)}")
-                        
-                        # Retry missing segments with interrupt check
-                        for index in missing_segments:
-                            if self.interrupt_flag.is_set():
-                                break
+    async def _download_with_asyncio(self, progress_bar: tqdm, max_workers: int) -> None:
+        """
+        Download all segments on a single event loop, with the worker controller limiting requests in flight.
+        """
+        async with self._get_async_http_client(max_workers) as client:
+            tasks = []
+            for index, segment_url in enumerate(self.segments):
+                if self.interrupt_flag.is_set():
+                    break
 
-                            try:
-                                self.download_segment(self.segments[index], index, progress_bar)
-                                
-                            except Exception as e:
-                                logging.error(f"Failed to retry segment {index}: {str(e)}")
+                if index in self.downloaded_segments:
+                    continue
 
-        finally:
-            self._cleanup_resources(writer_thread, progress_bar)
+                await self._wait_for_buffer_space_async(index)
+                tasks.append(asyncio.create_task(self.download_segment_async(client, segment_url, index, progress_bar)))
 
-        if not self.interrupt_flag.is_set():
-            self._verify_download_completion()
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logging.error(f"Error in download task: {str(result)}")
 
-        return self._generate_results(type)
+            # Interrupt handling for missing segments
+            if not self.interrupt_flag.is_set():
+                for index in self._get_missing_segments():
+                    if self.interrupt_flag.is_set():
+                        break
+
+                    try:
+                        await self.download_segment_async(client, self.segments[index], index, progress_bar)
+
+                    except Exception as e:
+                        logging.error(f"Failed to retry segment {index}: {str(e)}")
     
     def _get_bar_format(self, description: str) -> str:
         """
@@ -425,6 +736,18 @@ class M3U8_Segments:
         }.get(stream_type.lower(), 1)
 
         return base_workers
+
+    def _get_worker_controller(self, stream_type: str) -> WorkerController:
+        """
+        Create the controller limiting concurrent segment requests.
+        With `adaptive_workers` the configured worker count is only the starting point.
+        """
+        base_workers = self._get_worker_count(stream_type)
+
+        if ADAPTIVE_WORKERS:
+            return WorkerController(base_workers, max(base_workers, ADAPTIVE_MAX_WORKERS), adaptive=True)
+
+        return WorkerController(base_workers, base_workers)
     
     def _generate_results(self, stream_type: str) -> Dict:
         """Package final download results."""
@@ -446,6 +769,28 @@ class M3U8_Segments:
         self.stop_event.set()
         writer_thread.join(timeout=30)
         progress_bar.close()
+
+        if self.pipe is not None:
+
+            # Closing stdin while the writer still feeds it would finalize a truncated file
+            if writer_thread.is_alive():
+                logging.error("Segment writer did not stop, terminating FFmpeg stream mux")
+                self.interrupt_flag.set()
+                self.pipe.terminate()
+                self.pipe_failed = True
+
+            elif not self.pipe.close():
+                self.pipe_failed = True
+            self.pipe = None
+
+        # Every segment was written or given up on: record it so the track is not downloaded again
+        if not self.download_interrupted and self.expected_index == len(self.segments):
+            self.journal.mark_complete(self.failed_segments)
+        self.journal.close()
+
+        if self.client is not None:
+            self.client.close()
+            self.client = None
         
         #if self.download_interrupted:
         #    console.print("\n[red]Download terminated by user")
@@ -454,14 +799,21 @@ class M3U8_Segments:
             self._display_error_summary()
 
         self.buffer = {}
+        self.buffered_bytes = 0
         self.expected_index = 0
 
+        if os.path.isdir(self.spill_folder):
+            shutil.rmtree(self.spill_folder, ignore_errors=True)
+
     def _display_error_summary(self) -> None:
         """Generate final error report."""
         console.print(f"\n[cyan]Retry Summary: "
                      f"[white]Max retries: [green]{self.info_maxRetry} "
                      f"[white]Total retries: [green]{self.info_nRetry} "
                      f"[white]Failed segments: [red]{self.info_nFailed}")
-        
-        if self.info_nRetry > len(self.segments) * 0.3:
+
+        if self.controller is not None and self.controller.adaptive:
+            console.print(f"[cyan]Adaptive workers: [white]Final limit: [green]{self.controller.limit}")
+
+        elif self.info_nRetry > len(self.segments) * 0.3:
             console.print("[yellow]Warning: High retry count detected. Consider reducing worker count in config.")
@@ -6,7 +6,10 @@ import sys
 import time
 import signal
 import logging
+import threading
 from functools import partial
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple
 
 
 # External libraries
@@ -27,6 +30,10 @@ from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance
 
 # Logic class
 from ...FFmpeg import print_duration_table
+from .resume import ResumeState
+from ..report import record_download_failure
+from ..bandwidth import bandwidth_limiter
+from ..progress import get_bar_position
 
 
 # Config
@@ -34,6 +41,11 @@ REQUEST_VERIFY = config_manager.get_bool('REQUESTS', 'verify')
 GET_ONLY_LINK = config_manager.get_bool('M3U8_PARSER', 'get_only_link')
 REQUEST_TIMEOUT = config_manager.get_float('REQUESTS', 'timeout')
 TELEGRAM_BOT = config_manager.get_bool('DEFAULT', 'telegram_bot')
+REQUEST_MAX_RETRY = config_manager.get_int('REQUESTS', 'max_retry')
+PARALLEL_PARTS = config_manager.get_int('MP4_DOWNLOAD', 'parallel_parts')
+MIN_PART_SIZE = config_manager.get_int('MP4_DOWNLOAD', 'min_part_size_mb') * 1024 * 1024
+MIN_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 1024 * 1024
 
 
 # Variable
@@ -66,10 +78,161 @@ def signal_handler(signum, frame, interrupt_handler, original_handler):
     
     elif interrupt_handler.interrupt_count >= 3:
         interrupt_handler.force_quit = True
-        console.print("\n[bold red]Force quit activated. Saving partial download...[/bold red]")
+        console.print("\n[bold red]Force quit activated. Stopping download...[/bold red]")
         signal.signal(signum, original_handler)
 
 
+class RangeNotSupported(Exception):
+    """Raised when the server answers a range request with the whole file."""
+
+
+def get_chunk_size(total: int) -> int:
+    """
+    Pick the read size for a download of `total` bytes: larger files use larger chunks.
+    """
+    return max(MIN_CHUNK_SIZE, min(MAX_CHUNK_SIZE, total // 1000))
+
+
+def probe_download(client: httpx.Client, url: str, headers: dict) -> Tuple[int, bool, Dict]:
+    """
+    Get the size of the file, whether the server honours range requests and the validators of the file.
+
+    Returns:
+        Tuple[int, bool, Dict]: Total size in bytes (0 if unknown), range support and validators.
+    """
+    with client.stream("GET", url, headers={**headers, 'Range': 'bytes=0-0'}) as response:
+        response.raise_for_status()
+        validators = ResumeState.get_validators(response.headers)
+
+        content_range = response.headers.get('content-range', '')
+        if response.status_code == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            if total.isdigit():
+                return int(total), True, validators
+
+        return int(response.headers.get('content-length', 0)), False, validators
+
+
+def split_parts(total: int) -> List[List[int]]:
+    """
+    Split `total` bytes into up to PARALLEL_PARTS `[start, end, position]` parts of at least MIN_PART_SIZE.
+    """
+    n_parts = max(1, min(PARALLEL_PARTS, total // MIN_PART_SIZE))
+    part_size = total // n_parts
+    parts = []
+
+    for i in range(n_parts):
+        start = i * part_size
+        end = total - 1 if i == n_parts - 1 else start + part_size - 1
+        parts.append([start, end, start])
+
+    return parts
+
+
+def download_single(client: httpx.Client, url: str, headers: dict, temp_path: str, total: int, bar: tqdm, interrupt_handler: InterruptHandler) -> None:
+    """
+    Download the whole file over a single connection.
+    """
+    with client.stream("GET", url, headers=headers) as response:
+        response.raise_for_status()
+
+        with open(temp_path, 'wb') as file:
+            try:
+                for chunk in response.iter_bytes(chunk_size=get_chunk_size(total)):
+                    if interrupt_handler.force_quit:
+                        console.print("\n[bold red]Force quitting... Keeping the bytes received so far.[/bold red]")
+                        break
+                    
+                    if chunk:
+                        size = file.write(chunk)
+                        bar.update(size)
+                        bandwidth_limiter.consume(size)
+
+            except KeyboardInterrupt:
+                if not interrupt_handler.force_quit:
+                    interrupt_handler.kill_download = True
+
+
+def download_range(client: httpx.Client, url: str, headers: dict, temp_path: str, state: ResumeState, index: int, bar: tqdm, interrupt_handler: InterruptHandler, cancel_event: threading.Event) -> None:
+    """
+    Download part `index` of the file into the preallocated file, resuming the part on connection errors.
+    Returns early once `cancel_event` is set, e.g. because another part failed.
+    """
+    start, end, position = state.parts[index]
+    if position > end:
+        return
+
+    range_headers = {**headers}
+    if_range = state.get_if_range()
+    if if_range:
+        range_headers['If-Range'] = if_range
+
+    for attempt in range(REQUEST_MAX_RETRY):
+        if cancel_event.is_set():
+            return
+
+        try:
+            range_headers['Range'] = f'bytes={position}-{end}'
+            with client.stream("GET", url, headers=range_headers) as response:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    raise RangeNotSupported(f"Server ignored range {position}-{end}")
+
+                with open(temp_path, 'r+b') as file:
+                    file.seek(position)
+
+                    for chunk in response.iter_bytes(chunk_size=get_chunk_size(end - start + 1)):
+                        if interrupt_handler.force_quit or cancel_event.is_set():
+                            return
+
+                        chunk = chunk[:end + 1 - position]
+                        file.write(chunk)
+                        file.flush()
+                        position += len(chunk)
+                        state.update(index, position)
+                        bar.update(len(chunk))
+                        bandwidth_limiter.consume(len(chunk))
+
+            if position > end:
+                return
+
+        except RangeNotSupported:
+            raise
+
+        except Exception as e:
+            logging.error(f"Attempt {attempt + 1} failed for range {position}-{end}: {e}")
+            if cancel_event.wait(1.5 ** attempt):
+                return
+
+    raise RuntimeError(f"Failed to download range {start}-{end}")
+
+
+def download_ranges(client: httpx.Client, url: str, headers: dict, temp_path: str, state: ResumeState, bar: tqdm, interrupt_handler: InterruptHandler) -> None:
+    """
+    Download the missing bytes of every part with concurrent range requests.
+    The first part that fails stops the others, its error is raised.
+    """
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=len(state.parts))
+    futures = [
+        executor.submit(download_range, client, url, headers, temp_path, state, index, bar, interrupt_handler, cancel_event)
+        for index in range(len(state.parts))
+    ]
+
+    try:
+        for future in as_completed(futures):
+            future.result()
+
+    except BaseException:
+        cancel_event.set()
+        raise
+
+    finally:
+
+        # Wait for the running parts, they return at their next chunk and their progress stays in the state
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
 def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = None):
     """
     Downloads an MP4 video with enhanced interrupt handling.
@@ -94,6 +257,7 @@ def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = No
     if not (url.lower().startswith('http://') or url.lower().startswith('https://')):
         logging.error(f"Invalid URL: {url}")
         console.print(f"[bold red]Invalid URL: {url}[/bold red]")
+        record_download_failure(os.path.basename(path), f"Invalid URL: {url}")
         return None, False
 
     # Set headers
@@ -108,55 +272,77 @@ def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = No
 
     # Set interrupt handler
     temp_path = f"{path}.temp"
+    state = ResumeState(temp_path)
     interrupt_handler = InterruptHandler()
-    original_handler = signal.signal(signal.SIGINT, partial(signal_handler, interrupt_handler=interrupt_handler, original_handler=signal.getsignal(signal.SIGINT)))
+    on_main_thread = threading.current_thread() is threading.main_thread()
+    if on_main_thread:
+        original_handler = signal.signal(signal.SIGINT, partial(signal_handler, interrupt_handler=interrupt_handler, original_handler=signal.getsignal(signal.SIGINT)))
 
     # Ensure the output directory exists
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
     try:
-        with httpx.Client(verify=REQUEST_VERIFY) as client:
-            with client.stream("GET", url, headers=headers) as response:
-                response.raise_for_status()
-                total = int(response.headers.get('content-length', 0))
-                
-                if total == 0:
-                    console.print("[bold red]No video stream found.[/bold red]")
-                    return None, False
-
-                # Create a fancy progress bar
-                progress_bar = tqdm(
-                    total=total,
-                    ascii='░▒█',
-                    bar_format=f"{Colors.YELLOW}[MP4]{Colors.WHITE}: "
-                               f"{Colors.RED}{{percentage:.2f}}% {Colors.MAGENTA}{{bar}} {Colors.WHITE}[ "
-                               f"{Colors.YELLOW}{{n_fmt}}{Colors.WHITE} / {Colors.RED}{{total_fmt}} {Colors.WHITE}] "
-                               f"{Colors.YELLOW}{{elapsed}} {Colors.WHITE}< {Colors.CYAN}{{remaining}}{Colors.WHITE}, "
-                               f"{Colors.YELLOW}{{rate_fmt}}{{postfix}} ",
-                    unit='iB',
-                    unit_scale=True,
-                    desc='Downloading',
-                    mininterval=0.05,
-                    file=sys.stdout                         # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.  
-                )
-
-                downloaded = 0
-                with open(temp_path, 'wb') as file, progress_bar as bar:
+        with httpx.Client(verify=REQUEST_VERIFY, limits=httpx.Limits(max_connections=max(PARALLEL_PARTS, 1))) as client:
+            total, accept_ranges, validators = probe_download(client, url, headers)
+            
+            if total == 0:
+                console.print("[bold red]No video stream found.[/bold red]")
+                record_download_failure(os.path.basename(path), "No video stream found")
+                return None, False
+
+            if accept_ranges:
+                if state.load(total, validators):
+                    console.print(f"[cyan]Resuming download from [green]{internet_manager.format_file_size(state.downloaded())}")
+
+                else:
+                    with open(temp_path, 'wb') as file:
+                        file.truncate(total)
+                    state.start(validators, split_parts(total))
+
+            # Create a fancy progress bar
+            progress_bar = tqdm(
+                total=total,
+                initial=state.downloaded(),
+                ascii='░▒█',
+                bar_format=f"{Colors.YELLOW}[MP4]{Colors.WHITE}: "
+                           f"{Colors.RED}{{percentage:.2f}}% {Colors.MAGENTA}{{bar}} {Colors.WHITE}[ "
+                           f"{Colors.YELLOW}{{n_fmt}}{Colors.WHITE} / {Colors.RED}{{total_fmt}} {Colors.WHITE}] "
+                           f"{Colors.YELLOW}{{elapsed}} {Colors.WHITE}< {Colors.CYAN}{{remaining}}{Colors.WHITE}, "
+                           f"{Colors.YELLOW}{{rate_fmt}}{{postfix}} ",
+                unit='iB',
+                unit_scale=True,
+                desc='Downloading',
+                mininterval=0.05,
+                position=get_bar_position(),
+                file=sys.stdout                         # Using file=sys.stdout to force in-place updates because sys.stderr may not support carriage returns in this environment.  
+            )
+
+            with progress_bar as bar:
+                if accept_ranges:
                     try:
-                        for chunk in response.iter_bytes(chunk_size=1024):
-                            if interrupt_handler.force_quit:
-                                console.print("\n[bold red]Force quitting... Saving partial download.[/bold red]")
-                                break
-                            
-                            if chunk:
-                                size = file.write(chunk)
-                                downloaded += size
-                                bar.update(size)
-
-                    except KeyboardInterrupt:
-                        if not interrupt_handler.force_quit:
-                            interrupt_handler.kill_download = True
+                        download_ranges(client, url, headers, temp_path, state, bar, interrupt_handler)
+
+                    except RangeNotSupported as e:
+                        logging.warning(f"{e}, downloading over a single connection")
+                        state.remove()
+                        state.parts = []
+                        bar.reset()
+                        download_single(client, url, headers, temp_path, total, bar, interrupt_handler)
+
+                else:
+                    download_single(client, url, headers, temp_path, total, bar, interrupt_handler)
                     
+        # An unfinished ranged download has zero-filled holes: never promote it to the final file
+        if state.parts and not state.is_complete():
+            if state.is_resumable():
+                state.save()
+                console.print("[yellow]Download interrupted, run it again to resume.")
+            else:
+                os.remove(temp_path)
+                console.print("[yellow]Download interrupted, partial file removed: the server gives no way to resume it.")
+            return None, interrupt_handler.kill_download
+
+        state.remove()
         if os.path.exists(temp_path):
             os.rename(temp_path, path)
 
@@ -178,14 +364,24 @@ def MP4_downloader(url: str, path: str, referer: str = None, headers_: dict = No
         
         else:
             console.print("[bold red]Download failed or file is empty.[/bold red]")
+            record_download_failure(os.path.basename(path), "Download failed or file is empty")
             return None, interrupt_handler.kill_download
 
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         console.print(f"[bold red]Unexpected Error: {e}[/bold red]")
-        if os.path.exists(temp_path):
+        record_download_failure(os.path.basename(path), str(e))
+
+        # Partial files are kept only when they can be validated on the next run
+        if state.parts and state.is_resumable():
+            state.save()
+            console.print("[yellow]Partial download kept, run it again to resume.")
+        elif not state.parts and os.path.exists(state.path):
+            console.print("[yellow]Partial download of a previous run kept, run it again to resume.")
+        elif os.path.exists(temp_path):
             os.remove(temp_path)
         return None, interrupt_handler.kill_download
     
     finally:
-        signal.signal(signal.SIGINT, original_handler)
+        if on_main_thread:
+            signal.signal(signal.SIGINT, original_handler)
@@ -0,0 +1,131 @@
+# 18.10.26
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, List, Optional
+
+
+class ResumeState:
+    def __init__(self, temp_path: str):
+        """
+        Sidecar of a partial MP4 download: the validators of the remote file and how far each part got.
+
+        Parameters:
+            - temp_path (str): Path of the `.temp` file being downloaded.
+        """
+        self.temp_path = temp_path
+        self.path = f"{temp_path}.json"
+        self.validators: Dict = {}
+        self.parts: List[List[int]] = []
+        self.lock = threading.Lock()
+        self.last_save = 0.0
+
+    @staticmethod
+    def get_validators(headers) -> Dict:
+        """
+        Extract the fields identifying a version of the remote file from the response headers.
+        """
+        return {
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified')
+        }
+
+    def load(self, total: int, validators: Dict) -> bool:
+        """
+        Load the parts of a previous run if the `.temp` file belongs to the same remote file.
+
+        Parameters:
+            - total (int): Current size of the remote file.
+            - validators (Dict): Current validators of the remote file.
+
+        Returns:
+            bool: True if the download can be resumed.
+        """
+        if not os.path.exists(self.path) or not os.path.exists(self.temp_path):
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+
+        except (OSError, json.JSONDecodeError) as e:
+            logging.error(f"Cannot read resume state {self.path}: {e}")
+            return False
+
+        if data.get('total') != total or os.path.getsize(self.temp_path) != total:
+            return False
+
+        # Every validator the server sends must be unchanged, and at least one is required
+        known = {key: value for key, value in validators.items() if value}
+        if not known or any(data.get('validators', {}).get(key) != value for key, value in known.items()):
+            logging.info(f"Remote file changed since {self.temp_path} was started, downloading again")
+            return False
+
+        self.validators = validators
+        self.parts = data.get('parts', [])
+        return bool(self.parts)
+
+    def start(self, validators: Dict, parts: List[List[int]]) -> None:
+        """
+        Begin tracking a new download.
+
+        Parameters:
+            - validators (Dict): Validators of the remote file.
+            - parts (List[List[int]]): `[start, end, position]` of every part.
+        """
+        self.validators = validators
+        self.parts = parts
+        self.save()
+
+    def is_resumable(self) -> bool:
+        """
+        Whether an unfinished `.temp` file can be kept for the next run: without validators
+        a partial file could never be trusted, so no sidecar is written for it.
+        """
+        return any(self.validators.values())
+
+    def get_if_range(self) -> Optional[str]:
+        """
+        Value for the If-Range header, so a changed file is sent whole instead of as a mismatching range.
+        """
+        etag = self.validators.get('etag')
+        if etag and not etag.startswith('W/'):
+            return etag
+
+        return self.validators.get('last_modified')
+
+    def update(self, index: int, position: int) -> None:
+        """
+        Record that part `index` is written up to `position`, saving the sidecar at most once per second.
+        """
+        with self.lock:
+            self.parts[index][2] = position
+
+            if time.monotonic() - self.last_save >= 1.0:
+                self.save()
+
+    def save(self) -> None:
+        if not self.is_resumable():
+            return
+
+        self.last_save = time.monotonic()
+        tmp_path = f"{self.path}.tmp"
+
+        with open(tmp_path, 'w') as f:
+            json.dump({'total': sum(end - start + 1 for start, end, _ in self.parts), 'validators': self.validators, 'parts': self.parts}, f)
+        os.replace(tmp_path, self.path)
+
+    def is_complete(self) -> bool:
+        """Whether every part reached its end, independently of the sidecar."""
+        return all(position > end for _, end, position in self.parts)
+
+    def downloaded(self) -> int:
+        """Bytes already written across all parts."""
+        return sum(position - start for start, _, position in self.parts)
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
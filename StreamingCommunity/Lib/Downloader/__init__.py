@@ -2,4 +2,5 @@
 
 from .HLS.downloader import HLS_Downloader
 from .MP4.downloader import MP4_downloader
-from .TOR.downloader import TOR_downloader
\ No newline at end of file
+from .TOR.downloader import TOR_downloader
+from .report import collect_download_report, record_download_failure
\ No newline at end of file
@@ -0,0 +1,49 @@
+# 18.10.26
+
+import time
+import asyncio
+import threading
+
+
+class BandwidthLimiter:
+    def __init__(self, rate: float = 0):
+        """
+        Process-wide cap on download speed shared by every HLS and MP4 download.
+
+        Parameters:
+            - rate (float): Maximum bytes per second, 0 disables the limit.
+        """
+        self.rate = rate
+        self.next_free = 0.0
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        with self.lock:
+            self.rate = rate
+            self.next_free = 0.0
+
+    def reserve(self, size: int) -> float:
+        """
+        Account `size` received bytes and return how long the caller has to wait to stay under the limit.
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            now = time.monotonic()
+            self.next_free = max(now, self.next_free) + size / self.rate
+            return self.next_free - now
+
+    def consume(self, size: int) -> None:
+        delay = self.reserve(size)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def consume_async(self, size: int) -> None:
+        delay = self.reserve(size)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Variable
+bandwidth_limiter = BandwidthLimiter()
@@ -0,0 +1,22 @@
+# 18.10.26
+
+import contextvars
+from typing import Optional
+
+
+# Variable
+progress_offset = contextvars.ContextVar('progress_offset', default=None)
+
+
+def get_bar_position(position: Optional[int] = None) -> Optional[int]:
+    """
+    Line of a progress bar, shifted by `progress_offset` when several episodes are downloaded together.
+
+    Parameters:
+        - position (int, optional): Line of the bar inside its own download, e.g. one line per track.
+    """
+    offset = progress_offset.get()
+    if offset is None:
+        return position
+
+    return offset + (position or 0)
@@ -0,0 +1,58 @@
+# 18.10.26
+
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+
+# Variable
+current_report = contextvars.ContextVar('download_report', default=None)
+
+
+class DownloadReport:
+    def __init__(self):
+        """
+        Failures of the downloads started inside `collect_download_report`,
+        shared with the episode and post-processing threads that copy the context.
+        """
+        self.failures: List[Tuple[str, str]] = []
+        self.lock = threading.Lock()
+
+    def add_failure(self, title: str, error: str) -> None:
+        with self.lock:
+            self.failures.append((title, error))
+
+    def summary(self) -> str:
+        with self.lock:
+            return "; ".join(f"{title}: {error}" for title, error in self.failures)
+
+
+def record_download_failure(title: str, error: str) -> None:
+    """
+    Note a failed download in the active report, nothing happens outside `collect_download_report`.
+
+    Parameters:
+        - title (str): Name of the title or episode, e.g. the output file name.
+        - error (str): Reason of the failure.
+    """
+    report = current_report.get()
+    if report is not None:
+        logging.info(f"Download of {title} failed: {error}")
+        report.add_failure(title, error)
+
+
+@contextmanager
+def collect_download_report() -> Iterator[DownloadReport]:
+    """
+    Collect the failures of every download started inside the block, which site code otherwise only prints.
+    """
+    report = DownloadReport()
+    token = current_report.set(report)
+
+    try:
+        yield report
+
+    finally:
+        current_report.reset(token)
@@ -1,4 +1,7 @@
 # 18.04.24
 
-from .command import join_video, join_audios, join_subtitle
-from .util import print_duration_table, get_video_duration
\ No newline at end of file
+from .command import join_video, join_audios, join_subtitle, join_all
+from .util import print_duration_table, get_video_duration
+from .capabilities import get_ffmpeg_capabilities
+from .pipe import SegmentPipe
+from .capture import FFmpegProgress
\ No newline at end of file
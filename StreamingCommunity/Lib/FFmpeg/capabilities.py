@@ -0,0 +1,164 @@
+# 18.10.26
+
+import os
+import json
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Set
+
+
+# Internal utilities
+from StreamingCommunity.Util.os import get_ffmpeg_path, get_cache_dir
+
+
+# Variable
+_capabilities: Dict[tuple, "FFmpegCapabilities"] = {}
+_capabilities_lock = threading.Lock()
+
+
+class FFmpegCapabilities:
+    def __init__(self, encoders: List[str], muxers: List[str], hwaccels: List[str]):
+        """
+        Encoders, muxers and hardware accelerations supported by an ffmpeg binary.
+
+        Parameters:
+            - encoders (List[str]): Names listed by `ffmpeg -encoders`.
+            - muxers (List[str]): Names listed by `ffmpeg -muxers`.
+            - hwaccels (List[str]): Names listed by `ffmpeg -hwaccels`.
+        """
+        self.encoders: Set[str] = set(encoders)
+        self.muxers: Set[str] = set(muxers)
+        self.hwaccels: Set[str] = set(hwaccels)
+
+    def has_encoder(self, name: str) -> bool:
+        return name in self.encoders
+
+    def has_muxer(self, name: str) -> bool:
+        return name in self.muxers
+
+    def has_hwaccel(self, name: str) -> bool:
+        return name in self.hwaccels
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        return {
+            'encoders': sorted(self.encoders),
+            'muxers': sorted(self.muxers),
+            'hwaccels': sorted(self.hwaccels)
+        }
+
+
+def _run_ffmpeg_list(ffmpeg_path: str, option: str) -> str:
+    result = subprocess.run([ffmpeg_path, '-hide_banner', option], capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+def _parse_table(output: str) -> List[str]:
+    """
+    Names from the output of -encoders or -muxers: a legend, a '--' separator, then '<flags> <name> <description>' rows.
+    """
+    names = []
+    rows = output.split('--', 1)[-1].splitlines() if '--' in output else []
+
+    for row in rows:
+        fields = row.split()
+        if len(fields) >= 2:
+
+            # Muxers like "mp4,m4a" are listed with all their aliases
+            names.extend(fields[1].split(','))
+
+    return names
+
+
+def _parse_hwaccels(output: str) -> List[str]:
+    lines = [line.strip() for line in output.splitlines() if line.strip()]
+    return [line for line in lines if not line.endswith(':')]
+
+
+def _probe_capabilities(ffmpeg_path: str) -> FFmpegCapabilities:
+    logging.info(f"Detecting capabilities of {ffmpeg_path}")
+    return FFmpegCapabilities(
+        encoders=_parse_table(_run_ffmpeg_list(ffmpeg_path, '-encoders')),
+        muxers=_parse_table(_run_ffmpeg_list(ffmpeg_path, '-muxers')),
+        hwaccels=_parse_hwaccels(_run_ffmpeg_list(ffmpeg_path, '-hwaccels'))
+    )
+
+
+def _get_cache_path() -> str:
+    return os.path.join(get_cache_dir(), 'ffmpeg_capabilities.json')
+
+
+def _load_cached(ffmpeg_path: str, stamp: List[int]) -> Optional[FFmpegCapabilities]:
+    try:
+        with open(_get_cache_path(), 'r', encoding='utf-8') as f:
+            entry = json.load(f).get(ffmpeg_path)
+
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if entry is None or entry.get('stamp') != stamp:
+        return None
+
+    return FFmpegCapabilities(entry['encoders'], entry['muxers'], entry['hwaccels'])
+
+
+def _save_cached(ffmpeg_path: str, stamp: List[int], capabilities: FFmpegCapabilities) -> None:
+    cache_path = _get_cache_path()
+
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        cache = {}
+
+    cache[ffmpeg_path] = {'stamp': stamp, **capabilities.to_dict()}
+
+    try:
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+
+    except OSError as e:
+        logging.error(f"Cannot write ffmpeg capabilities cache: {e}")
+
+
+def get_ffmpeg_capabilities(ffmpeg_path: Optional[str] = None) -> Optional[FFmpegCapabilities]:
+    """
+    Return what an ffmpeg binary supports, detected once and kept on disk until the binary changes.
+
+    Parameters:
+        - ffmpeg_path (str, optional): Binary to inspect, the one found at startup if None.
+
+    Returns:
+        FFmpegCapabilities: Supported encoders, muxers and hwaccels, None if ffmpeg cannot be run.
+    """
+    ffmpeg_path = ffmpeg_path or get_ffmpeg_path()
+    if not ffmpeg_path:
+        return None
+
+    try:
+        file_stat = os.stat(ffmpeg_path)
+    except OSError as e:
+        logging.error(f"Cannot access ffmpeg at {ffmpeg_path}: {e}")
+        return None
+
+    stamp = [file_stat.st_size, file_stat.st_mtime_ns]
+    key = (ffmpeg_path, *stamp)
+
+    with _capabilities_lock:
+        if key in _capabilities:
+            return _capabilities[key]
+
+        capabilities = _load_cached(ffmpeg_path, stamp)
+        if capabilities is None:
+            try:
+                capabilities = _probe_capabilities(ffmpeg_path)
+            except (OSError, subprocess.CalledProcessError) as e:
+                logging.error(f"Cannot detect ffmpeg capabilities: {e}")
+                return None
+
+            _save_cached(ffmpeg_path, stamp, capabilities)
+
+        _capabilities[key] = capabilities
+        return capabilities
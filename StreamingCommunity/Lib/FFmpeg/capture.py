@@ -1,9 +1,10 @@
 # 16.04.24
 
-import re
+import time
 import logging
 import threading
 import subprocess
+from typing import Callable, Dict, Optional
 
 
 # External library
@@ -16,60 +17,92 @@ from StreamingCommunity.Util.os import internet_manager
 
 # Variable
 console = Console()
-terminate_flag = threading.Event()
+PROGRESS_INTERVAL = 0.5
 
 
-def capture_output(process: subprocess.Popen, description: str) -> None:
+class FFmpegProgress:
+    def __init__(self, description: str, values: Dict[str, str]):
+        """
+        One block of the `-progress` stream of ffmpeg.
+
+        Parameters:
+            - description (str): Description of the running command.
+            - values (Dict[str, str]): Keys and values of the block, e.g. out_time_us, speed, total_size, progress.
+        """
+        self.description = description
+        self.out_time = _to_number(values.get('out_time_us'), int, 0) / 1_000_000
+        self.total_size = _to_number(values.get('total_size'), int, 0)
+        self.speed = _to_number(values.get('speed', '').rstrip('x'), float, None)
+        self.finished = values.get('progress') == 'end'
+
+    def __repr__(self) -> str:
+        return f"FFmpegProgress(out_time={self.out_time:.2f}, speed={self.speed}, total_size={self.total_size}, finished={self.finished})"
+
+
+def _to_number(value: Optional[str], cast: type, default):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def print_progress(progress: FFmpegProgress, max_length: int) -> int:
+    """
+    Print a progress event on a single line, returning the length used to pad the next one.
     """
-    Function to capture and print output from a subprocess.
+    speed = f"{progress.speed}x" if progress.speed is not None else "N/A"
+    progress_string = (f" {progress.description}[white]: "
+                       f"([green]'speed': [yellow]{speed}[white], "
+                       f"[green]'size': [yellow]{internet_manager.format_file_size(progress.total_size)}[white])")
+    max_length = max(max_length, len(progress_string))
+
+    # Print the progress string to the console, overwriting the previous line
+    console.print(progress_string.ljust(max_length), end="\r")
+    return max_length
+
+
+def capture_output(process: subprocess.Popen, description: str, stop_event: threading.Event, on_progress: Optional[Callable[[FFmpegProgress], None]] = None, show_progress: bool = True) -> None:
+    """
+    Read the `-progress` key/value stream of ffmpeg, printing at most one update every PROGRESS_INTERVAL seconds.
 
     Parameters:
-        - process (subprocess.Popen): The subprocess whose output is captured.
+        - process (subprocess.Popen): The ffmpeg process, started with '-progress pipe:1'.
         - description (str): Description of the command being executed.
+        - stop_event (threading.Event): Set when the reading has to stop.
+        - on_progress (Callable, optional): Called with every progress event, unthrottled.
+        - show_progress (bool): Print the progress line, the events are still read and forwarded otherwise.
     """
     try:
         max_length = 0
+        last_print = 0.0
+        values = {}
 
-        for line in iter(process.stdout.readline, ''):
-            try:
-                line = line.strip()
-                if not line:
-                    continue
-
-                logging.info(f"CAPTURE ffmpeg line: {line}")
-
-                # Check if termination is requested
-                if terminate_flag.is_set():
-                    break
-
-                if "size=" in line:
-                    try:
-
-                        # Parse the output line to extract relevant information
-                        data = parse_output_line(line)
+        for line in process.stdout:
 
-                        if 'q' in data:
-                            is_end = (float(data.get('q', -1.0)) == -1.0)
-                            size_key = 'Lsize' if is_end else 'size'
-                            byte_size = int(re.findall(r'\d+', data.get(size_key, '0'))[0]) * 1000
-                        else:
-                            byte_size = int(re.findall(r'\d+', data.get('size', '0'))[0]) * 1000
+            # Check if termination is requested
+            if stop_event.is_set():
+                break
 
+            key, _, value = line.strip().partition('=')
+            values[key] = value
 
-                        # Construct the progress string with formatted output information
-                        progress_string = (f" {description}[white]: "
-                                           f"([green]'speed': [yellow]{data.get('speed', 'N/A')}[white], "
-                                           f"[green]'size': [yellow]{internet_manager.format_file_size(byte_size)}[white])")
-                        max_length = max(max_length, len(progress_string))
+            # Each block of values ends with 'progress=continue' or 'progress=end'
+            if key != 'progress':
+                continue
 
-                        # Print the progress string to the console, overwriting the previous line
-                        console.print(progress_string.ljust(max_length), end="\r")
+            progress = FFmpegProgress(description, values)
+            values = {}
 
-                    except Exception as e:
-                        logging.error(f"Error parsing output line: {line} - {e}")
+            if on_progress is not None:
+                try:
+                    on_progress(progress)
+                except Exception as e:
+                    logging.error(f"Error in ffmpeg progress callback: {e}")
 
-            except Exception as e:
-                logging.error(f"Error processing line from subprocess: {e}")
+            now = time.monotonic()
+            if show_progress and (progress.finished or now - last_print >= PROGRESS_INTERVAL):
+                max_length = print_progress(progress, max_length)
+                last_print = now
 
     except Exception as e:
         logging.error(f"Error in capture_output: {e}")
@@ -81,33 +114,12 @@ def capture_output(process: subprocess.Popen, description: str) -> None:
             logging.error(f"Error terminating process: {e}")
 
 
-def parse_output_line(line: str) -> dict:
-    """
-    Function to parse the output line and extract relevant information.
-
-    Parameters:
-        - line (str): The output line to parse.
-
-    Returns:
-        dict: A dictionary containing parsed information.
-    """
-    try:
-        data = {}
-        parts = line.replace("  ", "").replace("= ", "=").split()
-
-        for part in parts:
-            key_value = part.split('=')
-
-            if len(key_value) == 2:
-                key = key_value[0]
-                value = key_value[1]
-                data[key] = value
-
-        return data
-    
-    except Exception as e:
-        logging.error(f"Error parsing line: {line} - {e}")
-        return {}
+def drain_stderr(process: subprocess.Popen) -> None:
+    """Log what ffmpeg writes on stderr, without the stats lines it is only the header and the errors."""
+    for line in process.stderr:
+        line = line.strip()
+        if line:
+            logging.info(f"CAPTURE ffmpeg line: {line}")
 
 
 def terminate_process(process):
@@ -124,31 +136,40 @@ def terminate_process(process):
         logging.error(f"Failed to terminate process: {e}")
 
 
-def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
+def capture_ffmpeg_real_time(ffmpeg_command: list, description: str, on_progress: Optional[Callable[[FFmpegProgress], None]] = None, show_progress: bool = True) -> Optional[int]:
     """
     Function to capture real-time output from ffmpeg process.
 
     Parameters:
         - ffmpeg_command (list): The command to execute ffmpeg.
         - description (str): Description of the command being executed.
-    """
-    global terminate_flag
+        - on_progress (Callable, optional): Called with every FFmpegProgress event of this command, e.g. to report it from the Telegram bot.
+        - show_progress (bool): Print the progress line. Disabled instead of redirecting sys.stdout,
+          which would also silence the other threads while parallel merges run.
 
-    # Clear the terminate_flag before starting a new capture
-    terminate_flag.clear()
+    Returns:
+        Optional[int]: The ffmpeg return code, None if the process could not be started or waited on.
+    """
+    # Each command has its own flag, joins running for parallel episodes do not stop each other
+    stop_event = threading.Event()
 
     try:
 
-        # Start the ffmpeg process with subprocess.Popen
-        process = subprocess.Popen(ffmpeg_command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        # Progress is read from the machine readable stream on stdout, stats lines are disabled
+        command = [ffmpeg_command[0], '-progress', 'pipe:1', '-nostats'] + list(ffmpeg_command[1:])
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, errors='replace')
 
-        # Start a thread to capture and print output
-        output_thread = threading.Thread(target=capture_output, args=(process, description))
+        # Start the threads reading the progress and the log of ffmpeg
+        output_thread = threading.Thread(target=capture_output, args=(process, description, stop_event, on_progress, show_progress))
+        stderr_thread = threading.Thread(target=drain_stderr, args=(process,), daemon=True)
         output_thread.start()
+        stderr_thread.start()
 
         try:
-            # Wait for ffmpeg process to complete
-            process.wait()
+            # Wait for ffmpeg process to complete, then for the last progress block
+            return_code = process.wait()
+            output_thread.join()
+            return return_code
 
         except KeyboardInterrupt:
             logging.error("Terminating ffmpeg process...")
@@ -157,7 +178,7 @@ def capture_ffmpeg_real_time(ffmpeg_command: list, description: str) -> None:
             logging.error(f"Error in ffmpeg process: {e}")
             
         finally:
-            terminate_flag.set()
+            stop_event.set()
             output_thread.join()
 
     except Exception as e:
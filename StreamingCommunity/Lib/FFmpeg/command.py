@@ -3,7 +3,8 @@
 import sys
 import logging
 import subprocess
-from typing import List, Dict, Tuple, Optional
+from functools import lru_cache
+from typing import Callable, List, Dict, Tuple, Optional
 
 
 # External library
@@ -12,12 +13,13 @@ from rich.console import Console
 
 # Internal utilities
 from StreamingCommunity.Util.config_json import config_manager, get_use_large_bar
-from StreamingCommunity.Util.os import os_manager, suppress_output, get_ffmpeg_path
+from StreamingCommunity.Util.os import os_manager, get_ffmpeg_path
 
 
 # Logic class
 from .util import need_to_force_to_ts, check_duration_v_a
-from .capture import capture_ffmpeg_real_time
+from .capabilities import get_ffmpeg_capabilities
+from .capture import capture_ffmpeg_real_time, FFmpegProgress
 from ..M3U8 import M3U8_Codec
 
 
@@ -38,31 +40,34 @@ console = Console()
 
 def check_subtitle_encoders() -> Tuple[Optional[bool], Optional[bool]]:
     """
-    Executes 'ffmpeg -encoders' and checks if 'mov_text' and 'webvtt' encoders are available.
+    Checks if 'mov_text' and 'webvtt' encoders are available in the detected ffmpeg capabilities.
     
     Returns:
         Tuple[Optional[bool], Optional[bool]]: A tuple containing (mov_text_supported, webvtt_supported)
-            Returns (None, None) if the FFmpeg command fails
+            Returns (None, None) if the capabilities cannot be detected
     """
-    try:
-        result = subprocess.run(
-            [get_ffmpeg_path(), '-encoders'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        
-        # Check for encoder presence in output
-        output = result.stdout
-        mov_text_supported = "mov_text" in output
-        webvtt_supported = "webvtt" in output
-        
-        return mov_text_supported, webvtt_supported
-        
-    except subprocess.CalledProcessError as e:
-        print(f"Error executing 'ffmpeg -encoders': {e}")
+    capabilities = get_ffmpeg_capabilities()
+    if capabilities is None:
         return None, None
 
+    return capabilities.has_encoder("mov_text"), capabilities.has_encoder("webvtt")
+
+
+@lru_cache(maxsize=None)
+def gpu_enabled() -> bool:
+    """
+    Check if 'use_gpu' can be honoured: ffmpeg needs the cuda hwaccel and the h264_nvenc encoder.
+    """
+    if not USE_GPU:
+        return False
+
+    capabilities = get_ffmpeg_capabilities()
+    if capabilities is None or not (capabilities.has_hwaccel("cuda") and capabilities.has_encoder("h264_nvenc")):
+        logging.warning("use_gpu is enabled but ffmpeg has no cuda/h264_nvenc support, using the cpu")
+        return False
+
+    return True
+
 
 def select_subtitle_encoder() -> Optional[str]:
     """
@@ -101,9 +106,10 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
         - codec (M3U8_Codec): The video codec to use. Defaults to 'copy'.
     """
     ffmpeg_cmd = [get_ffmpeg_path()]
+    use_gpu = gpu_enabled()
 
     # Enabled the use of gpu
-    if USE_GPU:
+    if use_gpu:
         ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
 
     # Add mpegts to force to detect input file as ts file
@@ -119,14 +125,14 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
     if USE_CODEC and codec != None:
         if USE_VCODEC:
             if codec.video_codec_name: 
-                if not USE_GPU: 
+                if not use_gpu: 
                     ffmpeg_cmd.extend(['-c:v', codec.video_codec_name])
                 else: 
                     ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
             else: 
                 console.log("[red]Cant find vcodec for 'join_audios'")
         else:
-            if USE_GPU:
+            if use_gpu:
                 ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
 
 
@@ -144,7 +150,7 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
         ffmpeg_cmd.extend(['-c', 'copy'])
 
     # Ultrafast preset always or fast for gpu
-    if not USE_GPU:
+    if not use_gpu:
         ffmpeg_cmd.extend(['-preset', FFMPEG_DEFAULT_PRESET])
     else:
         ffmpeg_cmd.extend(['-preset', 'fast'])
@@ -163,9 +169,7 @@ def join_video(video_path: str, out_path: str, codec: M3U8_Codec = None):
 
         else:
             console.log(f"[purple]FFmpeg [white][[cyan]Join video[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join video")
-                print()
+            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join video", show_progress=False)
 
     return out_path
 
@@ -184,9 +188,10 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
 
     # Start command with locate ffmpeg
     ffmpeg_cmd = [get_ffmpeg_path()]
+    use_gpu = gpu_enabled()
 
     # Enabled the use of gpu
-    if USE_GPU:
+    if use_gpu:
         ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
 
     # Insert input video path
@@ -211,14 +216,14 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
     if USE_CODEC:
         if USE_VCODEC:
             if codec.video_codec_name: 
-                if not USE_GPU: 
+                if not use_gpu: 
                     ffmpeg_cmd.extend(['-c:v', codec.video_codec_name])
                 else: 
                     ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
             else: 
                 console.log("[red]Cant find vcodec for 'join_audios'")
         else:
-            if USE_GPU:
+            if use_gpu:
                 ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
 
         if USE_ACODEC:
@@ -235,7 +240,7 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
         ffmpeg_cmd.extend(['-c', 'copy'])
 
     # Ultrafast preset always or fast for gpu
-    if not USE_GPU:
+    if not use_gpu:
         ffmpeg_cmd.extend(['-preset', FFMPEG_DEFAULT_PRESET])
     else:
         ffmpeg_cmd.extend(['-preset', 'fast'])
@@ -259,9 +264,7 @@ def join_audios(video_path: str, audio_tracks: List[Dict[str, str]], out_path: s
 
         else:
             console.log(f"[purple]FFmpeg [white][[cyan]Join audio[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join audio")
-                print()
+            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join audio", show_progress=False)
 
     return out_path
 
@@ -314,8 +317,129 @@ def join_subtitle(video_path: str, subtitles_list: List[Dict[str, str]], out_pat
 
         else:
             console.log(f"[purple]FFmpeg [white][[cyan]Join subtitle[white]] ...")
-            with suppress_output():
-                capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join subtitle")
-                print()
+            capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join subtitle", show_progress=False)
+
+    return out_path
 
-    return out_path
\ No newline at end of file
+
+def join_all(video_path: str, audio_tracks: List[Dict[str, str]], subtitles_list: List[Dict[str, str]], out_path: str, codec: M3U8_Codec = None, on_progress: Optional[Callable[[FFmpegProgress], None]] = None) -> Optional[str]:
+    """
+    Muxes video, audio tracks and subtitles into the output file with a single FFmpeg pass.
+    
+    Parameters:
+        - video_path (str): The path to the video file.
+        - audio_tracks (list[dict[str, str]]): Audio tracks to add, each with the 'path' key. If empty, the audio of the video file is kept.
+        - subtitles_list (list[dict[str, str]]): Subtitles to add, each with the 'path' and 'language' keys.
+        - out_path (str): The path to save the output file.
+        - codec (M3U8_Codec): The codec information used when re-encoding.
+        - on_progress (Callable, optional): Called with every progress event of the join.
+
+    Returns:
+        Optional[str]: The output path, or None if the single pass could not be completed and the staged join should be used.
+    """
+    audio_tracks = [a for a in audio_tracks if os_manager.check_file(a.get('path'))]
+    subtitles_list = [s for s in subtitles_list if os_manager.check_file(s.get('path'))]
+
+    subtitle_encoder = None
+    if subtitles_list:
+        subtitle_encoder = select_subtitle_encoder()
+        if subtitle_encoder is None:
+            return None
+
+    ffmpeg_cmd = [get_ffmpeg_path()]
+    use_gpu = gpu_enabled()
+
+    # Enabled the use of gpu
+    if use_gpu:
+        ffmpeg_cmd.extend(['-hwaccel', 'cuda'])
+
+    # Add mpegts to force to detect input file as ts file
+    if need_to_force_to_ts(video_path):
+        ffmpeg_cmd.extend(['-f', 'mpegts'])
+
+    # Insert input paths: video, then audios, then subtitles
+    ffmpeg_cmd.extend(['-i', video_path])
+    for audio_track in audio_tracks:
+        ffmpeg_cmd.extend(['-i', audio_track['path']])
+    for subtitle in subtitles_list:
+        ffmpeg_cmd.extend(['-i', subtitle['path']])
+
+    # Map the video and audio streams, keeping the original audio when no track is added
+    ffmpeg_cmd.extend(['-map', '0:v'])
+    if audio_tracks:
+        for i in range(1, len(audio_tracks) + 1):
+            ffmpeg_cmd.extend(['-map', f'{i}:a'])
+    else:
+        ffmpeg_cmd.extend(['-map', '0:a?'])
+
+    # Add subtitle maps and metadata
+    first_sub_input = len(audio_tracks) + 1
+    for idx, subtitle in enumerate(subtitles_list):
+        ffmpeg_cmd.extend(['-map', f'{first_sub_input + idx}:s'])
+        ffmpeg_cmd.extend([f'-metadata:s:s:{idx}', f"title={subtitle['language']}"])
+
+    # Add output Parameters
+    if USE_CODEC and codec is not None:
+        if USE_VCODEC:
+            if codec.video_codec_name: 
+                if not use_gpu: 
+                    ffmpeg_cmd.extend(['-c:v', codec.video_codec_name])
+                else: 
+                    ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
+            else: 
+                console.log("[red]Cant find vcodec for 'join_all'")
+        else:
+            if use_gpu:
+                ffmpeg_cmd.extend(['-c:v', 'h264_nvenc'])
+
+        if USE_ACODEC:
+            if codec.audio_codec_name: 
+                ffmpeg_cmd.extend(['-c:a', codec.audio_codec_name])
+            else: 
+                console.log("[red]Cant find acodec for 'join_all'")
+
+        if USE_BITRATE:
+            ffmpeg_cmd.extend(['-b:v',  f'{codec.video_bitrate // 1000}k'])
+            ffmpeg_cmd.extend(['-b:a',  f'{codec.audio_bitrate // 1000}k'])
+
+    else:
+        ffmpeg_cmd.extend(['-c', 'copy'])
+
+    if subtitle_encoder:
+        ffmpeg_cmd.extend(['-c:s', subtitle_encoder])
+
+    # Ultrafast preset always or fast for gpu
+    if not use_gpu:
+        ffmpeg_cmd.extend(['-preset', FFMPEG_DEFAULT_PRESET])
+    else:
+        ffmpeg_cmd.extend(['-preset', 'fast'])
+
+    # Use shortest input path for video and audios
+    if audio_tracks:
+        video_audio_same_duration, duration_diff = check_duration_v_a(video_path, audio_tracks[0]['path'])
+        if not video_audio_same_duration:
+            console.log(f"[red]Use shortest input (Duration difference: {duration_diff:.2f} seconds)...")
+            ffmpeg_cmd.extend(['-shortest', '-strict', 'experimental'])
+
+    # Overwrite
+    ffmpeg_cmd += [out_path, "-y"]
+    logging.info(f"FFmpeg command: {ffmpeg_cmd}")
+
+    # Run join
+    if DEBUG_MODE:
+        return_code = subprocess.run(ffmpeg_cmd).returncode
+    else:
+
+        if get_use_large_bar():
+            return_code = capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join all", on_progress)
+            print()
+
+        else:
+            console.log(f"[purple]FFmpeg [white][[cyan]Join all[white]] ...")
+            return_code = capture_ffmpeg_real_time(ffmpeg_cmd, "[cyan]Join all", on_progress, show_progress=False)
+
+    if return_code != 0 or not os_manager.check_file(out_path):
+        logging.error(f"Single pass join failed with return code {return_code}")
+        return None
+
+    return out_path
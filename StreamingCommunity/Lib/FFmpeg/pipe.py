@@ -0,0 +1,103 @@
+# 18.10.26
+
+import logging
+import threading
+import subprocess
+from collections import deque
+
+
+# Internal utilities
+from StreamingCommunity.Util.os import get_ffmpeg_path
+
+
+class SegmentPipe:
+    def __init__(self, out_path: str):
+        """
+        Remuxes an MPEG-TS stream written to FFmpeg's stdin into the output container while it is downloaded.
+
+        Parameters:
+            - out_path (str): The path to save the output file.
+        """
+        self.out_path = out_path
+        self.process: subprocess.Popen = None
+        self.errors = deque(maxlen=20)
+        self.stderr_thread: threading.Thread = None
+
+    def start(self) -> None:
+        """Start FFmpeg reading from stdin."""
+        ffmpeg_cmd = [
+            get_ffmpeg_path(), '-loglevel', 'error',
+            '-f', 'mpegts', '-i', 'pipe:0',
+            '-map', '0:v', '-map', '0:a?', '-c', 'copy',
+            self.out_path, '-y'
+        ]
+        logging.info(f"FFmpeg command: {ffmpeg_cmd}")
+
+        self.process = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        # Drain stderr so FFmpeg never blocks on a full pipe
+        self.stderr_thread = threading.Thread(target=self._read_errors, daemon=True)
+        self.stderr_thread.start()
+
+    def _read_errors(self) -> None:
+        for line in iter(self.process.stderr.readline, b''):
+            line = line.decode(errors='replace').strip()
+            if line:
+                logging.error(f"FFmpeg pipe: {line}")
+                self.errors.append(line)
+
+    def write(self, segment_content: bytes) -> bool:
+        """
+        Feed a segment to FFmpeg.
+
+        Returns:
+            bool: False if FFmpeg is no longer reading.
+        """
+        try:
+            self.process.stdin.write(segment_content)
+            return True
+
+        except (BrokenPipeError, OSError) as e:
+            logging.error(f"FFmpeg pipe closed: {e}")
+            return False
+
+    def close(self) -> bool:
+        """
+        Signal the end of the stream and wait for FFmpeg to finalize the output.
+
+        Returns:
+            bool: True if FFmpeg exited successfully.
+        """
+        if self.process is None:
+            return False
+
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+        return_code = self.process.wait()
+        self.stderr_thread.join(timeout=5)
+        self.process = None
+
+        if return_code != 0:
+            logging.error(f"FFmpeg pipe exited with return code {return_code}")
+            return False
+
+        return True
+
+    def terminate(self) -> None:
+        """Stop FFmpeg without finalizing the output."""
+        if self.process is None:
+            return
+
+        self.process.kill()
+        self.process.wait()
+
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+        self.stderr_thread.join(timeout=5)
+        self.process = None
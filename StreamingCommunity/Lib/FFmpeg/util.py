@@ -1,11 +1,12 @@
 # 16.04.24
 
 import os
-import sys
 import json
 import subprocess
 import logging
-from typing import Tuple
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 
 # External library
@@ -18,6 +19,111 @@ from StreamingCommunity.Util.os import get_ffprobe_path
 
 # Variable
 console = Console()
+MEDIA_INFO_CACHE_SIZE = 256
+_media_info_cache: "OrderedDict[Tuple[str, int, int], Optional[MediaInfo]]" = OrderedDict()
+_media_info_lock = threading.Lock()
+
+
+class MediaInfo:
+    def __init__(self, file_path: str, probe_result: Dict):
+        """
+        Result of one `ffprobe -show_format -show_streams` call on a file.
+
+        Parameters:
+            - file_path (str): Probed file.
+            - probe_result (Dict): Parsed json output of ffprobe.
+        """
+        self.file_path = file_path
+        self.format: Dict = probe_result.get('format', {})
+        self.streams: List[Dict] = probe_result.get('streams', [])
+
+    @property
+    def duration(self) -> Optional[float]:
+        try:
+            return float(self.format['duration'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @property
+    def format_name(self) -> Optional[str]:
+        return self.format.get('format_name')
+
+    @property
+    def codec_names(self) -> List[str]:
+        return [stream.get('codec_name') for stream in self.streams]
+
+    @property
+    def has_audio(self) -> bool:
+        return any(stream.get('codec_type') == 'audio' for stream in self.streams)
+
+
+def _run_ffprobe(file_path: str) -> Optional[Dict]:
+    ffprobe_path = get_ffprobe_path()
+    if not ffprobe_path or not os.path.exists(ffprobe_path):
+        logging.error(f"FFprobe not found at path: {ffprobe_path}")
+        return None
+
+    try:
+        cmd = [ffprobe_path, '-v', 'error', '-show_format', '-show_streams', '-print_format', 'json', file_path]
+        logging.info(f"Running FFprobe command: {' '.join(cmd)}")
+        
+        # Use subprocess.run instead of Popen for better error handling
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            check=False  # Don't raise exception on non-zero exit
+        )
+
+        if result.returncode != 0:
+            logging.error(f"FFprobe failed with return code {result.returncode}")
+            logging.error(f"FFprobe stderr: {result.stderr}")
+            logging.error(f"Command: {' '.join(cmd)}")
+            return None
+
+        return json.loads(result.stdout)
+
+    except json.JSONDecodeError as e:
+        logging.error(f"Failed to parse FFprobe output: {e}")
+        return None
+
+    except Exception as e:
+        logging.error(f"FFprobe execution failed: {e}")
+        return None
+
+
+def get_media_info(file_path: str) -> Optional[MediaInfo]:
+    """
+    Probe a file once and keep the result while its size and modification time do not change.
+
+    Parameters:
+        - file_path (str): Path to the media file.
+
+    Returns:
+        MediaInfo: Format and streams of the file, None if it cannot be probed.
+    """
+    try:
+        file_stat = os.stat(file_path)
+    except OSError as e:
+        logging.error(f"Cannot access file {file_path}: {e}")
+        return None
+
+    key = (os.path.abspath(file_path), file_stat.st_size, file_stat.st_mtime_ns)
+
+    with _media_info_lock:
+        if key in _media_info_cache:
+            _media_info_cache.move_to_end(key)
+            return _media_info_cache[key]
+
+    probe_result = _run_ffprobe(file_path)
+    media_info = MediaInfo(file_path, probe_result) if probe_result is not None else None
+
+    with _media_info_lock:
+        _media_info_cache[key] = media_info
+        while len(_media_info_cache) > MEDIA_INFO_CACHE_SIZE:
+            _media_info_cache.popitem(last=False)
+
+    return media_info
 
 
 def has_audio_stream(video_path: str) -> bool:
@@ -30,24 +136,11 @@ def has_audio_stream(video_path: str) -> bool:
     Returns:
         has_audio (bool): True if the input video has an audio stream, False otherwise.
     """
-    try:
-        ffprobe_cmd = [get_ffprobe_path(), '-v', 'error', '-print_format', 'json', '-select_streams', 'a', '-show_streams', video_path]
-        logging.info(f"FFmpeg command: {ffprobe_cmd}")
-
-        with subprocess.Popen(ffprobe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:
-            stdout, stderr = proc.communicate()
-            if stderr:
-                logging.error(f"Error: {stderr}")
-            else:
-                probe_result = json.loads(stdout)
-                return bool(probe_result.get('streams', []))
-            
-    except Exception as e:
-        logging.error(f"Error: {e}")
-        return False
+    media_info = get_media_info(video_path)
+    return media_info.has_audio if media_info is not None else False
 
 
-def get_video_duration(file_path: str) -> float:
+def get_video_duration(file_path: str) -> Optional[float]:
     """
     Get the duration of a video file.
 
@@ -55,33 +148,15 @@ def get_video_duration(file_path: str) -> float:
         - file_path (str): The path to the video file.
 
     Returns:
-        (float): The duration of the video in seconds if successful, None if there's an error.
+        Optional[float]: The duration of the video in seconds, None if the file cannot be probed.
     """
-    try:
-        ffprobe_cmd = [get_ffprobe_path(), '-v', 'error', '-show_format', '-print_format', 'json', file_path]
-        logging.info(f"FFmpeg command: {ffprobe_cmd}")
-
-        # Use a with statement to ensure the subprocess is cleaned up properly
-        with subprocess.Popen(ffprobe_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True) as proc:
-            stdout, stderr = proc.communicate()
-            
-            if proc.returncode != 0:
-                logging.error(f"Error: {stderr}")
-                return None
-            
-            # Parse JSON output
-            probe_result = json.loads(stdout)
-
-            # Extract duration from the video information
-            try:
-                return float(probe_result['format']['duration'])
-            
-            except:
-                return 1
+    media_info = get_media_info(file_path)
+    if media_info is None:
+        return None
 
-    except Exception as e:
-        logging.error(f"Get video duration error: {e}")
-        sys.exit(0)
+    # Files without a duration in their format are counted as 1 second
+    duration = media_info.duration
+    return duration if duration is not None else 1
 
 
 def format_duration(seconds: float) -> Tuple[int, int, int]:
@@ -142,58 +217,20 @@ def get_ffprobe_info(file_path):
         logging.error(f"File not found: {file_path}")
         return None
 
-    # Get ffprobe path and verify it exists
-    ffprobe_path = get_ffprobe_path()
-    if not ffprobe_path or not os.path.exists(ffprobe_path):
-        logging.error(f"FFprobe not found at path: {ffprobe_path}")
-        return None
-
     # Verify file permissions
-    try:
-        file_stat = os.stat(file_path)
-        logging.info(f"File permissions: {oct(file_stat.st_mode)}")
-        if not os.access(file_path, os.R_OK):
-            logging.error(f"No read permission for file: {file_path}")
-            return None
-    except OSError as e:
-        logging.error(f"Cannot access file {file_path}: {e}")
+    if not os.access(file_path, os.R_OK):
+        logging.error(f"No read permission for file: {file_path}")
         return None
 
-    try:
-        cmd = [ffprobe_path, '-v', 'error', '-show_format', '-show_streams', '-print_format', 'json', file_path]
-        logging.info(f"Running FFprobe command: {' '.join(cmd)}")
-        
-        # Use subprocess.run instead of Popen for better error handling
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=False  # Don't raise exception on non-zero exit
-        )
-
-        if result.returncode != 0:
-            logging.error(f"FFprobe failed with return code {result.returncode}")
-            logging.error(f"FFprobe stderr: {result.stderr}")
-            logging.error(f"FFprobe stdout: {result.stdout}")
-            logging.error(f"Command: {' '.join(cmd)}")
-            logging.error(f"FFprobe path permissions: {oct(os.stat(ffprobe_path).st_mode)}")
-            return None
-
-        # Parse JSON output
-        try:
-            info = json.loads(result.stdout)
-            return {
-                'format_name': info.get('format', {}).get('format_name'),
-                'codec_names': [stream.get('codec_name') for stream in info.get('streams', [])]
-            }
-        except json.JSONDecodeError as e:
-            logging.error(f"Failed to parse FFprobe output: {e}")
-            return None
-
-    except Exception as e:
-        logging.error(f"FFprobe execution failed: {e}")
+    media_info = get_media_info(file_path)
+    if media_info is None:
         return None
 
+    return {
+        'format_name': media_info.format_name,
+        'codec_names': media_info.codec_names
+    }
+
 
 def is_png_format_or_codec(file_info):
     """
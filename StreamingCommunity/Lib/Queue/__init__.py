@@ -0,0 +1,4 @@
+# 18.10.26
+
+from .store import JobStore
+from .runner import JobRunner, enqueue, get_job_store, print_jobs
@@ -0,0 +1,224 @@
+# 18.10.26
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+
+# External library
+from rich.console import Console
+from rich.table import Table
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Api.Template.registry import load_site_manifest, get_lazy_search
+
+
+# Logic class
+from .store import JobStore
+from ..Downloader.bandwidth import bandwidth_limiter
+from ..Downloader.report import collect_download_report
+from ..Downloader.HLS.controller import set_global_controller
+from ..Downloader.HLS.segments import interrupt_running_downloads
+from ..Downloader.HLS.downloader import create_worker_budget
+
+
+# Config
+JOB_DATABASE = config_manager.get('JOB_QUEUE', 'database')
+JOB_WORKERS = config_manager.get_int('JOB_QUEUE', 'workers')
+JOB_MAX_ATTEMPTS = config_manager.get_int('JOB_QUEUE', 'max_attempts')
+JOB_MAX_BANDWIDTH_MB = config_manager.get_float('JOB_QUEUE', 'max_bandwidth_mb')
+POLL_INTERVAL = 5
+MAX_INTERRUPT_COUNT = 3
+
+
+# Variable
+console = Console()
+
+
+def get_job_store() -> JobStore:
+    """Open the job database configured in JOB_QUEUE, relative paths are resolved next to config.json."""
+    path = JOB_DATABASE
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(config_manager.file_path), path)
+
+    return JobStore(path)
+
+
+def get_site(site_name: str) -> Dict:
+    """
+    Find a site in the manifest, raising ValueError if it does not exist or is deprecated.
+    """
+    for site in load_site_manifest():
+        if site['name'] == site_name:
+            if site.get('deprecate'):
+                raise ValueError(f"Site {site_name} is deprecated")
+            return site
+
+    raise ValueError(f"Unknown site: {site_name}")
+
+
+def enqueue(site_name: str, search_terms: str, title_id: Optional[str] = None, season: Optional[str] = None, episode: Optional[str] = None) -> int:
+    """
+    Search a title on a site and add it to the queue, no prompt is shown.
+
+    Parameters:
+        - site_name (str): Name of the site package, e.g. "streamingcommunity".
+        - search_terms (str): Terms used to find the title.
+        - title_id (str, optional): Id of the result to enqueue, the first result if None.
+        - season (str, optional): Season selection, e.g. "1-3". All seasons if None.
+        - episode (str, optional): Episode selection, e.g. "1-5". All episodes if None.
+
+    Returns:
+        int: Id of the new job.
+    """
+    get_site(site_name)
+    database = get_lazy_search(site_name)(search_terms, get_onlyDatabase=True)
+    media_list = database.media_list if database else []
+
+    if title_id is not None:
+        media_list = [media for media in media_list if str(media.id) == str(title_id)]
+
+    if not media_list:
+        raise ValueError(f"No title found on {site_name} for '{search_terms}'" + (f" with id {title_id}" if title_id is not None else ""))
+
+    item = media_list[0].__dict__.copy()
+    job_id = get_job_store().add(site_name, item, season, episode)
+
+    console.print(f"[green]Queued job [cyan]{job_id}[/cyan]: [yellow]{item.get('name')}[/yellow] from [red]{site_name}")
+    return job_id
+
+
+class JobRunner:
+    def __init__(self, store: JobStore, workers: int = JOB_WORKERS, max_attempts: int = JOB_MAX_ATTEMPTS):
+        """
+        Execute the queued jobs on a fixed number of worker slots.
+
+        Parameters:
+            - store (JobStore): Queue to consume.
+            - workers (int): Number of jobs downloaded at the same time.
+            - max_attempts (int): Runs of a job before it is marked as failed.
+        """
+        self.store = store
+        self.workers = max(workers, 1)
+        self.max_attempts = max_attempts
+        self.stop_event = threading.Event()
+
+    def run_job(self, job: Dict) -> None:
+        """
+        Download a job through the site's own search entry point, with every selection given upfront.
+        Site code only prints download errors, so they are collected here and raised to fail the job.
+        """
+        search = get_lazy_search(job['site'])
+        selections = {
+            'season': job['season'] or '*',
+            'episode': job['episode'] or '*'
+        }
+        with collect_download_report() as report:
+            search(direct_item=job['item'], selections=selections)
+
+        if report.failures:
+            raise RuntimeError(f"{len(report.failures)} download(s) failed: {report.summary()}")
+
+    def worker(self, watch: bool) -> None:
+        while not self.stop_event.is_set():
+            job = self.store.claim()
+
+            if job is None:
+                if not watch:
+                    return
+                self.stop_event.wait(POLL_INTERVAL)
+                continue
+
+            name = job['item'].get('name')
+            console.print(f"\n[cyan]Job {job['id']}[/cyan] started: [yellow]{name}[/yellow] from [red]{job['site']}[/red] (attempt {job['attempts']})")
+
+            try:
+                self.run_job(job)
+
+            except Exception as e:
+                if self.stop_event.is_set():
+                    self._requeue(job)
+                    continue
+
+                logging.exception(f"Job {job['id']} failed")
+                status = self.store.fail(job['id'], str(e), self.max_attempts)
+                console.print(f"[red]Job {job['id']} failed ({status}): {e}")
+                continue
+
+            # A stopped download returns normally, the job is not done until a run completes it
+            if self.stop_event.is_set():
+                self._requeue(job)
+            else:
+                self.store.finish(job['id'])
+                console.print(f"[green]Job {job['id']} done: [yellow]{name}")
+
+    def _requeue(self, job: Dict) -> None:
+        self.store.requeue(job['id'])
+        console.print(f"[yellow]Job {job['id']} interrupted, back in the queue")
+
+    def run(self, watch: bool = False) -> None:
+        """
+        Run the queue until it is empty, or forever with `watch`.
+        Jobs interrupted by a previous run are executed again first.
+        """
+        self.store.recover()
+        bandwidth_limiter.set_rate(JOB_MAX_BANDWIDTH_MB * 1024 * 1024)
+
+        # Jobs running together share one budget of segment requests
+        if self.workers > 1:
+            set_global_controller(create_worker_budget())
+
+        threads = [threading.Thread(target=self.worker, args=(watch,), daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+
+        # Ctrl+C is only delivered to the main thread: forward it to the downloads of the running jobs,
+        # which stop gracefully and are requeued by their worker
+        interrupt_count = 0
+        try:
+            while any(thread.is_alive() for thread in threads):
+                try:
+                    time.sleep(0.5)
+
+                except KeyboardInterrupt:
+                    interrupt_count += 1
+                    self.stop_event.set()
+                    interrupt_running_downloads()
+
+                    if interrupt_count >= MAX_INTERRUPT_COUNT:
+                        console.print("\n[red]Queue force stopped, running jobs will be resumed on the next run.")
+                        break
+
+                    console.print(f"\n[yellow]Stopping the queue, running jobs go back to the queue... (Ctrl+C {MAX_INTERRUPT_COUNT - interrupt_count}x to force)")
+
+        finally:
+            set_global_controller(None)
+
+
+def print_jobs(store: JobStore) -> None:
+    """Show the content of the queue."""
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("#", style="dim", width=5)
+    table.add_column("Site", width=20)
+    table.add_column("Title", min_width=20)
+    table.add_column("Season", width=8)
+    table.add_column("Episode", width=8)
+    table.add_column("Status", width=10)
+    table.add_column("Attempts", width=8)
+
+    for job in store.list_jobs():
+        table.add_row(
+            str(job['id']),
+            job['site'],
+            str(job['item'].get('name')),
+            job['season'] or '*',
+            job['episode'] or '*',
+            job['status'],
+            str(job['attempts'])
+        )
+
+    console.print(table)
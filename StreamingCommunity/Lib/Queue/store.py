@@ -0,0 +1,152 @@
+# 18.10.26
+
+import json
+import time
+import sqlite3
+import logging
+from contextlib import closing
+from typing import Dict, List, Optional
+
+
+# Variable
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    site TEXT NOT NULL,
+    item TEXT NOT NULL,
+    season TEXT,
+    episode TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class JobStore:
+    def __init__(self, path: str):
+        """
+        SQLite table of download jobs, shared by every worker slot and kept across restarts.
+
+        Parameters:
+            - path (str): Path of the database file.
+        """
+        self.path = path
+
+        with closing(self._connect()) as conn:
+            conn.execute(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_job(self, row: sqlite3.Row) -> Dict:
+        job = dict(row)
+        job['item'] = json.loads(job['item'])
+        return job
+
+    def add(self, site: str, item: Dict, season: Optional[str] = None, episode: Optional[str] = None) -> int:
+        """
+        Enqueue a title.
+
+        Parameters:
+            - site (str): Name of the site package.
+            - item (Dict): Media item as returned by the site search.
+            - season (str, optional): Season selection, e.g. "1-3" or "*".
+            - episode (str, optional): Episode selection, e.g. "2" or "*".
+
+        Returns:
+            int: Id of the new job.
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (site, item, season, episode, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                (site, json.dumps(item, default=str), season, episode, now, now)
+            )
+            return cursor.lastrowid
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Mark the oldest pending job as running and return it, None if the queue is empty.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated = ? WHERE id = ?",
+                (time.time(), row['id'])
+            )
+            conn.execute("COMMIT")
+
+        except Exception:
+
+            # Nothing to roll back if BEGIN itself failed, e.g. the database stayed locked
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+
+        finally:
+            conn.close()
+
+        job = self._to_job(row)
+        job['attempts'] += 1
+        return job
+
+    def finish(self, job_id: int) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE jobs SET status = 'done', error = NULL, updated = ? WHERE id = ?", (time.time(), job_id))
+
+    def fail(self, job_id: int, error: str, max_attempts: int) -> str:
+        """
+        Record a failed run, the job goes back to pending until it reaches `max_attempts`.
+
+        Returns:
+            str: New status of the job.
+        """
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, error = ?, updated = ? WHERE id = ?",
+                (max_attempts, error, time.time(), job_id)
+            )
+            return conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()['status']
+
+    def requeue(self, job_id: int) -> None:
+        """Put an interrupted job back in the queue, the interrupted run does not count as an attempt."""
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'pending', attempts = MAX(attempts - 1, 0), updated = ? WHERE id = ?",
+                (time.time(), job_id)
+            )
+
+    def recover(self) -> int:
+        """
+        Put back in the queue the jobs left running by a process that did not exit cleanly.
+
+        Returns:
+            int: Number of recovered jobs.
+        """
+        with closing(self._connect()) as conn:
+            cursor = conn.execute("UPDATE jobs SET status = 'pending', updated = ? WHERE status = 'running'", (time.time(),))
+
+        if cursor.rowcount:
+            logging.info(f"Recovered {cursor.rowcount} interrupted jobs")
+        return cursor.rowcount
+
+    def list_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        with closing(self._connect()) as conn:
+            if status:
+                rows = conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,)).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY id").fetchall()
+
+        return [self._to_job(row) for row in rows]
@@ -5,13 +5,13 @@ from typing import Dict
 
 
 # External libraries
-import httpx
 from rich.console import Console
 
 
 # Internal utilities
 from .obj_tmbd import Json_film
 from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
 from StreamingCommunity.Util.table import TVShowManager
 
 
@@ -115,7 +115,7 @@ class TheMovieDB:
 
         params['api_key'] = self.api_key
         url = f"{self.base_url}/{endpoint}"
-        response = httpx.get(url, params=params, timeout=MAX_TIMEOUT)
+        response = http_get(url, params=params, timeout=MAX_TIMEOUT)
         response.raise_for_status()
         
         return response.json()
@@ -3,9 +3,11 @@
 import os
 import sys
 import json
+import time
 import logging
+import threading
 import requests
-from typing import Any, List
+from typing import Any, List, Optional, Tuple
 
 
 # External library
@@ -14,6 +16,7 @@ from rich.console import Console
 
 # Internal utilities
 from StreamingCommunity.Util.headers import get_userAgent
+from StreamingCommunity.Util.os import get_cache_dir
 
 
 # Variable
@@ -44,12 +47,14 @@ class ConfigManager:
         # Initialize file paths
         self.file_path = os.path.join(base_path, file_name)
         self.domains_path = os.path.join(base_path, 'domains.json')
+        self.cache_dir = get_cache_dir()
         
         # Display the actual file path for debugging
         console.print(f"[bold cyan]Configuration file path:[/bold cyan] [green]{self.file_path}[/green]")
         
         # Reference repository URL
         self.reference_config_url = 'https://raw.githubusercontent.com/Arrowar/StreamingCommunity/refs/heads/main/config.json'
+        self.domains_github_url = 'https://raw.githubusercontent.com/Arrowar/StreamingCommunity/refs/heads/main/.github/.domain/domains.json'
         
         # Initialize data structures
         self.config = {}
@@ -59,6 +64,7 @@ class ConfigManager:
         self.use_api = False
         self.download_site_data = False
         self.validate_github_config = False
+        self.remote_config_ttl = 86400
         
         console.print(f"[bold cyan]Initializing ConfigManager:[/bold cyan] [green]{self.file_path}[/green]")
         
@@ -125,26 +131,117 @@ class ConfigManager:
         temp_use_api = default_section.get('use_api', False)
         temp_download_site_data = default_section.get('download_site_data', False)
         temp_validate_github_config = default_section.get('validate_github_config', False)
+        temp_remote_config_ttl = default_section.get('remote_config_ttl', 86400)
         
         # Update settings with found values (False by default)
         self.use_api = temp_use_api
         self.download_site_data = temp_download_site_data
         self.validate_github_config = temp_validate_github_config
+        self.remote_config_ttl = temp_remote_config_ttl
         
         console.print(f"[bold cyan]API Usage:[/bold cyan] [{'green' if self.use_api else 'yellow'}]{self.use_api}[/{'green' if self.use_api else 'yellow'}]")
         console.print(f"[bold cyan]Site data download:[/bold cyan] [{'green' if self.download_site_data else 'yellow'}]{self.download_site_data}[/{'green' if self.download_site_data else 'yellow'}]")
         console.print(f"[bold cyan]GitHub configuration validation:[/bold cyan] [{'green' if self.validate_github_config else 'yellow'}]{self.validate_github_config}[/{'green' if self.validate_github_config else 'yellow'}]")
     
+    def _get_cached_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _read_cached(self, name: str) -> Tuple[Optional[Any], bool]:
+        """
+        Read a remote file previously saved in the cache folder.
+        
+        Args:
+            name (str): File name inside the cache folder
+            
+        Returns:
+            Tuple[Optional[Any], bool]: The parsed content (None if missing or invalid) and whether it is younger than remote_config_ttl
+        """
+        path = self._get_cached_path(name)
+
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+        except (OSError, json.JSONDecodeError):
+            return None, False
+        
+        return data, age < self.remote_config_ttl
+
+    def _write_cached(self, name: str, content: bytes) -> None:
+        """Save a remote file in the cache folder, replacing the old copy at once so readers never see half a file."""
+        path = self._get_cached_path(name)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        except OSError as e:
+            logging.error(f"Cannot write {name} to the cache: {e}")
+
+    def _fetch_remote(self, url: str, name: str) -> Any:
+        """
+        Download a remote JSON file and save it in the cache folder.
+        
+        Args:
+            url (str): URL to download from
+            name (str): File name inside the cache folder
+            
+        Returns:
+            Any: The parsed content
+        """
+        verify = self.config.get('REQUESTS', {}).get('verify', True)
+        response = requests.get(url, timeout=8, headers={'User-Agent': get_userAgent()}, verify=verify)
+
+        if not response.ok:
+            raise Exception(f"HTTP Error: {response.status_code}, Response: {response.text[:100]}")
+        
+        data = response.json()
+        self._write_cached(name, response.content)
+        return data
+
+    def _refresh_in_background(self, url: str, name: str) -> None:
+        """
+        Refresh a cached remote file on a daemon thread, so startup never waits for GitHub.
+        Only the cache is written, the new content is used from the next start.
+        
+        Args:
+            url (str): URL to download from
+            name (str): File name inside the cache folder
+        """
+        def refresh():
+            try:
+                self._fetch_remote(url, name)
+                logging.info(f"Refreshed cached {name}")
+
+            except Exception as e:
+                logging.info(f"Background refresh of {name} failed: {e}")
+
+        threading.Thread(target=refresh, name=f"refresh-{name}", daemon=True).start()
+
     def _download_reference_config(self) -> None:
-        """Download the reference configuration from GitHub."""
+        """Write the reference configuration, from the cache if available, otherwise downloaded from GitHub."""
+        reference_config, _ = self._read_cached('reference_config.json')
+
+        if reference_config is not None:
+            with open(self.file_path, 'w') as f:
+                json.dump(reference_config, f, indent=4)
+            console.print(f"[bold green]Reference configuration restored from cache:[/bold green] {os.path.basename(self.file_path)}")
+            return
+
         console.print(f"[bold cyan]Downloading reference configuration:[/bold cyan] [green]{self.reference_config_url}[/green]")
 
         try:
-            response = requests.get(self.reference_config_url, timeout=8, headers={'User-Agent': get_userAgent()}, verify=self.get_bool('REQUESTS', 'verify'))
+            verify = self.config.get('REQUESTS', {}).get('verify', True)
+            response = requests.get(self.reference_config_url, timeout=8, headers={'User-Agent': get_userAgent()}, verify=verify)
             
             if response.status_code == 200:
                 with open(self.file_path, 'wb') as f:
                     f.write(response.content)
+                self._write_cached('reference_config.json', response.content)
                 file_size = len(response.content) / 1024
                 console.print(f"[bold green]Download complete:[/bold green] {os.path.basename(self.file_path)} ({file_size:.2f} KB)")
             else:
@@ -158,16 +255,22 @@ class ConfigManager:
             raise
     
     def _validate_and_update_config(self) -> None:
-        """Validate the local configuration against the reference one and update missing keys."""
+        """
+        Validate the local configuration against the cached reference one and update missing keys.
+        A stale copy is refreshed in the background and used from the next start, it is downloaded
+        right away only when nothing is cached yet.
+        """
         try:
-            # Download the reference configuration
-            console.print(f"[bold cyan]Validating configuration with GitHub...[/bold cyan]")
-            response = requests.get(self.reference_config_url, timeout=8, headers={'User-Agent': get_userAgent()})
-            
-            if not response.ok:
-                raise Exception(f"Error downloading reference configuration. Code: {response.status_code}")
+            reference_config, fresh = self._read_cached('reference_config.json')
+
+            if reference_config is None:
+                console.print(f"[bold cyan]Downloading reference configuration:[/bold cyan] [green]{self.reference_config_url}[/green]")
+                reference_config = self._fetch_remote(self.reference_config_url, 'reference_config.json')
+
+            elif not fresh:
+                self._refresh_in_background(self.reference_config_url, 'reference_config.json')
             
-            reference_config = response.json()
+            console.print(f"[bold cyan]Validating configuration with reference...[/bold cyan]")
             
             # Compare and update missing keys
             merged_config = self._deep_merge_configs(self.config, reference_config)
@@ -268,25 +371,25 @@ class ConfigManager:
             self._load_site_data_from_file()
     
     def _load_site_data_from_api(self) -> None:
-        """Load site data from GitHub."""
-        domains_github_url = "https://raw.githubusercontent.com/Arrowar/StreamingCommunity/refs/heads/main/.github/.domain/domains.json"
-        headers = {
-            "User-Agent": get_userAgent()
-        }
+        """Load site data from the cached copy of GitHub, downloading it only when nothing is cached yet."""
+        site_data, fresh = self._read_cached('domains.json')
+
+        if site_data is not None:
+            self.configSite = site_data
+
+            site_count = len(self.configSite) if isinstance(self.configSite, dict) else 0
+            console.print(f"[bold green]Site data loaded from cache:[/bold green] {site_count} streaming services found.")
+
+            if not fresh:
+                self._refresh_in_background(self.domains_github_url, 'domains.json')
+            return
         
         try:
             console.print("[bold cyan]Retrieving site data from GitHub:[/bold cyan]")
-            response = requests.get(domains_github_url, timeout=8, headers=headers)
+            self.configSite = self._fetch_remote(self.domains_github_url, 'domains.json')
 
-            if response.ok:
-                self.configSite = response.json()
-                
-                site_count = len(self.configSite) if isinstance(self.configSite, dict) else 0
-                console.print(f"[bold green]Site data loaded from GitHub:[/bold green] {site_count} streaming services found.")
-                
-            else:
-                console.print(f"[bold red]GitHub request failed:[/bold red] HTTP {response.status_code}, {response.text[:100]}")
-                self._handle_site_data_fallback()
+            site_count = len(self.configSite) if isinstance(self.configSite, dict) else 0
+            console.print(f"[bold green]Site data loaded from GitHub:[/bold green] {site_count} streaming services found.")
         
         except json.JSONDecodeError as e:
             console.print(f"[bold red]Error parsing JSON from GitHub:[/bold red] {str(e)}")
@@ -0,0 +1,91 @@
+# 18.10.26
+
+import re
+import json
+import html
+import logging
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+
+# External libraries
+from bs4 import BeautifulSoup
+
+
+# Variable
+ATTRIBUTE_PATTERN = re.compile(r'([^\s/>="\']+)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s>]+))?')
+BODY_PATTERN = re.compile(r'<body\b', re.I)
+SCRIPT_PATTERN = re.compile(r'<script\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>(.*?)</script\s*>', re.I | re.S)
+
+
+@lru_cache(maxsize=None)
+def _start_tag_pattern(tag: str) -> re.Pattern:
+    # Quoted values are skipped as a whole, so a '>' inside an attribute does not end the tag
+    return re.compile(rf'<{tag}\b((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.I)
+
+
+def _parse_attributes(text: str) -> Dict[str, str]:
+    attributes = {}
+    for name, value in ATTRIBUTE_PATTERN.findall(text):
+        if value[:1] in ('"', "'"):
+            value = value[1:-1]
+        attributes.setdefault(name.lower(), html.unescape(value))
+
+    return attributes
+
+
+def find_attribute(page: str, tag: str, attribute: str, **match: str) -> Optional[str]:
+    """
+    Read one attribute of the first `tag` whose attributes equal `match`, scanning only the start tags.
+
+    Parameters:
+        - page (str): Html of the page.
+        - tag (str): Tag name, e.g. "div".
+        - attribute (str): Attribute to read, e.g. "data-page".
+        - **match (str): Attributes the tag must have, e.g. id="app".
+
+    Returns:
+        str: The unescaped attribute value, None if no tag matches.
+    """
+    # Cheap check before looking at every tag of the page
+    if any(value not in page for value in match.values()):
+        return None
+
+    for start_tag in _start_tag_pattern(tag).finditer(page):
+        attributes = _parse_attributes(start_tag.group(1))
+
+        if all(attributes.get(name) == value for name, value in match.items()):
+            return attributes.get(attribute)
+
+    return None
+
+
+def get_body_scripts(page: str) -> List[str]:
+    """
+    Return the content of every <script> inside <body>, like soup.find("body").find_all("script").
+    """
+    body = BODY_PATTERN.search(page)
+    if body is None:
+        return []
+
+    return SCRIPT_PATTERN.findall(page, body.end())
+
+
+def get_inertia_page(page: str) -> Dict:
+    """
+    Return the Inertia page object stored in the `data-page` attribute of div#app.
+
+    Raises:
+        ValueError: If the page has no Inertia data.
+    """
+    data_page = find_attribute(page, 'div', 'data-page', id='app')
+
+    if data_page is None:
+        logging.info("div#app not found by the tag scan, parsing the whole page")
+        app = BeautifulSoup(page, "html.parser").find("div", {"id": "app"})
+        data_page = app.get("data-page") if app is not None else None
+
+    if data_page is None:
+        raise ValueError("Inertia data-page not found")
+
+    return json.loads(data_page)
@@ -0,0 +1,216 @@
+# 18.10.26
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import closing
+from typing import Dict, Optional
+
+
+# External libraries
+import httpx
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+from StreamingCommunity.Util.http_client import http_get
+from StreamingCommunity.Util.os import get_cache_dir
+
+
+# Config
+CACHE_ENABLED = config_manager.get_bool('HTTP_CACHE', 'enabled')
+CACHE_MAX_SIZE_MB = config_manager.get_float('HTTP_CACHE', 'max_size_mb')
+CACHE_TTL = config_manager.get_dict('HTTP_CACHE', 'ttl')
+
+
+# Variable
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+IGNORED_REQUEST_HEADERS = ('user-agent', 'sec-ch-ua')
+DROPPED_RESPONSE_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'set-cookie'}
+
+
+class HttpCache:
+    def __init__(self, path: str, max_size: int):
+        """
+        SQLite store of GET responses, revalidated with ETag/Last-Modified and evicted least recently used first.
+
+        Parameters:
+            - path (str): Path of the database file.
+            - max_size (int): Maximum size in bytes of the stored bodies.
+        """
+        self.path = path
+        self.max_size = max_size
+
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def make_key(url: str, headers: Dict[str, str]) -> str:
+        """
+        Key of a request, the random browser fingerprint headers are left out so it does not change between runs.
+        """
+        parts = [url] + sorted(f"{name.lower()}:{value}" for name, value in headers.items() if not name.lower().startswith(IGNORED_REQUEST_HEADERS))
+        return hashlib.sha1("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def load(self, key: str) -> Optional[sqlite3.Row]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key))
+            return row
+
+    def refresh(self, key: str) -> None:
+        """Mark an entry as fresh again after the server answered 304."""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("UPDATE responses SET stored = ?, accessed = ? WHERE key = ?", (now, now, key))
+
+    def save(self, key: str, response: httpx.Response) -> None:
+        body = response.content
+        if len(body) > self.max_size:
+            return
+
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_RESPONSE_HEADERS}
+        now = time.time()
+
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, status, headers, body, size, etag, last_modified, stored, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(response.url), response.status_code, json.dumps(headers), body, len(body),
+                 response.headers.get('etag'), response.headers.get('last-modified'), now, now)
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY accessed").fetchall()
+        for row in rows:
+            if total <= self.max_size:
+                break
+
+            conn.execute("DELETE FROM responses WHERE key = ?", (row['key'],))
+            total -= row['size']
+
+    def invalidate(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("VACUUM")
+
+    @staticmethod
+    def to_response(row: sqlite3.Row) -> httpx.Response:
+        return httpx.Response(
+            status_code=row['status'],
+            headers=json.loads(row['headers']),
+            content=row['body'],
+            request=httpx.Request('GET', row['url'])
+        )
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache:
+    """Return the cache shared by every site, stored in the cache folder."""
+    global _http_cache
+
+    with _http_cache_lock:
+        if _http_cache is None:
+            _http_cache = HttpCache(os.path.join(get_cache_dir(), 'http_cache.db'), int(CACHE_MAX_SIZE_MB * 1024 * 1024))
+        return _http_cache
+
+
+def cached_get(url: str, endpoint: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None, **kwargs) -> httpx.Response:
+    """
+    GET a page through the on-disk cache.
+
+    Parameters:
+        - url (str): Url to request.
+        - endpoint (str): Class of the page, its time to live is read from HTTP_CACHE.ttl, e.g. "search", "title", "season".
+        - params (Dict, optional): Query parameters.
+        - headers (Dict, optional): Request headers.
+        - **kwargs: Other arguments of httpx.get, e.g. timeout, proxy, follow_redirects.
+
+    Returns:
+        httpx.Response: The stored response while it is fresh, otherwise the one from the server.
+    """
+    headers = dict(headers or {})
+    ttl = CACHE_TTL.get(endpoint, 0)
+
+    if not CACHE_ENABLED or ttl <= 0:
+        return http_get(url, params=params, headers=headers, **kwargs)
+
+    full_url = str(httpx.URL(url, params=params))
+    cache = get_http_cache()
+    key = cache.make_key(full_url, headers)
+
+    try:
+        row = cache.load(key)
+    except sqlite3.Error as e:
+        logging.error(f"Cannot read http cache: {e}")
+        row = None
+
+    if row is not None:
+        if time.time() - row['stored'] < ttl:
+            logging.info(f"Http cache hit: {full_url}")
+            return cache.to_response(row)
+
+        # Stale entry, ask the server if it changed
+        if row['etag']:
+            headers['if-none-match'] = row['etag']
+        if row['last_modified']:
+            headers['if-modified-since'] = row['last_modified']
+
+    response = http_get(full_url, headers=headers, **kwargs)
+
+    try:
+        if response.status_code == 304 and row is not None:
+            logging.info(f"Http cache revalidated: {full_url}")
+            cache.refresh(key)
+            return cache.to_response(row)
+
+        if response.status_code == 200 and 'no-store' not in response.headers.get('cache-control', ''):
+            cache.save(key, response)
+
+    except sqlite3.Error as e:
+        logging.error(f"Cannot write http cache: {e}")
+
+    return response
+
+
+def invalidate_cached(url: str, params: Optional[Dict] = None, headers: Optional[Dict[str, str]] = None) -> None:
+    """Drop the stored response of a request, e.g. when the page turns out to be outdated."""
+    if CACHE_ENABLED:
+        cache = get_http_cache()
+        cache.invalidate(cache.make_key(str(httpx.URL(url, params=params)), dict(headers or {})))
@@ -0,0 +1,173 @@
+# 18.10.26
+
+import atexit
+import logging
+import threading
+from functools import lru_cache
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Dict, Optional, Tuple
+
+
+# External libraries
+import httpx
+
+
+# Internal utilities
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+REQUEST_TIMEOUT = config_manager.get_int('REQUESTS', 'timeout')
+REQUEST_VERIFY = config_manager.get_bool('REQUESTS', 'verify')
+REQUEST_HTTP2 = config_manager.get_bool('REQUESTS', 'http2')
+POOL_MAX_CONNECTIONS = config_manager.get_int('REQUESTS', 'max_connections_per_host')
+POOL_KEEPALIVE_EXPIRY = config_manager.get_float('REQUESTS', 'keepalive_expiry')
+
+
+# Variable
+_clients: Dict[Tuple, httpx.Client] = {}
+_clients_lock = threading.Lock()
+_impersonated = threading.local()
+
+
+@lru_cache(maxsize=None)
+def http2_available() -> bool:
+    """Check if the optional 'h2' package required by httpx for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        logging.warning("HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+        return False
+
+
+def _no_cookie_jar() -> CookieJar:
+    """
+    Jar refusing every cookie set by the servers: shared clients stay stateless like httpx.get,
+    cookies passed to a request are still sent and `response.cookies` is still filled.
+    """
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+def get_http_client(url: str, proxy: Optional[str] = None, verify: bool = REQUEST_VERIFY) -> httpx.Client:
+    """
+    Return the pooled client for the host of `url`, created on first use and kept until exit.
+
+    Parameters:
+        - url (str): Url that will be requested, only its scheme and host are used.
+        - proxy (str, optional): Proxy the client goes through.
+        - verify (bool): Verify SSL certificates.
+
+    Returns:
+        httpx.Client: Client shared by every module requesting the same host with the same proxy.
+    """
+    parsed = httpx.URL(url)
+    key = (parsed.scheme, parsed.host, parsed.port, proxy or None, verify)
+
+    with _clients_lock:
+        client = _clients.get(key)
+
+        if client is None:
+            client = httpx.Client(
+                timeout=REQUEST_TIMEOUT,
+                verify=verify,
+                proxy=proxy or None,
+                http2=REQUEST_HTTP2 and http2_available(),
+                cookies=_no_cookie_jar(),
+                limits=httpx.Limits(
+                    max_connections=POOL_MAX_CONNECTIONS,
+                    max_keepalive_connections=POOL_MAX_CONNECTIONS,
+                    keepalive_expiry=POOL_KEEPALIVE_EXPIRY
+                )
+            )
+            _clients[key] = client
+            logging.info(f"New http client for {parsed.scheme}://{parsed.host}" + (f" via {proxy}" if proxy else ""))
+
+        return client
+
+
+def http_request(method: str, url: str, proxy: Optional[str] = None, verify: bool = REQUEST_VERIFY, **kwargs) -> httpx.Response:
+    """
+    Send a request on the pooled client of its host, a drop-in replacement of httpx.request.
+
+    Parameters:
+        - method (str): HTTP method.
+        - url (str): Url to request.
+        - proxy (str, optional): Proxy to use.
+        - verify (bool): Verify SSL certificates.
+        - **kwargs: Other arguments of httpx.request, e.g. headers, cookies, params, timeout, follow_redirects.
+    """
+    # httpx deprecates per-request cookies on a client, so they are sent as a plain Cookie header
+    cookies = kwargs.pop('cookies', None)
+    if cookies:
+        cookie_header = '; '.join(f"{name}={value}" for name, value in dict(cookies).items())
+        kwargs['headers'] = {**(kwargs.get('headers') or {}), 'Cookie': cookie_header}
+
+    return get_http_client(url, proxy=proxy, verify=verify).request(method, url, **kwargs)
+
+
+def http_get(url: str, **kwargs) -> httpx.Response:
+    return http_request('GET', url, **kwargs)
+
+
+def http_post(url: str, **kwargs) -> httpx.Response:
+    return http_request('POST', url, **kwargs)
+
+
+def get_impersonated_session(profile: str, proxy: Optional[str] = None):
+    """
+    Return a curl_cffi session impersonating a browser, e.g. "chrome120".
+    Sessions are not thread safe, so each thread keeps its own per profile and proxy.
+    """
+    from curl_cffi import requests
+
+    sessions = getattr(_impersonated, 'sessions', None)
+    if sessions is None:
+        sessions = _impersonated.sessions = {}
+
+    key = (profile, proxy or None)
+    if key not in sessions:
+        proxies = {'http': proxy, 'https': proxy} if proxy else None
+        sessions[key] = requests.Session(impersonate=profile, proxies=proxies, timeout=REQUEST_TIMEOUT)
+
+    return sessions[key]
+
+
+def impersonated_get(url: str, profile: str, proxy: Optional[str] = None, **kwargs):
+    """
+    GET with the pooled session of an impersonation profile, a drop-in replacement of curl_cffi requests.get.
+    Cookies of previous requests are dropped so the server hands out new ones, as with a new session.
+    """
+    session = get_impersonated_session(profile, proxy)
+    session.cookies.clear()
+    return session.get(url, **kwargs)
+
+
+def get_pool_status() -> Dict[str, Dict]:
+    """
+    Read-only view of the shared clients and the limits they were created with.
+
+    Returns:
+        Dict[str, Dict]: Settings of each live client, keyed by host (and proxy).
+    """
+    status = {}
+    with _clients_lock:
+        for (scheme, host, port, proxy, verify), client in _clients.items():
+            name = f"{scheme}://{host}" + (f":{port}" if port else "") + (f" via {proxy}" if proxy else "")
+            status[name] = {
+                'verify': verify,
+                'http2': REQUEST_HTTP2 and http2_available(),
+                'max_connections': POOL_MAX_CONNECTIONS,
+                'keepalive_expiry': POOL_KEEPALIVE_EXPIRY,
+                'closed': client.is_closed
+            }
+
+    return status
+
+
+@atexit.register
+def close_http_clients() -> None:
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
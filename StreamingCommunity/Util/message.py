@@ -2,6 +2,7 @@
 
 import os
 import platform
+import threading
 
 
 # External library
@@ -20,6 +21,10 @@ SHOW = config_manager.get_bool('DEFAULT', 'show_message')
 
 def start_message():
     """Display a stylized start message in the console."""
+
+    # Episodes downloaded at the same time run off the main thread and share the screen
+    if threading.current_thread() is not threading.main_thread():
+        return
     
     msg = r'''
     ___                                                  _____ __                            _            
@@ -454,8 +454,9 @@ class OsSummary:
 
                 # Set executable permissions if needed
                 if system != 'windows':
-                    os.chmod(self.ffmpeg_path, 0o755)
-                    os.chmod(self.ffprobe_path, 0o755)
+                    for binary_path in (self.ffmpeg_path, self.ffprobe_path):
+                        if not os.access(binary_path, os.X_OK):
+                            os.chmod(binary_path, 0o755)
             else:
                 self.ffmpeg_path, self.ffprobe_path, self.ffplay_path = check_ffmpeg()
         else:
@@ -512,3 +513,14 @@ def get_ffmpeg_path():
 def get_ffprobe_path():
     """Returns the path of FFprobe."""
     return os_summary.ffprobe_path
+
+def get_cache_dir() -> str:
+    """Returns the folder used for on-disk caches, next to config.json, also used by `config_manager.cache_dir`."""
+    if getattr(sys, 'frozen', False):
+        base_path = os.path.dirname(sys.executable)
+    else:
+        base_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    cache_dir = os.path.join(base_path, '.cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
@@ -1,11 +1,9 @@
 # 17.03.25
 
-import os
-import sys
 import time
-import glob
 import logging
-import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
 
 
 # External library
@@ -17,6 +15,12 @@ from rich.progress import Progress
 
 # Internal utilities
 from StreamingCommunity.Util.message import start_message
+from StreamingCommunity.Api.Template.registry import load_site_manifest, get_lazy_search, import_site
+from StreamingCommunity.Util.config_json import config_manager
+
+
+# Config
+GLOBAL_SEARCH_TIMEOUT = config_manager.get_int('DEFAULT', 'global_search_timeout')
 
 
 # Variable
@@ -26,69 +30,19 @@ msg = Prompt()
 
 # !!! DA METTERE IN COMUNE CON QUELLA DI RUN
 def load_search_functions():
-    modules = []
     loaded_functions = {}
-    excluded_sites = set()
-
-    # Find api home directory
-    if getattr(sys, 'frozen', False):  # Modalità PyInstaller
-        base_path = os.path.join(sys._MEIPASS, "StreamingCommunity")
-    else:
-        base_path = os.path.dirname(__file__)
-
-    api_dir = os.path.join(base_path, 'Api', 'Site')
-    init_files = glob.glob(os.path.join(api_dir, '*', '__init__.py'))
-
-    # Retrieve modules and their indices
-    for init_file in init_files:
-
-        # Get folder name as module name
-        module_name = os.path.basename(os.path.dirname(init_file))
-
-        # Se il modulo è nella lista da escludere, saltalo
-        if module_name in excluded_sites:
-            continue
 
+    # Sites are read from the cached manifest and imported only when searched
+    for site in load_site_manifest():
+        module_name = site['name']
         logging.info(f"Load module name: {module_name}")
 
-        try:
-            # Dynamically import the module
-            mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
-
-            # Get 'indice' from the module
-            indice = getattr(mod, 'indice', 0)
-            use_for = getattr(mod, '_useFor', 'other')
-            priority = getattr(mod, '_priority', 0)
-
-            if priority == 0:
-                if not getattr(mod, '_deprecate'):
-                    modules.append((module_name, indice, use_for))
-
-        except Exception as e:
-            console.print(f"[red]Failed to import module {module_name}: {str(e)}")
-
-    # Sort modules by 'indice'
-    modules.sort(key=lambda x: x[1])
-
-    # Load search functions in the sorted order
-    for module_name, _, use_for in modules:
+        if site.get('priority', 0) != 0 or site.get('deprecate'):
+            continue
 
         # Construct a unique alias for the module
         module_alias = f'{module_name}_search'
-
-        try:
-
-            # Dynamically import the module
-            mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
-
-            # Get the search function from the module (assuming the function is named 'search' and defined in __init__.py)
-            search_function = getattr(mod, 'search')
-
-            # Add the function to the loaded functions dictionary
-            loaded_functions[module_alias] = (search_function, use_for)
-
-        except Exception as e:
-            console.print(f"[red]Failed to load search function from module {module_name}: {str(e)}")
+        loaded_functions[module_alias] = (get_lazy_search(module_name), site.get('use_for', 'other'))
 
     return loaded_functions
 
@@ -155,6 +109,8 @@ def global_search(search_terms: str = None, selected_sites: list = None):
             selected_indices = [int(c.strip())-1 for c in site_choices.split(",")]
             selected_sites = [list(search_functions.keys())[i] for i in selected_indices if i < len(search_functions)]
     
+    selected_sites = warm_up_sites(selected_sites)
+
     # Display progress information
     console.print(f"\n[bold green]Searching for:[/bold green] [yellow]{search_terms}[/yellow]")
     console.print(f"[bold green]Searching across:[/bold green] {len(selected_sites)} sites \n")
@@ -162,38 +118,41 @@ def global_search(search_terms: str = None, selected_sites: list = None):
     with Progress() as progress:
         search_task = progress.add_task("[cyan]Searching...", total=len(selected_sites))
         
-        # Search each selected site
-        for alias in selected_sites:
-            site_name = alias.split("_")[0].capitalize()
-            progress.update(search_task, description=f"[cyan]Searching {site_name}...")
-            
-            func, _ = search_functions[alias]
-            try:
-                # Call the search function with get_onlyDatabase=True to get database object
-                database = func(search_terms, get_onlyDatabase=True)
-                
-                # Check if database has media_list attribute and it's not empty
-                if database and hasattr(database, 'media_list') and len(database.media_list) > 0:
-                    # Store media_list items with additional source information
-                    all_results[alias] = []
-                    for element in database.media_list:
-                        # Convert element to dictionary if it's an object
-                        if hasattr(element, '__dict__'):
-                            item_dict = element.__dict__.copy()
-                        else:
-                            item_dict = {}  # Fallback for non-object items
-                        
-                        # Add source information
-                        item_dict['source'] = site_name
-                        item_dict['source_alias'] = alias
-                        all_results[alias].append(item_dict)
-                        
-                    console.print(f"\n[green]Found {len(database.media_list)} results from {site_name}")
-
-            except Exception as e:
-                console.print(f"[bold red]Error searching {site_name}:[/bold red] {str(e)}")
-            
-            progress.update(search_task, advance=1)
+        # Query every selected site at the same time, each one has GLOBAL_SEARCH_TIMEOUT seconds to answer
+        stop_event = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=max(len(selected_sites), 1))
+        futures = {
+            executor.submit(search_site, search_functions[alias][0], alias, search_terms, stop_event): alias
+            for alias in selected_sites
+        }
+
+        try:
+            for future in as_completed(futures, timeout=GLOBAL_SEARCH_TIMEOUT):
+                alias = futures[future]
+                site_name = alias.split("_")[0].capitalize()
+
+                try:
+                    results = future.result()
+                    if results:
+                        all_results[alias] = results
+                        console.print(f"\n[green]Found {len(results)} results from {site_name}")
+
+                except Exception as e:
+                    console.print(f"[bold red]Error searching {site_name}:[/bold red] {str(e)}")
+
+                progress.update(search_task, advance=1, description=f"[cyan]Searched {site_name}...")
+
+        except TimeoutError:
+            stop_event.set()
+            pending = [alias.split("_")[0].capitalize() for future, alias in futures.items() if not future.done()]
+            console.print(f"\n[yellow]No answer within {GLOBAL_SEARCH_TIMEOUT}s from: {', '.join(pending)}, showing partial results")
+
+        finally:
+            stop_event.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    # Keep the site order of the selection, not the order of arrival
+    all_results = {alias: all_results[alias] for alias in selected_sites if alias in all_results}
     
     # Display the consolidated results
     if all_results:
@@ -220,6 +179,72 @@ def global_search(search_terms: str = None, selected_sites: list = None):
     
     return all_results
 
+def warm_up_sites(selected_sites: list) -> list:
+    """
+    Import the selected sites one at a time before searching them in parallel, so the threads
+    never race on the first import of the modules the sites share.
+    
+    Parameters:
+        selected_sites (list): Aliases of the sites to search.
+    
+    Returns:
+        list: The aliases of the sites that could be imported.
+    """
+    loaded_sites = []
+
+    for alias in selected_sites:
+        try:
+            import_site(alias[:-len('_search')])
+            loaded_sites.append(alias)
+
+        except Exception as e:
+            console.print(f"[bold red]Cannot load {alias.split('_')[0].capitalize()}:[/bold red] {str(e)}")
+            logging.exception(f"Import of {alias} failed")
+
+    return loaded_sites
+
+def search_site(func, alias: str, search_terms: str, stop_event: threading.Event = None) -> list:
+    """
+    Search a single site and convert its results to dictionaries tagged with their source.
+    
+    Parameters:
+        func (callable): The search function of the site.
+        alias (str): The alias of the site.
+        search_terms (str): The terms to search for.
+        stop_event (threading.Event, optional): Set once the global search stopped waiting, late results are discarded.
+    
+    Returns:
+        list: The media items found, empty if none.
+    """
+    site_name = alias.split("_")[0].capitalize()
+    results = []
+
+    if stop_event is not None and stop_event.is_set():
+        return results
+
+    # Call the search function with get_onlyDatabase=True to get database object
+    database = func(search_terms, get_onlyDatabase=True)
+
+    if stop_event is not None and stop_event.is_set():
+        logging.info(f"Discarding late results of {site_name}")
+        return results
+    
+    # Check if database has media_list attribute and it's not empty
+    if database and hasattr(database, 'media_list') and len(database.media_list) > 0:
+        for element in database.media_list:
+            # Convert element to dictionary if it's an object
+            if hasattr(element, '__dict__'):
+                item_dict = element.__dict__.copy()
+            else:
+                item_dict = {}  # Fallback for non-object items
+            
+            # Add source information
+            item_dict['source'] = site_name
+            item_dict['source_alias'] = alias
+            results.append(item_dict)
+
+    return results
+
 def display_consolidated_results(all_media_items, search_terms):
     """
     Display consolidated search results from multiple sites.
@@ -3,11 +3,9 @@
 import os
 import sys
 import time
-import glob
 import logging
 import platform
 import argparse
-import importlib
 import threading, asyncio
 from urllib.parse import urlparse
 from typing import Callable
@@ -21,11 +19,13 @@ from rich.prompt import Prompt
 # Internal utilities
 from .global_search import global_search
 from StreamingCommunity.Util.message import start_message
+from StreamingCommunity.Api.Template.registry import load_site_manifest, get_lazy_search
 from StreamingCommunity.Util.config_json import config_manager
 from StreamingCommunity.Util.os import os_summary, internet_manager
 from StreamingCommunity.Util.logger import Logger
 from StreamingCommunity.Upload.update import update as git_update
 from StreamingCommunity.Lib.TMBD import tmdb
+from StreamingCommunity.Lib.Queue import JobRunner, enqueue, get_job_store, print_jobs
 from StreamingCommunity.TelegramHelp.telegram_bot import get_bot_instance, TelegramSession
 
 
@@ -58,69 +58,24 @@ def run_function(func: Callable[..., None], close_console: bool = False, search_
 
 # !!! DA METTERE IN COMUNE CON QUELLA DI GLOBAL
 def load_search_functions():
-    modules = []
     loaded_functions = {}
 
     # Lista dei siti da escludere se TELEGRAM_BOT è attivo
     excluded_sites = {"cb01new", "guardaserie", "ilcorsaronero", "mostraguarda"} if TELEGRAM_BOT else set()
 
-    # Find api home directory
-    if getattr(sys, 'frozen', False):  # Modalità PyInstaller
-        base_path = os.path.join(sys._MEIPASS, "StreamingCommunity")
-    else:
-        base_path = os.path.dirname(__file__)
-
-    api_dir = os.path.join(base_path, 'Api', 'Site')
-    init_files = glob.glob(os.path.join(api_dir, '*', '__init__.py'))
-
-    # Retrieve modules and their indices
-    for init_file in init_files:
-
-        # Get folder name as module name
-        module_name = os.path.basename(os.path.dirname(init_file))
+    # Sites are read from the cached manifest, already sorted by 'indice', and imported only when searched
+    for site in load_site_manifest():
+        module_name = site['name']
 
         # Se il modulo è nella lista da escludere, saltalo
-        if module_name in excluded_sites:
+        if module_name in excluded_sites or site.get('deprecate'):
             continue
 
         logging.info(f"Load module name: {module_name}")
 
-        try:
-            # Dynamically import the module
-            mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
-
-            # Get 'indice' from the module
-            indice = getattr(mod, 'indice')
-            use_for = getattr(mod, '_useFor')
-
-            if not getattr(mod, '_deprecate'):
-                modules.append((module_name, indice, use_for))
-
-        except Exception as e:
-            console.print(f"[red]Failed to import module {module_name}: {str(e)}")
-
-    # Sort modules by 'indice'
-    modules.sort(key=lambda x: x[1])
-
-    # Load search functions in the sorted order
-    for module_name, _, use_for in modules:
-
         # Construct a unique alias for the module
         module_alias = f'{module_name}_search'
-
-        try:
-
-            # Dynamically import the module
-            mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
-
-            # Get the search function from the module (assuming the function is named 'search' and defined in __init__.py)
-            search_function = getattr(mod, 'search')
-
-            # Add the function to the loaded functions dictionary
-            loaded_functions[module_alias] = (search_function, use_for)
-
-        except Exception as e:
-            console.print(f"[red]Failed to load search function from module {module_name}: {str(e)}")
+        loaded_functions[module_alias] = (get_lazy_search(module_name), site.get('use_for', 'other'))
 
     return loaded_functions
 
@@ -283,6 +238,19 @@ def main(script_id = 0):
         '--category', type=int, help='Select category directly (1: anime, 2: film_&_serie, 3: serie, 4: torrent).'
     )
 
+    # Add download queue arguments
+    parser.add_argument(
+        '--enqueue', action='store_true', help='Search a title on --site and add it to the download queue.'
+    )
+    parser.add_argument('--site', type=str, help='Site used by --enqueue (e.g., streamingcommunity).')
+    parser.add_argument('--title_id', type=str, help='Id of the search result to enqueue (default: first result).')
+    parser.add_argument('--season', type=str, help='Seasons to enqueue (e.g., 1-3, default: all).')
+    parser.add_argument('--episode', type=str, help='Episodes to enqueue (e.g., 1-5, default: all).')
+    parser.add_argument(
+        '--run_queue', action='store_true', help='Download the queued jobs without prompts until the queue is empty.'
+    )
+    parser.add_argument('--queue_status', action='store_true', help='Show the jobs in the download queue.')
+
     # Add arguments for search functions
     parser.add_argument('-s', '--search', default=None, help='Search terms')
     
@@ -318,15 +286,36 @@ def main(script_id = 0):
         global_search(search_terms)
         return
 
+    # Check if the download queue is requested
+    if args.enqueue:
+        if not args.site or not search_terms:
+            console.print("[red]--enqueue requires --site and -s")
+            return
+
+        try:
+            enqueue(args.site, search_terms, args.title_id, args.season, args.episode)
+        except ValueError as e:
+            console.print(f"[red]{e}")
+        return
+
+    if args.run_queue:
+        JobRunner(get_job_store()).run()
+        return
+
+    if args.queue_status:
+        print_jobs(get_job_store())
+        return
+
     # Create mappings using module indice
     input_to_function = {}
     choice_labels = {}
     
+    site_indices = {site['name']: site.get('indice') for site in load_site_manifest()}
+
     for alias, (func, use_for) in search_functions.items():
         module_name = alias.split("_")[0]
         try:
-            mod = importlib.import_module(f'StreamingCommunity.Api.Site.{module_name}')
-            site_index = str(getattr(mod, 'indice'))
+            site_index = str(site_indices[module_name])
             input_to_function[site_index] = func
             choice_labels[site_index] = (module_name.capitalize(), use_for.lower())
         except Exception as e:
@@ -0,0 +1,104 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+# Import
+import json
+import html
+import time
+import argparse
+from bs4 import BeautifulSoup
+from StreamingCommunity.Util.html_extract import get_inertia_page, get_body_scripts
+
+
+# Fixtures
+def build_title_page(episodes: int = 1500) -> str:
+    """Page shaped like a streamingcommunity title page: a big escaped Inertia object in div#app and a lot of markup."""
+    data = {
+        'component': 'Titles/Title',
+        'version': '7b8d3f0c2a1e4d5f',
+        'props': {
+            'title': {
+                'id': 1234, 'name': 'Show', 'type': 'tv',
+                'plot': 'A <b>long</b> plot with "quotes" & symbols. ' * 20,
+                'seasons': [{'id': i, 'number': i, 'slug': f'season-{i}'} for i in range(1, 11)],
+            },
+            'loadedSeason': {
+                'episodes': [{'id': i, 'number': i, 'name': f'Episode {i} > "pilot"', 'plot': 'Lorem ipsum dolor sit amet. ' * 5} for i in range(episodes)]
+            }
+        }
+    }
+    menu = ''.join(f'<li class="item"><a href="/titles/{i}-show" title="Show {i}"><img src="/img/{i}.webp" alt="Show {i}"></a></li>' for i in range(400))
+    return (
+        '<!DOCTYPE html><html lang="it"><head><meta charset="utf-8"><title>Show</title>'
+        '<script>window.dataLayer = [];</script></head><body>'
+        f'<nav><ul>{menu}</ul></nav>'
+        f'<div id="app" data-page="{html.escape(json.dumps(data))}"></div>'
+        f'<footer><ul>{menu}</ul></footer></body></html>'
+    )
+
+
+def build_embed_page() -> str:
+    """Page shaped like a vixcloud embed: a head full of assets and the player scripts in the body."""
+    assets = ''.join(f'<link rel="preload" href="/build/assets/chunk-{i}.js" as="script">' for i in range(300))
+    return (
+        f'<!DOCTYPE html><html><head>{assets}<script src="/build/app.js"></script></head><body>'
+        '<script>window.video = {"id":271977,"name":"Smile 2"}; window.masterPlaylist = {params: {"token": "abc", "expires": "1737812156"}, url: "https://vixcloud.co/playlist/271977?b=1"}; if (a < b && c > d) {}</script>'
+        "<script>window.downloadUrl = 'https://vixcloud.co/download/271977'</script>"
+        '<div id="player"></div></body></html>'
+    )
+
+
+# Paths
+def bs4_inertia(page: str) -> dict:
+    return json.loads(BeautifulSoup(page, "html.parser").find("div", {"id": "app"}).get("data-page"))
+
+
+def bs4_scripts(page: str) -> list:
+    return [script.text for script in BeautifulSoup(page, "html.parser").find("body").find_all("script")]
+
+
+def bench(name: str, func, page: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(page)
+    elapsed = (time.perf_counter() - start) / repeat * 1000
+    print(f"  {name:<12} {elapsed:9.2f} ms")
+    return elapsed
+
+
+def run(pages: dict, repeat: int) -> None:
+    for name, (kind, page) in pages.items():
+        slow, fast = (bs4_inertia, get_inertia_page) if kind == 'inertia' else (bs4_scripts, get_body_scripts)
+
+        # Both paths must read the same data
+        assert slow(page) == fast(page), f"{name}: extracted data differs"
+
+        print(f"{name} ({len(page) / 1024:.0f} KB)")
+        bs4_time = bench("bs4", slow, page, repeat)
+        scan_time = bench("tag scan", fast, page, repeat)
+        print(f"  speedup      {bs4_time / scan_time:9.1f}x\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the BeautifulSoup extraction with the tag scan of Util.html_extract")
+    parser.add_argument('--inertia', nargs='*', default=[], help="Saved pages with a div#app data-page")
+    parser.add_argument('--embed', nargs='*', default=[], help="Saved pages with player scripts in the body")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = {
+        'title page fixture': ('inertia', build_title_page()),
+        'embed page fixture': ('scripts', build_embed_page()),
+    }
+    for kind, paths in (('inertia', args.inertia), ('scripts', args.embed)):
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages[os.path.basename(path)] = (kind, f.read())
+
+    run(pages, args.repeat)
@@ -0,0 +1,71 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import io
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from StreamingCommunity.Lib.FFmpeg.capture import capture_ffmpeg_real_time
+
+# Stands in for ffmpeg: writes the '-progress pipe:1' stream it is asked for, then exits with the given code
+FAKE_FFMPEG = """#!{python}
+import sys
+for i in range(1, 4):
+    print(f"out_time_us={{i}}000000\\ntotal_size={{i}}00000\\nspeed=2.5x\\nprogress=continue", flush=True)
+print("out_time_us=4000000\\ntotal_size=400000\\nspeed=3x\\nprogress=end", flush=True)
+sys.exit(int(sys.argv[-1]))
+"""
+
+class TestCaptureProgress(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.temp_dir, 'fake_ffmpeg.py')
+        with open(self.script, 'w') as f:
+            f.write(FAKE_FFMPEG.format(python=sys.executable))
+        os.chmod(self.script, 0o755)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def run_fake(self, return_code=0, on_progress=None, show_progress=True):
+        # capture_ffmpeg_real_time inserts its options after the first element of the command
+        return capture_ffmpeg_real_time([self.script, str(return_code)], "Test", on_progress, show_progress)
+
+    def test_caller_receives_every_event(self):
+        events = []
+        self.assertEqual(self.run_fake(on_progress=events.append), 0)
+
+        self.assertEqual([event.out_time for event in events], [1.0, 2.0, 3.0, 4.0])
+        self.assertEqual([event.total_size for event in events], [100000, 200000, 300000, 400000])
+        self.assertEqual(events[0].speed, 2.5)
+        self.assertEqual([event.finished for event in events], [False, False, False, True])
+        self.assertEqual(events[0].description, "Test")
+
+    def test_failing_callback_does_not_stop_capture(self):
+        def callback(progress):
+            raise RuntimeError("broken consumer")
+
+        self.assertEqual(self.run_fake(on_progress=callback), 0)
+
+    def test_hidden_progress_still_forwards_events(self):
+        events = []
+        with patch('sys.stdout', new_callable=io.StringIO) as stdout:
+            self.assertEqual(self.run_fake(on_progress=events.append, show_progress=False), 0)
+
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertEqual(len(events), 4)
+
+    def test_return_code(self):
+        self.assertEqual(self.run_fake(return_code=3), 3)
+
+if __name__ == '__main__':
+    unittest.main()
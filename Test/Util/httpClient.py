@@ -0,0 +1,46 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import unittest
+from StreamingCommunity.Util import http_client
+from StreamingCommunity.Util.http_client import get_http_client, get_pool_status, close_http_clients
+
+class TestPoolStatus(unittest.TestCase):
+    def tearDown(self):
+        close_http_clients()
+
+    def test_empty(self):
+        close_http_clients()
+        self.assertEqual(get_pool_status(), {})
+
+    def test_one_client_per_host(self):
+        first = get_http_client('https://example.org/a')
+        self.assertIs(get_http_client('https://example.org/b?c=1'), first)
+        get_http_client('https://example.com/')
+        get_http_client('https://example.com/', proxy='http://127.0.0.1:3128')
+
+        status = get_pool_status()
+        self.assertEqual(sorted(status), ['https://example.com', 'https://example.com via http://127.0.0.1:3128', 'https://example.org'])
+
+        client = status['https://example.org']
+        self.assertEqual(client['max_connections'], http_client.POOL_MAX_CONNECTIONS)
+        self.assertEqual(client['keepalive_expiry'], http_client.POOL_KEEPALIVE_EXPIRY)
+        self.assertFalse(client['closed'])
+
+    def test_status_is_a_copy(self):
+        get_http_client('https://example.org/')
+        get_pool_status()['https://example.org']['max_connections'] = 0
+        get_pool_status().clear()
+
+        self.assertEqual(get_pool_status()['https://example.org']['max_connections'], http_client.POOL_MAX_CONNECTIONS)
+
+if __name__ == '__main__':
+    unittest.main()
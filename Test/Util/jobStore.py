@@ -0,0 +1,154 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from StreamingCommunity.Lib.Queue import JobStore, JobRunner
+from StreamingCommunity.Lib.Downloader import record_download_failure
+
+class TestJobStore(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = JobStore(os.path.join(self.temp_dir, 'jobs.db'))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def add_job(self, name='Title', season=None, episode=None):
+        return self.store.add('streamingcommunity', {'id': 1, 'name': name}, season, episode)
+
+    def get_job(self, job_id):
+        return next(job for job in self.store.list_jobs() if job['id'] == job_id)
+
+    def test_add_is_pending(self):
+        job_id = self.add_job(season='1-3')
+        job = self.get_job(job_id)
+
+        self.assertEqual(job['status'], 'pending')
+        self.assertEqual(job['attempts'], 0)
+        self.assertEqual(job['season'], '1-3')
+        self.assertEqual(job['item'], {'id': 1, 'name': 'Title'})
+
+    def test_claim_oldest_first(self):
+        first = self.add_job('First')
+        second = self.add_job('Second')
+
+        job = self.store.claim()
+        self.assertEqual(job['id'], first)
+        self.assertEqual(job['attempts'], 1)
+        self.assertEqual(self.get_job(first)['status'], 'running')
+
+        self.assertEqual(self.store.claim()['id'], second)
+        self.assertIsNone(self.store.claim())
+
+    def test_finish(self):
+        job_id = self.add_job()
+        self.store.claim()
+        self.store.finish(job_id)
+
+        job = self.get_job(job_id)
+        self.assertEqual(job['status'], 'done')
+        self.assertIsNone(job['error'])
+        self.assertIsNone(self.store.claim())
+
+    def test_fail_retries_until_max_attempts(self):
+        job_id = self.add_job()
+
+        self.store.claim()
+        self.assertEqual(self.store.fail(job_id, 'first error', max_attempts=2), 'pending')
+        self.assertEqual(self.get_job(job_id)['error'], 'first error')
+
+        self.assertEqual(self.store.claim()['attempts'], 2)
+        self.assertEqual(self.store.fail(job_id, 'second error', max_attempts=2), 'failed')
+        self.assertIsNone(self.store.claim())
+
+        job = self.get_job(job_id)
+        self.assertEqual(job['attempts'], 2)
+        self.assertEqual(job['error'], 'second error')
+
+    def test_requeue_does_not_count_the_attempt(self):
+        job_id = self.add_job()
+        self.store.claim()
+        self.store.requeue(job_id)
+
+        job = self.get_job(job_id)
+        self.assertEqual(job['status'], 'pending')
+        self.assertEqual(job['attempts'], 0)
+        self.assertEqual(self.store.claim()['id'], job_id)
+
+    def test_claim_keeps_error_when_begin_fails(self):
+        self.add_job()
+        locker = sqlite3.connect(self.store.path, isolation_level=None)
+        locker.execute("BEGIN IMMEDIATE")
+
+        try:
+            with patch.object(self.store, '_connect', lambda: sqlite3.connect(self.store.path, timeout=0.1, isolation_level=None)):
+                with self.assertRaisesRegex(sqlite3.OperationalError, 'locked'):
+                    self.store.claim()
+        finally:
+            locker.execute("ROLLBACK")
+            locker.close()
+
+    def test_recover_running_jobs(self):
+        running = self.add_job('Running')
+        done = self.add_job('Done')
+        self.store.claim()
+        self.store.claim()
+        self.store.finish(done)
+
+        self.assertEqual(self.store.recover(), 1)
+        self.assertEqual(self.get_job(running)['status'], 'pending')
+        self.assertEqual(self.get_job(done)['status'], 'done')
+        self.assertEqual(self.store.recover(), 0)
+
+    def test_list_jobs_by_status(self):
+        pending = self.add_job()
+        done = self.add_job()
+        self.store.claim()
+        self.store.finish(pending)
+
+        self.assertEqual([job['id'] for job in self.store.list_jobs('pending')], [done])
+        self.assertEqual([job['id'] for job in self.store.list_jobs('done')], [pending])
+
+    def test_runner_fails_job_with_failed_download(self):
+        failed = self.add_job('Failed')
+        succeeded = self.add_job('Succeeded')
+
+        def search(direct_item, selections):
+            if direct_item['name'] == 'Failed':
+                record_download_failure('E01.mp4', 'merge failed')
+
+        with patch('StreamingCommunity.Lib.Queue.runner.get_lazy_search', return_value=search):
+            JobRunner(self.store, workers=1, max_attempts=1).worker(watch=False)
+
+        self.assertEqual(self.get_job(failed)['status'], 'failed')
+        self.assertIn('merge failed', self.get_job(failed)['error'])
+        self.assertEqual(self.get_job(succeeded)['status'], 'done')
+
+    def test_runner_requeues_interrupted_job(self):
+        job_id = self.add_job()
+        runner = JobRunner(self.store, workers=1, max_attempts=1)
+
+        def search(direct_item, selections):
+            runner.stop_event.set()
+
+        with patch('StreamingCommunity.Lib.Queue.runner.get_lazy_search', return_value=search):
+            runner.worker(watch=False)
+
+        job = self.get_job(job_id)
+        self.assertEqual(job['status'], 'pending')
+        self.assertEqual(job['attempts'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# 18.10.26
+
+# Fix import
+import sys
+import os
+src_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.append(src_path)
+
+
+
+# Import
+import unittest
+import timeit
+from StreamingCommunity.Api.Template.config_loader import site_constant, bind_site
+
+
+def call_at_depth(depth, func):
+    """Run `func` below `depth` extra frames, like site code called from deep inside a download."""
+    if depth == 0:
+        return func()
+    return call_at_depth(depth - 1, func)
+
+
+class TestSiteConstantCost(unittest.TestCase):
+    def setUp(self):
+        self.depth = 50
+        self.number = 200
+
+    def measure(self, runner):
+        seconds = timeit.timeit(runner, number=self.number)
+        return seconds / self.number * 1e6
+
+    def test_site_name_access(self):
+        read_name = lambda: site_constant.SITE_NAME
+
+        # Bound when the plugin is registered, as run.py and global_search do
+        bound = bind_site("streamingcommunity", lambda: call_at_depth(self.depth, read_name))
+        self.assertEqual(bound(), "streamingcommunity")
+
+        bound_us = self.measure(bound)
+        stack_us = self.measure(lambda: call_at_depth(self.depth, read_name))
+
+        print(f"\nSITE_NAME per access at stack depth {self.depth}:")
+        print(f"- bound context: {bound_us:.2f} us")
+        print(f"- stack walk:    {stack_us:.2f} us")
+        print(f"- speedup:       {stack_us / bound_us:.0f}x")
+
+        self.assertLess(bound_us, stack_us)
+
+
+if __name__ == '__main__':
+    unittest.main()